@@ -0,0 +1,24 @@
+import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture(autouse=True)
+def app_dir(tmp_path, monkeypatch) -> str:
+    # Keeps caches written by commands out of the real config directory.
+    app_dir = tmp_path / "app"
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(app_dir))
+    return str(app_dir / "vantage-cli")
+
+
+@pytest.fixture(scope="module")
+def runner() -> CliRunner:
+    return CliRunner()
+
+
+@pytest.fixture
+def config_path(tmp_path) -> str:
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(
+        "[general]\naccount_id = test-account\nvantage_api_key = test-key\n"
+    )
+    return str(config_path)
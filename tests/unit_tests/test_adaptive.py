@@ -0,0 +1,81 @@
+import logging
+from vantage_cli.adaptive import AimdController
+from vantage_cli.batching import Batch, BatchLimits
+
+LOGGER = logging.getLogger("test")
+BATCH = Batch(index=0, start_offset=0, end_offset=1, documents=1, payload=b"")
+
+
+def _controller(limits: BatchLimits) -> AimdController:
+    return AimdController(
+        limits=limits, max_concurrency=4, logger=LOGGER, target_latency=1.0
+    )
+
+
+class TestAimdController:
+    def test_starts_small(self) -> None:
+        # Given
+        limits = BatchLimits(max_documents=100, max_bytes=1000)
+
+        # When
+        controller = _controller(limits)
+
+        # Then
+        assert (limits.max_documents, limits.max_bytes) == (25, 250)
+        assert controller.concurrency == 1
+
+    def test_successful_rounds_increase_load(self) -> None:
+        # Given
+        limits = BatchLimits(max_documents=100, max_bytes=1000)
+        controller = _controller(limits)
+
+        # When
+        for _ in range(40):
+            controller.on_success(batch=BATCH, latency=0.1, epoch=0)
+
+        # Then
+        assert (limits.max_documents, limits.max_bytes) == (100, 1000)
+        assert controller.concurrency == 4
+
+    def test_slow_batch_decreases_batch_size(self) -> None:
+        # Given
+        limits = BatchLimits(max_documents=None, max_bytes=1000)
+        controller = _controller(limits)
+
+        # When
+        controller.on_success(batch=BATCH, latency=2.0, epoch=0)
+
+        # Then
+        assert limits.max_documents is None
+        assert limits.max_bytes == 125
+        assert controller.epoch == 1
+
+    def test_overload_decreases_concurrency(self, caplog) -> None:
+        # Given
+        limits = BatchLimits(max_documents=100, max_bytes=1000)
+        controller = _controller(limits)
+        for _ in range(3):
+            controller.on_success(batch=BATCH, latency=0.1, epoch=0)
+
+        # When
+        with caplog.at_level(logging.INFO):
+            controller.on_overload(batch=BATCH, reason="429", epoch=0)
+
+        # Then
+        assert controller.concurrency == 1
+        assert limits.max_documents == 23
+        assert "batch 0 failed: 429" in caplog.text
+
+    def test_outcomes_before_decrease_are_ignored(self) -> None:
+        # Given
+        limits = BatchLimits(max_documents=100, max_bytes=1000)
+        controller = _controller(limits)
+        controller.on_overload(batch=BATCH, reason="429", epoch=0)
+
+        # When
+        controller.on_overload(batch=BATCH, reason="429", epoch=0)
+        controller.on_success(batch=BATCH, latency=0.1, epoch=0)
+
+        # Then
+        assert controller.epoch == 1
+        assert limits.max_documents == 13
@@ -0,0 +1,114 @@
+import io
+from vantage_cli.batching import (
+    BatchLimits,
+    batch_digest,
+    read_jsonl_batches,
+)
+
+
+def _batches(data: bytes, **kwargs) -> list:
+    return list(read_jsonl_batches(io.BytesIO(data), BatchLimits(**kwargs)))
+
+
+class TestReadJsonlBatches:
+    def test_batches_are_bounded_by_document_count(self) -> None:
+        # Given
+        data = b"".join(b'{"id": "%d"}\n' % i for i in range(5))
+
+        # When
+        batches = _batches(data, max_documents=2)
+
+        # Then
+        assert [batch.documents for batch in batches] == [2, 2, 1]
+        assert [batch.index for batch in batches] == [0, 1, 2]
+        assert b"".join(batch.payload for batch in batches) == data
+
+    def test_batches_are_bounded_by_size(self) -> None:
+        # Given
+        data = b'{"id": "1"}\n{"id": "2"}\n{"id": "3"}\n'
+
+        # When
+        batches = _batches(data, max_bytes=30)
+
+        # Then
+        assert [batch.documents for batch in batches] == [2, 1]
+        assert all(batch.size <= 30 for batch in batches)
+
+    def test_oversized_document_is_sent_alone(self) -> None:
+        # Given
+        data = b'{"id": "1"}\n{"id": "2", "text": "long"}\n{"id": "3"}\n'
+
+        # When
+        batches = _batches(data, max_bytes=15)
+
+        # Then
+        assert [batch.documents for batch in batches] == [1, 1, 1]
+
+    def test_offsets_cover_input(self) -> None:
+        # Given
+        data = b'\n{"id": "1"}\n\n{"id": "2"}\n{"id": "3"}'
+
+        # When
+        batches = _batches(data, max_documents=2)
+
+        # Then
+        assert [(b.start_offset, b.end_offset) for b in batches] == [
+            (1, 26),
+            (26, 37),
+        ]
+        assert batches[-1].payload == b'{"id": "3"}\n'
+        assert _batches(b"\n\n") == []
+
+    def test_skipped_ranges_are_left_out(self) -> None:
+        # Given
+        data = b"".join(b'{"id": "%d"}\n' % i for i in range(5))
+
+        # When
+        batches = list(
+            read_jsonl_batches(
+                io.BytesIO(data),
+                limits=BatchLimits(max_documents=2),
+                skip=[(12, 36)],
+                start_index=3,
+            )
+        )
+
+        # Then
+        assert [batch.payload for batch in batches] == [
+            b'{"id": "0"}\n',
+            b'{"id": "3"}\n{"id": "4"}\n',
+        ]
+        assert [batch.index for batch in batches] == [3, 4]
+        assert [(b.start_offset, b.end_offset) for b in batches] == [
+            (0, 12),
+            (36, 60),
+        ]
+
+    def test_limits_are_read_for_every_document(self) -> None:
+        # Given
+        data = b"".join(b'{"id": "%d"}\n' % i for i in range(6))
+        limits = BatchLimits(max_documents=1)
+        batches = read_jsonl_batches(io.BytesIO(data), limits=limits)
+
+        # When
+        first = next(batches)
+        limits.max_documents = 3
+        rest = list(batches)
+
+        # Then
+        assert first.documents == 1
+        assert [batch.documents for batch in rest] == [3, 2]
+
+
+class TestBatchDigest:
+    def test_digest_depends_on_payload_and_collection(self) -> None:
+        # Given
+        payload = b'{"id": "1", "text": "lamp"}\n'
+
+        # When
+        digest = batch_digest("lamps", payload)
+
+        # Then
+        assert digest == batch_digest("lamps", payload)
+        assert digest != batch_digest("desks", payload)
+        assert digest != batch_digest("lamps", payload + payload)
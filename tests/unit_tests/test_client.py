@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import stat
+import time
+from types import SimpleNamespace
+import pytest
+import requests
+from vantage_cli import client as client_module
+from vantage_cli import token_cache as token_cache_module
+from vantage_cli.client import ClientFactory
+from vantage_cli.token_cache import TokenCache
+from vantage_cli.vantage import cli
+
+LOGGER = logging.getLogger("test")
+
+
+class TestClientFactory:
+    def test_client_is_created_once(self, monkeypatch) -> None:
+        # Given
+        created = []
+        monkeypatch.setattr(
+            client_module,
+            "create_client_from_vantage_api_key",
+            lambda **kwargs: created.append(kwargs) or object(),
+        )
+        factory = ClientFactory(
+            logger=LOGGER,
+            account_id="test-account",
+            api_host="https://api.example.com",
+            auth_host="https://auth.example.com",
+            vantage_api_key="test-key",
+        )
+
+        # When
+        first = factory()
+        second = factory()
+
+        # Then
+        assert first is second
+        assert len(created) == 1
+
+    def test_offline_command_without_credentials(
+        self, tmp_path, runner
+    ) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[general]\naccount_id = test-account\n")
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                str(config_path),
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+
+    def test_api_command_without_credentials(self, tmp_path, runner) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[general]\naccount_id = test-account\n")
+
+        # When
+        result = runner.invoke(cli, ["-c", str(config_path), "get-account"])
+
+        # Then
+        assert result.exit_code == 127
+
+    def test_shared_cache_replaces_client_on_new_token(
+        self, monkeypatch
+    ) -> None:
+        # Given
+        tokens = iter(["old", "old", "new"])
+        token_cache = TokenCache(logger=LOGGER)
+        monkeypatch.setattr(
+            token_cache, "get_token", lambda **kwargs: next(tokens)
+        )
+        monkeypatch.setattr(
+            client_module,
+            "create_client_from_jwt",
+            lambda **kwargs: object(),
+        )
+        cache = {}
+
+        def create_factory() -> ClientFactory:
+            return ClientFactory(
+                logger=LOGGER,
+                account_id="test-account",
+                api_host="https://api.example.com",
+                auth_host="https://auth.example.com",
+                client_id="client",
+                client_secret="secret",
+                token_cache=token_cache,
+                cache=cache,
+            )
+
+        # When
+        clients = [create_factory()() for _ in range(3)]
+
+        # Then
+        assert clients[0] is clients[1]
+        assert clients[1] is not clients[2]
+        assert len(cache) == 1
+
+    def test_shared_cache_refreshes_expired_token(self, monkeypatch) -> None:
+        # Given
+        fetched = []
+
+        def fetch_token(**kwargs) -> dict:
+            fetched.append(kwargs)
+            return {
+                "access_token": f"token-{len(fetched)}",
+                "expires_at": time.time() + 60,
+            }
+
+        monkeypatch.setattr(client_module, "fetch_token", fetch_token)
+        monkeypatch.setattr(
+            client_module,
+            "create_client_from_jwt",
+            lambda **kwargs: kwargs["jwt_token"],
+        )
+        cache = {}
+
+        # When
+        clients = [
+            ClientFactory(
+                logger=LOGGER,
+                account_id="test-account",
+                api_host="https://api.example.com",
+                auth_host="https://auth.example.com",
+                client_id="client",
+                client_secret="secret",
+                cache=cache,
+            )()
+            for _ in range(2)
+        ]
+
+        # Then
+        assert clients == ["token-1", "token-2"]
+        assert len(cache) == 1
+
+
+class TestTokenCache:
+    def _get_token(self, cache: TokenCache) -> str:
+        return cache.get_token(
+            auth_host="https://auth.example.com",
+            client_id="client",
+            client_secret="secret",
+            account_id="test-account",
+            api_host="https://api.example.com",
+        )
+
+    def test_token_is_reused_between_runs(self, tmp_path, monkeypatch) -> None:
+        # Given
+        fetched = []
+
+        def fetch_token(**kwargs) -> dict:
+            fetched.append(kwargs)
+            return {"access_token": "token", "expires_at": time.time() + 3600}
+
+        monkeypatch.setattr(token_cache_module, "fetch_token", fetch_token)
+        path = str(tmp_path / "token_cache.json")
+
+        # When
+        first = self._get_token(TokenCache(logger=LOGGER, path=path))
+        second = self._get_token(TokenCache(logger=LOGGER, path=path))
+
+        # Then
+        assert first == second == "token"
+        assert len(fetched) == 1
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_timed_out_fetch_releases_lock(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        # Given
+        timeouts = []
+
+        def post(url, timeout=None, **kwargs):
+            timeouts.append(timeout)
+            if len(timeouts) == 1:
+                raise requests.exceptions.ReadTimeout("Read timed out.")
+            return SimpleNamespace(
+                raise_for_status=lambda: None,
+                json=lambda: {"access_token": "token", "expires_in": 3600},
+            )
+
+        monkeypatch.setattr(token_cache_module.requests, "post", post)
+        cache = TokenCache(
+            logger=LOGGER, path=str(tmp_path / "token_cache.json")
+        )
+
+        # When
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            self._get_token(cache)
+        token = self._get_token(cache)
+
+        # Then
+        assert token == "token"
+        assert timeouts == [token_cache_module.AUTH_TIMEOUT_SECONDS] * 2
+
+    def test_token_is_refreshed_ahead_of_expiry(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        # Given
+        tokens = iter(["old", "new"])
+        monkeypatch.setattr(
+            token_cache_module,
+            "fetch_token",
+            lambda **kwargs: {
+                "access_token": next(tokens),
+                "expires_at": time.time() + 60,
+            },
+        )
+        cache = TokenCache(
+            logger=LOGGER, path=str(tmp_path / "token_cache.json")
+        )
+
+        # When
+        first = self._get_token(cache)
+        second = self._get_token(cache)
+
+        # Then
+        assert (first, second) == ("old", "new")
+
+    @pytest.mark.parametrize(
+        "cached",
+        [
+            None,
+            "token",
+            {"access_token": "stale"},
+            {"access_token": "stale", "expires_at": None},
+            {"access_token": "stale", "expires_at": "2030-01-01"},
+        ],
+    )
+    def test_malformed_entry_is_refetched(
+        self, tmp_path, monkeypatch, cached
+    ) -> None:
+        # Given
+        monkeypatch.setattr(
+            token_cache_module,
+            "fetch_token",
+            lambda **kwargs: {
+                "access_token": "token",
+                "expires_at": time.time() + 3600,
+            },
+        )
+        cache = TokenCache(
+            logger=LOGGER, path=str(tmp_path / "token_cache.json")
+        )
+        key = cache._key(
+            "https://auth.example.com",
+            "client",
+            "test-account",
+            "https://api.example.com",
+        )
+        with open(cache.path, "w") as file:
+            json.dump({key: cached, "other": cached}, file)
+
+        # When
+        token = self._get_token(cache)
+
+        # Then
+        assert token == "token"
+        with open(cache.path) as file:
+            assert list(json.load(file)) == [key]
@@ -0,0 +1,63 @@
+import bz2
+import gzip
+import io
+import pytest
+from vantage_cli.compression import decompress, open_input
+
+CONTENT = b'{"id": "1", "text": "lamp"}\n{"id": "2", "text": "desk"}\n'
+
+
+class TestDecompress:
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress])
+    def test_compressed_stream_is_read_line_by_line(self, compress) -> None:
+        # Given
+        stream = io.BytesIO(compress(CONTENT))
+
+        # When
+        lines = list(decompress(stream))
+
+        # Then
+        assert b"".join(lines) == CONTENT
+        assert len(lines) == 2
+
+    def test_zstandard_stream(self) -> None:
+        # Given
+        zstandard = pytest.importorskip("zstandard")
+        compressor = zstandard.ZstdCompressor()
+        stream = io.BytesIO(
+            compressor.compress(CONTENT[:28])
+            + compressor.compress(CONTENT[28:])
+        )
+
+        # When
+        lines = decompress(stream).readlines()
+
+        # Then
+        assert b"".join(lines) == CONTENT
+
+    def test_uncompressed_stream_is_passed_through(self) -> None:
+        # Given
+        stream = io.BufferedReader(io.BytesIO(CONTENT))
+
+        # When
+        result = decompress(stream)
+
+        # Then
+        assert result is stream
+        assert result.read() == CONTENT
+
+
+class TestOpenInput:
+    def test_file_is_closed(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "documents.jsonl.gz"
+        path.write_bytes(gzip.compress(CONTENT))
+
+        # When
+        with open_input(str(path)) as stream:
+            stream.seek(28)
+            rest = stream.read()
+
+        # Then
+        assert rest == CONTENT[28:]
+        assert stream._file.closed
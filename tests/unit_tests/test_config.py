@@ -0,0 +1,82 @@
+import os
+import stat
+from vantage_cli import config as config_module
+from vantage_cli.config import ConfigCache, ConfigLoader
+
+
+def _write_config(path, content: str, mtime_ns: int) -> None:
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestConfigCache:
+    def test_default_map_is_merged(self, tmp_path) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text(
+            "[general]\naccount_id = test\n"
+            "[general.search]\naccuracy = 0.5\n"
+            "[search-semantic]\npage = 2\n"
+            "[get-collection]\ncollection_id = lamps\n"
+        )
+        cache = ConfigCache(path=str(tmp_path / "cache.bin"))
+
+        # When
+        default_map = cache.load_default_map(str(config_path))
+
+        # Then
+        assert default_map["account_id"] == "test"
+        assert default_map["search-semantic"] == {
+            "accuracy": "0.5",
+            "page": "2",
+        }
+        assert default_map["search-embedding"] == {"accuracy": "0.5"}
+        assert default_map["get-collection"] == {"collection_id": "lamps"}
+
+    def test_file_is_parsed_only_when_changed(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        # Given
+        loaded = []
+        load = ConfigLoader.load
+        monkeypatch.setattr(
+            config_module.ConfigLoader,
+            "load",
+            lambda self: loaded.append(self.path) or load(self),
+        )
+        config_path = tmp_path / "config.ini"
+        cache_path = tmp_path / "cache.bin"
+        _write_config(config_path, "[general]\naccount_id = a\n", 10**18)
+
+        # When
+        first = ConfigCache(path=str(cache_path)).load_default_map(
+            str(config_path)
+        )
+        second = ConfigCache(path=str(cache_path)).load_default_map(
+            str(config_path)
+        )
+        _write_config(config_path, "[general]\naccount_id = b\n", 2 * 10**18)
+        third = ConfigCache(path=str(cache_path)).load_default_map(
+            str(config_path)
+        )
+
+        # Then
+        assert first == second == {"account_id": "a"}
+        assert third == {"account_id": "b"}
+        assert len(loaded) == 2
+        assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+    def test_corrupted_cache_is_rebuilt(self, tmp_path) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[general]\naccount_id = a\n")
+        cache_path = tmp_path / "cache.bin"
+        cache_path.write_bytes(b"\x00garbage")
+
+        # When
+        default_map = ConfigCache(path=str(cache_path)).load_default_map(
+            str(config_path)
+        )
+
+        # Then
+        assert default_map == {"account_id": "a"}
@@ -0,0 +1,190 @@
+import gzip
+import io
+import json
+import pyarrow
+import pyarrow.parquet
+import pytest
+import click
+from vantage_cli.conversion import (
+    ParquetJsonlReader,
+    convert_jsonl_to_parquet,
+)
+from vantage_cli.vantage import cli
+
+
+def _documents(count: int) -> bytes:
+    return b"".join(
+        json.dumps(
+            {
+                "id": str(index),
+                "text": "lamp",
+                "embeddings": [0.123456789, 1.5, -2.25],
+                "meta_color": "red",
+            }
+        ).encode()
+        + b"\n"
+        for index in range(count)
+    )
+
+
+class TestConvertJsonlToParquet:
+    def test_documents_are_written_in_row_groups(self, tmp_path) -> None:
+        # Given
+        output_path = str(tmp_path / "documents.parquet")
+
+        # When
+        summary = convert_jsonl_to_parquet(
+            stream=io.BytesIO(_documents(250)),
+            output_path=output_path,
+            row_group_documents=100,
+            block_bytes=4096,
+        )
+
+        # Then
+        parquet_file = pyarrow.parquet.ParquetFile(output_path)
+        assert parquet_file.metadata.num_rows == 250
+        assert [
+            parquet_file.metadata.row_group(index).num_rows
+            for index in range(parquet_file.num_row_groups)
+        ] == [100, 100, 50]
+        assert parquet_file.schema_arrow.field("embeddings").type == (
+            pyarrow.list_(pyarrow.float32(), 3)
+        )
+        assert parquet_file.read().column("id").to_pylist() == [
+            str(index) for index in range(250)
+        ]
+        assert (summary.documents, summary.row_groups) == (250, 3)
+        assert summary.output_bytes < summary.input_bytes
+
+    def test_mismatched_embeddings_are_rejected(self, tmp_path) -> None:
+        # Given
+        output_path = tmp_path / "documents.parquet"
+        data = _documents(1) + b'{"id": "x", "embeddings": [1.0]}\n'
+
+        # When
+        with pytest.raises(click.ClickException, match="lists of 3"):
+            convert_jsonl_to_parquet(
+                stream=io.BytesIO(data), output_path=str(output_path)
+            )
+
+        # Then
+        assert not output_path.exists()
+
+    def test_late_field_is_reported(self, tmp_path) -> None:
+        # Given
+        data = _documents(100) + b'{"id": "x", "meta_size": 1}\n'
+
+        # When
+        with pytest.raises(click.ClickException, match="first block"):
+            convert_jsonl_to_parquet(
+                stream=io.BytesIO(data),
+                output_path=str(tmp_path / "documents.parquet"),
+                block_bytes=1024,
+            )
+
+
+class TestParquetJsonlReader:
+    def test_row_groups_are_read_as_jsonl(self, tmp_path) -> None:
+        # Given
+        parquet_path = str(tmp_path / "documents.parquet")
+        convert_jsonl_to_parquet(
+            stream=io.BytesIO(_documents(5)),
+            output_path=parquet_path,
+            row_group_documents=2,
+        )
+
+        # When
+        reader = ParquetJsonlReader(
+            path=parquet_path, columns=["text"], read_rows=2
+        )
+        lines = list(iter(reader.readline, b""))
+        reader.close()
+
+        # Then
+        assert [json.loads(line) for line in lines] == [
+            {"id": str(index), "text": "lamp"} for index in range(5)
+        ]
+
+    def test_floats_are_written_as_json(self, tmp_path) -> None:
+        # Given
+        parquet_path = str(tmp_path / "documents.parquet")
+        pyarrow.parquet.write_table(
+            pyarrow.table(
+                {
+                    "id": ["1", "2"],
+                    "embeddings": pyarrow.array(
+                        [[0.1, -2.25], [float("nan"), 1e-7]],
+                        pyarrow.list_(pyarrow.float32()),
+                    ),
+                    "meta_score": [float("inf"), 0.5],
+                }
+            ),
+            parquet_path,
+        )
+
+        # When
+        reader = ParquetJsonlReader(path=parquet_path)
+        lines = list(iter(reader.readline, b""))
+        reader.close()
+
+        # Then
+        assert lines == [
+            b'{"id":"1","embeddings":[0.1,-2.25],"meta_score":null}\n',
+            b'{"id":"2","embeddings":[null,1e-07],"meta_score":0.5}\n',
+        ]
+
+    def test_missing_column_is_rejected(self, tmp_path) -> None:
+        # Given
+        parquet_path = str(tmp_path / "documents.parquet")
+        pyarrow.parquet.write_table(
+            pyarrow.table({"text": ["lamp"]}), parquet_path
+        )
+
+        # When
+        with pytest.raises(click.ClickException) as error:
+            ParquetJsonlReader(path=parquet_path)
+
+        # Then
+        assert error.value.message == "Parquet file has no id column."
+
+
+class TestConvertCommand:
+    def test_compressed_file_is_converted(
+        self, config_path, tmp_path, runner
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl.gz"
+        documents_path.write_bytes(gzip.compress(_documents(10)))
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "convert-jsonl-to-parquet",
+                "--compression",
+                "zstd",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        output = json.loads(result.output[result.output.index("{") :])
+        assert result.exit_code == 0
+        assert output["documents"] == 10
+        assert output["input_bytes"] == len(_documents(10))
+        assert "size_reduction" in output
+        assert (tmp_path / "documents.parquet").exists()
+
+    def test_stdin_requires_output_file(self, config_path, runner) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            ["-c", config_path, "convert-jsonl-to-parquet"],
+            input=_documents(1),
+        )
+
+        # Then
+        assert result.exit_code == 2
+        assert "--output-file is required" in result.output
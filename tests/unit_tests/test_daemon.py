@@ -0,0 +1,206 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+from vantage_cli import daemon as daemon_module
+from vantage_cli.vantage import _invoked_command_name, cli
+
+PROJECT_ROOT = Path(__file__).parents[2]
+SHIM = "from vantage_cli.vantage import main; main()"
+
+
+def _environment(workspace: Path, socket_path: str = "") -> dict[str, str]:
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith(daemon_module.ENVVAR_PREFIX)
+    }
+    environment["PYTHONPATH"] = str(PROJECT_ROOT)
+    environment["XDG_CONFIG_HOME"] = str(workspace / "app")
+    environment[daemon_module.SOCKET_ENVVAR] = socket_path
+    return environment
+
+
+def _run(args: list[str], cwd: Path, socket_path: str = ""):
+    return subprocess.run(
+        [sys.executable, "-c", SHIM, *args],
+        cwd=cwd,
+        env=_environment(cwd, socket_path),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+@pytest.fixture(scope="module")
+def workspace(tmp_path_factory) -> Path:
+    workspace = tmp_path_factory.mktemp("daemon")
+    (workspace / "config.ini").write_text("[general]\naccount_id = test\n")
+    (workspace / "documents.jsonl").write_text(
+        '{"id": "1", "text": "lamp"}\n{"id": "2", "text": "desk"}\n'
+    )
+    (workspace / "duplicates.jsonl").write_text(
+        '{"id": "1", "text": "lamp"}\n{"id": "1", "text": "desk"}\n'
+    )
+    return workspace
+
+
+@pytest.fixture(scope="module")
+def socket_path(workspace):
+    socket_path = str(workspace / "daemon.sock")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            SHIM,
+            "-c",
+            "config.ini",
+            "serve",
+            "--socket",
+            socket_path,
+        ],
+        cwd=workspace,
+        env=_environment(workspace, socket_path),
+    )
+    deadline = time.monotonic() + 30
+    while not daemon_module._is_listening(socket_path):
+        assert process.poll() is None, "Daemon exited on startup."
+        assert time.monotonic() < deadline, "Daemon didn't start in time."
+        time.sleep(0.1)
+
+    yield socket_path
+
+    process.terminate()
+    process.wait(timeout=10)
+
+
+class TestDaemon:
+    @pytest.mark.parametrize(
+        "args",
+        [
+            [
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                "documents.jsonl",
+            ],
+            [
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                "duplicates.jsonl",
+            ],
+            ["validate-jsonl"],
+            ["no-such-command"],
+            ["--help"],
+            ["get-account"],
+        ],
+    )
+    def test_output_matches_direct_execution(
+        self, workspace, socket_path, args
+    ) -> None:
+        # Given
+        args = ["-c", "config.ini", *args]
+
+        # When
+        direct = _run(args, cwd=workspace)
+        via_daemon = _run(args, cwd=workspace, socket_path=socket_path)
+
+        # Then
+        assert via_daemon.stdout == direct.stdout
+        assert via_daemon.stderr == direct.stderr
+        assert via_daemon.returncode == direct.returncode
+
+    def test_validation_is_repeatable(self, workspace, socket_path) -> None:
+        # Given
+        args = [
+            "-c",
+            "config.ini",
+            "validate-jsonl",
+            "--collection-type",
+            "OpenAI",
+            "documents.jsonl",
+        ]
+
+        # When
+        results = [
+            _run(args, cwd=workspace, socket_path=socket_path)
+            for _ in range(2)
+        ]
+
+        # Then
+        for result in results:
+            assert result.returncode == 0
+            assert '"message": "OK"' in result.stdout
+
+    def test_busy_daemon_falls_back(self, tmp_path) -> None:
+        # Given
+        socket_path = str(tmp_path / "busy.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen()
+
+            # When
+            exit_code = daemon_module.run_via_daemon(
+                socket_path=socket_path, argv=["--help"]
+            )
+
+        # Then
+        assert exit_code is None
+
+    def test_stdin_is_forwarded(self, monkeypatch) -> None:
+        # Given
+        shim, daemon = socket.socketpair()
+        monkeypatch.setattr(
+            sys, "stdin", io.TextIOWrapper(io.BytesIO(b"lamp\ndesk\n"))
+        )
+
+        # When
+        with shim, daemon:
+            daemon_module._forward_stdin(shim)
+            stdin = io.TextIOWrapper(
+                io.BufferedReader(daemon_module._FrameReader(daemon))
+            )
+            lines = stdin.readlines()
+
+        # Then
+        assert lines == ["lamp\n", "desk\n"]
+
+    def test_serve_is_not_executed_by_daemon(
+        self, config_path, tmp_path, runner
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            ["-c", config_path, "serve", "--socket", str(tmp_path / "d.sock")],
+            obj={"daemon": True},
+        )
+
+        # Then
+        assert result.exit_code == 2
+        assert "Command can't be executed by the daemon." in result.output
+
+
+class TestInvokedCommandName:
+    @pytest.mark.parametrize(
+        "argv, name",
+        [
+            (["serve"], "serve"),
+            (["-c", "config.ini", "serve"], "serve"),
+            (["-d", "-a", "serve", "get-account"], "get-account"),
+            (["--api-host", "https://api", "get-account"], "get-account"),
+            (["--no-token-cache", "serve", "--socket", "s"], "serve"),
+            (["-c", "config.ini"], None),
+            ([], None),
+        ],
+    )
+    def test_skips_option_values(self, argv, name) -> None:
+        # When
+        invoked = _invoked_command_name(argv)
+
+        # Then
+        assert invoked == name
@@ -0,0 +1,52 @@
+from vantage_cli.batching import Batch
+from vantage_cli.dead_letters import UPSERT, DeadLetterSpool, read_dead_letters
+
+
+class TestDeadLetterSpool:
+    def test_letters_are_read_back(self, tmp_path) -> None:
+        # Given
+        spool = DeadLetterSpool(
+            directory=str(tmp_path),
+            kind=UPSERT,
+            collection_id="lamps",
+            input_name="documents.jsonl",
+        )
+        batch = Batch(
+            index=2,
+            start_offset=100,
+            end_offset=150,
+            documents=1,
+            payload=b'{"id": "1"}\n',
+        )
+
+        # When
+        spool.write(
+            batch=batch,
+            batch_identifier="documents/2",
+            error="Error: Connection reset.",
+        )
+
+        # Then
+        (letter,) = read_dead_letters(str(tmp_path))
+        assert letter.read_payload() == batch.payload
+        assert letter.metadata == {
+            "kind": UPSERT,
+            "collection_id": "lamps",
+            "batch_identifier": "documents/2",
+            "input": "documents.jsonl",
+            "start_offset": 100,
+            "end_offset": 150,
+            "documents": 1,
+            "error": "Error: Connection reset.",
+            "attempts": 1,
+        }
+
+        letter.update_error("Error: Timeout.")
+        (letter,) = read_dead_letters(str(tmp_path))
+        assert (letter.metadata["error"], letter.metadata["attempts"]) == (
+            "Error: Timeout.",
+            2,
+        )
+
+        letter.remove()
+        assert list(tmp_path.iterdir()) == []
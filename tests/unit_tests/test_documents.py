@@ -0,0 +1,1159 @@
+import bz2
+import gzip
+import io
+import json
+import os
+from types import SimpleNamespace
+import pyarrow
+import pyarrow.parquet
+import pytest
+from vantage_sdk.core.http.exceptions import (
+    NotFoundException,
+    ServiceException,
+)
+from vantage_cli import client as client_module
+from vantage_cli import retry as retry_module
+from vantage_cli import upload as upload_module
+from vantage_cli.batching import batch_digest
+from vantage_cli.vantage import cli
+
+
+class FakeCollectionApi:
+    def __init__(self):
+        self.identifiers = []
+
+    def get_browser_upload_url(self, customer_batch_identifier, **kwargs):
+        self.identifiers.append(customer_batch_identifier)
+        return SimpleNamespace(
+            upload_url=f"https://upload.example.com/{customer_batch_identifier}"
+        )
+
+
+class FakeDocumentsApi:
+    def __init__(self):
+        self.uploads = []
+        self.deleted = []
+        self.failing_identifiers = set()
+        self.transient_failures = 0
+
+    def upload_documents(self, **kwargs) -> None:
+        if self.transient_failures:
+            self.transient_failures -= 1
+            raise ServiceException(status=503, reason="Service Unavailable")
+        body = kwargs["body"]
+        assert isinstance(body, bytes)
+        if (kwargs.get("_headers") or {}).get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        ids = {json.loads(line)["id"] for line in body.splitlines()}
+        if self.failing_identifiers.intersection(ids):
+            raise ConnectionError("Connection reset.")
+        self.uploads.append({**kwargs, "body": body.decode()})
+
+    def delete_documents(self, collection_id, document_ids) -> None:
+        if collection_id == "missing":
+            raise NotFoundException(status=404, reason="Not Found")
+        if self.failing_identifiers.intersection(document_ids):
+            raise ConnectionError("Connection reset.")
+        self.deleted.append(document_ids)
+
+
+@pytest.fixture
+def documents_api(monkeypatch) -> FakeDocumentsApi:
+    documents_api = FakeDocumentsApi()
+    client = SimpleNamespace(
+        account_id="test-account",
+        delete_documents=documents_api.delete_documents,
+        management_api=SimpleNamespace(
+            documents_api=documents_api,
+            collection_api=FakeCollectionApi(),
+        ),
+    )
+    monkeypatch.setattr(
+        client_module,
+        "create_client_from_vantage_api_key",
+        lambda **kwargs: client,
+    )
+    return documents_api
+
+
+def _sent_ids(uploads: list[dict]) -> list[int]:
+    return sorted(
+        int(json.loads(line)["id"])
+        for upload in uploads
+        for line in upload["body"].splitlines()
+    )
+
+
+class TestUpsertDocumentsFromJsonl:
+    def test_file_is_sent_in_batches(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(5))
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-size",
+                "2",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert json.loads(result.output[result.output.index("{") :]) == {
+            "response": "Successfully sent to processing.",
+            "batches": 3,
+            "documents": 5,
+        }
+        assert [
+            upload["customer_batch_identifier"]
+            for upload in documents_api.uploads
+        ] == [
+            f"documents.jsonl-{batch_digest('lamps', upload['body'].encode())}"
+            for upload in documents_api.uploads
+        ]
+        assert (
+            "".join(upload["body"] for upload in documents_api.uploads)
+            == documents_path.read_text()
+        )
+
+    def test_failed_batch_is_retried(
+        self, config_path, tmp_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        monkeypatch.setattr(retry_module.time, "sleep", lambda _: None)
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+        documents_api.transient_failures = 2
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert len(documents_api.uploads) == 1
+        assert "failed (attempt 2 of 4)" in result.output
+
+    def test_upload_is_compressed(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(100))
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--compress-upload",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        (upload,) = documents_api.uploads
+        assert upload["_headers"] == {"Content-Encoding": "gzip"}
+        assert upload["body"] == documents_path.read_text()
+        output = json.loads(result.output[result.output.index("{") :])
+        assert output["logical_bytes"] == documents_path.stat().st_size
+        assert output["wire_bytes"] < output["logical_bytes"] / 5
+
+    def test_compressed_stdin_is_decompressed(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # Given
+        content = b'{"id": "1", "text": "lamp"}\n{"id": "2", "text": "desk"}\n'
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-identifier",
+                "lamps",
+                "--batch-size",
+                "1",
+            ],
+            input=bz2.compress(content),
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert [upload["body"] for upload in documents_api.uploads] == [
+            '{"id": "1", "text": "lamp"}\n',
+            '{"id": "2", "text": "desk"}\n',
+        ]
+
+    def test_batches_are_sent_concurrently(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(50))
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-size",
+                "3",
+                "--concurrency",
+                "4",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert '"batches": 17' in result.output
+        bodies = [upload["body"] for upload in documents_api.uploads]
+        assert all(body.count("\n") <= 3 for body in bodies)
+        assert sorted("".join(bodies).splitlines()) == sorted(
+            documents_path.read_text().splitlines()
+        )
+
+    def test_stdin_batches_are_identified_by_content(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+            ],
+            input='{"id": "1", "text": "lamp"}\n',
+        )
+
+        # Then
+        assert result.exit_code == 0
+        (upload,) = documents_api.uploads
+        assert upload["customer_batch_identifier"] == batch_digest(
+            "lamps", b'{"id": "1", "text": "lamp"}\n'
+        )
+
+
+class TestDeadLetters:
+    def test_failed_batches_are_replayed(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        dead_letter_dir = tmp_path / "dead-letters"
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(6))
+        )
+        documents_api.failing_identifiers = {"2"}
+        upsert = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "--max-retries",
+                "0",
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-size",
+                "2",
+                "--dead-letter-dir",
+                str(dead_letter_dir),
+                str(documents_path),
+            ],
+        )
+        documents_api.failing_identifiers = set()
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "replay-dead-letters",
+                str(dead_letter_dir),
+            ],
+        )
+
+        # Then
+        assert upsert.exit_code == 1
+        assert '"failed_batches": 1' in upsert.output
+        assert result.exit_code == 0
+        assert _sent_ids(documents_api.uploads) == list(range(6))
+        failed_batch = documents_path.read_bytes().splitlines(True)[2:4]
+        assert documents_api.uploads[-1]["customer_batch_identifier"] == (
+            f"documents.jsonl-{batch_digest('lamps', b''.join(failed_batch))}"
+        )
+        assert list(dead_letter_dir.iterdir()) == []
+
+
+class TestStateDb:
+    def _upsert(self, runner, config_path, documents_path, *options):
+        return runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--state-db",
+                str(documents_path.parent / "state.db"),
+                *options,
+                str(documents_path),
+            ],
+        )
+
+    def test_only_changed_documents_are_sent(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        deletions_path = tmp_path / "deletions.txt"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(5))
+        )
+        self._upsert(runner, config_path, documents_path)
+        documents_api.uploads.clear()
+        documents_path.write_text(
+            '{"id": "0", "text": "lamp"}\n'
+            '{"id": "1", "text": "desk"}\n'
+            '{"id": "2", "text": "lamp"}\n'
+            '{"id": "5", "text": "rug"}\n'
+        )
+
+        # When
+        result = self._upsert(
+            runner,
+            config_path,
+            documents_path,
+            "--emit-deletions",
+            str(deletions_path),
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert _sent_ids(documents_api.uploads) == [1, 5]
+        output = json.loads(result.output[result.output.index("{") :])
+        assert output["unchanged_documents"] == 2
+        assert output["removed_documents"] == 2
+        assert deletions_path.read_text() == "3\n4\n"
+
+    def test_deleted_documents_are_forgotten(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        deletions_path = tmp_path / "deletions.txt"
+        documents_path.write_text(
+            '{"id": "1", "text": "lamp"}\n{"id": "2", "text": "desk"}\n'
+        )
+        self._upsert(runner, config_path, documents_path)
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+        self._upsert(
+            runner,
+            config_path,
+            documents_path,
+            "--emit-deletions",
+            str(deletions_path),
+        )
+
+        # When
+        deleted = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "delete-documents",
+                "--collection-id",
+                "lamps",
+                "--state-db",
+                str(tmp_path / "state.db"),
+                "--ids-file",
+                str(deletions_path),
+            ],
+        )
+        result = self._upsert(
+            runner,
+            config_path,
+            documents_path,
+            "--emit-deletions",
+            str(deletions_path),
+        )
+
+        # Then
+        assert deleted.exit_code == 0
+        assert documents_api.deleted == [["2"]]
+        assert '"removed_documents": 0' in result.output
+        assert deletions_path.read_text() == ""
+
+    def test_state_db_excludes_resume(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+
+        # When
+        result = self._upsert(runner, config_path, documents_path, "--resume")
+
+        # Then
+        assert result.exit_code == 2
+        assert documents_api.uploads == []
+
+
+class TestResume:
+    def _upsert(self, runner, config_path, documents_path, *options):
+        return runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "--max-retries",
+                "0",
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-size",
+                "2",
+                *options,
+                str(documents_path),
+            ],
+        )
+
+    def test_resumed_upload_sends_remaining_batches(
+        self, config_path, tmp_path, runner, documents_api, app_dir
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(9))
+        )
+        documents_api.failing_identifiers = {"4"}
+        self._upsert(runner, config_path, documents_path)
+        first_run = list(documents_api.uploads)
+        documents_api.failing_identifiers = set()
+        documents_api.uploads.clear()
+
+        # When
+        result = self._upsert(runner, config_path, documents_path, "--resume")
+
+        # Then
+        resumed_run = documents_api.uploads
+        assert result.exit_code == 0
+        assert f'"skipped_batches": {len(first_run)}' in result.output
+        assert resumed_run[0]["body"].startswith('{"id": "4"')
+        assert _sent_ids(first_run + resumed_run) == list(range(9))
+        identifiers = [
+            upload["customer_batch_identifier"]
+            for upload in first_run + resumed_run
+        ]
+        assert len(set(identifiers)) == len(identifiers)
+        assert os.listdir(os.path.join(app_dir, "manifests")) == []
+
+    def test_resumed_upload_can_use_different_batch_size(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(9))
+        )
+        documents_api.failing_identifiers = {"0"}
+        self._upsert(runner, config_path, documents_path)
+        first_run = list(documents_api.uploads)
+        documents_api.failing_identifiers = set()
+        documents_api.uploads.clear()
+
+        # When
+        result = self._upsert(
+            runner,
+            config_path,
+            documents_path,
+            "--resume",
+            "--batch-size",
+            "5",
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert (
+            max(upload["body"].count("\n") for upload in documents_api.uploads)
+            == 5
+        )
+        assert _sent_ids(first_run + documents_api.uploads) == list(range(9))
+
+    def test_changed_options_are_rejected(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+        documents_api.failing_identifiers = {"1"}
+        self._upsert(runner, config_path, documents_path)
+
+        # When
+        result = self._upsert(
+            runner,
+            config_path,
+            documents_path,
+            "--resume",
+            "--batch-identifier",
+            "lamps",
+        )
+
+        # Then
+        assert result.exit_code == 1
+        assert "batch_identifier changed since" in result.output
+
+    def test_stdin_requires_manifest(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--resume",
+            ],
+            input='{"id": "1", "text": "lamp"}\n',
+        )
+
+        # Then
+        assert result.exit_code == 2
+        assert "only using --manifest" in result.output
+
+
+class TestUploadDocumentsFromJsonl:
+    @pytest.mark.parametrize(
+        "batch_bytes, identifiers",
+        [
+            ("1000", ["documents.jsonl"]),
+            ("60", ["documents-0.jsonl", "documents-1.jsonl"]),
+        ],
+    )
+    def test_file_is_uploaded_in_parts(
+        self,
+        config_path,
+        tmp_path,
+        runner,
+        documents_api,
+        monkeypatch,
+        batch_bytes,
+        identifiers,
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(3))
+        )
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            uploaded[url.rsplit("/", 1)[1]] = data
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-bytes",
+                batch_bytes,
+                "--concurrency",
+                "2",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert sorted(uploaded) == identifiers
+        assert (
+            b"".join(uploaded[identifier] for identifier in identifiers)
+            == documents_path.read_bytes()
+        )
+
+    def test_file_is_uploaded_whole_by_default(
+        self, config_path, tmp_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text(
+            "".join(f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(3))
+        )
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            assert not isinstance(data, bytes)
+            uploaded[url.rsplit("/", 1)[1]] = data.read()
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert '"documents": 3' in result.output
+        assert uploaded == {"documents.jsonl": documents_path.read_bytes()}
+
+    @pytest.mark.parametrize("compress_upload", [False, True])
+    def test_compressed_file_is_uploaded_whole(
+        self,
+        config_path,
+        tmp_path,
+        runner,
+        documents_api,
+        monkeypatch,
+        compress_upload,
+    ) -> None:
+        # Given
+        content = '{"id": "1", "text": "lamp"}\n'
+        documents_path = tmp_path / "documents.jsonl.gz"
+        documents_path.write_bytes(gzip.compress(content.encode()))
+        uploaded = {}
+
+        def put(self, url, data, headers=None, **kwargs):
+            data = data.read()
+            if (headers or {}).get("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            uploaded[url.rsplit("/", 1)[1]] = data
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                *(["--compress-upload"] if compress_upload else []),
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert uploaded == {"documents.jsonl": content.encode()}
+
+    def test_stdin_is_uploaded_whole(
+        self, config_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        content = '{"id": "1", "text": "lamp"}\n'
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            uploaded[url.rsplit("/", 1)[1]] = data.read()
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-identifier",
+                "lamps",
+                "-",
+            ],
+            input=content,
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert uploaded == {"lamps.jsonl": content.encode()}
+
+    def test_resume_requires_parts(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--resume",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 2
+        assert "require --batch-bytes or --batch-size" in result.output
+
+    def test_stdin_is_uploaded_in_parts(
+        self, config_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        content = "".join(
+            f'{{"id": "{i}", "text": "lamp"}}\n' for i in range(3)
+        )
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            uploaded[url.rsplit("/", 1)[1]] = data
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-jsonl",
+                "--collection-id",
+                "lamps",
+                "--batch-identifier",
+                "lamps",
+                "--batch-size",
+                "2",
+                "-",
+            ],
+            input=gzip.compress(content.encode()),
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert sorted(uploaded) == ["lamps-0.jsonl", "lamps-1.jsonl"]
+        assert (
+            uploaded["lamps-0.jsonl"] + uploaded["lamps-1.jsonl"]
+            == content.encode()
+        )
+
+
+class TestUpsertDocumentsFromParquet:
+    def test_rows_are_upserted_in_batches(
+        self, config_path, tmp_path, runner, documents_api
+    ) -> None:
+        # Given
+        parquet_path = tmp_path / "documents.parquet"
+        pyarrow.parquet.write_table(
+            pyarrow.table(
+                {
+                    "id": [str(i) for i in range(5)],
+                    "text": ["lamp"] * 5,
+                    "embeddings": [[0.5, 1.5]] * 5,
+                }
+            ),
+            parquet_path,
+            row_group_size=2,
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upsert-documents-from-parquet",
+                "--collection-id",
+                "lamps",
+                "--column",
+                "text",
+                "--batch-size",
+                "3",
+                str(parquet_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert '"batches": 2' in result.output
+        assert [
+            upload["body"].count("\n") for upload in documents_api.uploads
+        ] == [3, 2]
+        assert json.loads(
+            documents_api.uploads[0]["body"].splitlines()[0]
+        ) == {
+            "id": "0",
+            "text": "lamp",
+        }
+        assert documents_api.uploads[0][
+            "customer_batch_identifier"
+        ].startswith("documents.parquet-")
+
+
+class TestUploadDocumentsFromParquet:
+    def test_file_is_streamed_from_disk(
+        self, config_path, tmp_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        parquet_path = tmp_path / "documents.parquet"
+        pyarrow.parquet.write_table(
+            pyarrow.table({"id": ["1", "2"]}), parquet_path
+        )
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            assert not isinstance(data, bytes)
+            uploaded[url.rsplit("/", 1)[1]] = data.read()
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-parquet",
+                "--collection-id",
+                "lamps",
+                str(parquet_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert uploaded == {"documents.parquet": parquet_path.read_bytes()}
+
+    def test_file_is_uploaded_in_parts(
+        self, config_path, tmp_path, runner, documents_api, monkeypatch
+    ) -> None:
+        # Given
+        parquet_path = tmp_path / "documents.parquet"
+        table = pyarrow.table({"id": [str(i) for i in range(30)]})
+        pyarrow.parquet.write_table(table, parquet_path, row_group_size=10)
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            uploaded[url.rsplit("/", 1)[1]] = data
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "upload-documents-from-parquet",
+                "--collection-id",
+                "lamps",
+                "--part-bytes",
+                "1",
+                "--concurrency",
+                "2",
+                str(parquet_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert sorted(uploaded) == [
+            f"documents-{index}.parquet" for index in range(3)
+        ]
+        assert pyarrow.concat_tables(
+            pyarrow.parquet.read_table(io.BytesIO(uploaded[identifier]))
+            for identifier in sorted(uploaded)
+        ).equals(table)
+
+
+class TestUploadDocumentsFromDirectory:
+    @pytest.fixture
+    def shards(self, tmp_path) -> str:
+        shards = tmp_path / "exports"
+        for part in ["a", "b"]:
+            (shards / part).mkdir(parents=True)
+            (shards / part / "documents.jsonl").write_text(
+                f'{{"id": "{part}1", "text": "lamp"}}\n'
+                f'{{"id": "{part}2", "text": "desk"}}\n'
+            )
+        (shards / "a" / "documents.parquet").write_bytes(b"PAR1")
+        (shards / "a" / "notes.txt").write_text("Not a shard.")
+        return str(shards)
+
+    @pytest.fixture
+    def uploaded(self, monkeypatch) -> dict:
+        uploaded = {}
+
+        def put(self, url, data, **kwargs):
+            # NOTE: Parquet files are streamed from disk.
+            if not isinstance(data, bytes):
+                data = data.read()
+            uploaded[url.rsplit("/", 1)[1]] = data
+            return SimpleNamespace(status_code=200, reason="OK")
+
+        monkeypatch.setattr(upload_module.requests.Session, "put", put)
+        return uploaded
+
+    def _invoke(self, runner, config_path, *args, global_options=()):
+        return runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                *global_options,
+                "upload-documents-from-directory",
+                "--collection-id",
+                "lamps",
+                *args,
+            ],
+        )
+
+    def test_shards_are_uploaded(
+        self, config_path, runner, documents_api, shards, uploaded
+    ) -> None:
+        # When
+        result = self._invoke(runner, config_path, "--recursive", shards)
+
+        # Then
+        output = json.loads(result.output[result.output.index("{") :])
+        assert result.exit_code == 0
+        assert sorted(uploaded) == [
+            "a-documents.jsonl",
+            "a-documents.parquet",
+            "b-documents.jsonl",
+        ]
+        assert [file.get("documents") for file in output["files"]] == [
+            2,
+            None,
+            2,
+        ]
+        assert output["summary"]["files"] == 3
+        assert output["summary"]["failed"] == 0
+        assert output["summary"]["documents"] == 4
+        assert "megabytes_per_second" in output["summary"]
+
+    def test_jsonl_shards_are_upserted(
+        self, config_path, runner, documents_api, shards, uploaded
+    ) -> None:
+        # When
+        result = self._invoke(
+            runner,
+            config_path,
+            "--upsert",
+            os.path.join(shards, "*", "*.jsonl"),
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert uploaded == {}
+        assert sorted(
+            upload["customer_batch_identifier"].rsplit("-", 1)[0]
+            for upload in documents_api.uploads
+        ) == ["a-documents", "b-documents"]
+
+    def test_failed_shard_is_reported(
+        self, config_path, runner, documents_api, shards, uploaded
+    ) -> None:
+        # Given
+        documents_api.failing_identifiers = {"b1"}
+
+        # When
+        result = self._invoke(
+            runner,
+            config_path,
+            "--upsert",
+            "--recursive",
+            shards,
+            global_options=["--max-retries", "0"],
+        )
+
+        # Then
+        output = json.loads(result.output[result.output.index("{") :])
+        assert result.exit_code == 1
+        assert output["summary"]["failed"] == 1
+        assert "Connection reset." in output["files"][2]["error"]
+        assert output["summary"]["documents"] == 2
+
+    def test_no_shards_found(
+        self, config_path, runner, documents_api, tmp_path
+    ) -> None:
+        # When
+        result = self._invoke(runner, config_path, str(tmp_path))
+
+        # Then
+        assert result.exit_code == 1
+        assert "No JSONL or Parquet files found." in result.output
+
+
+class TestDeleteDocuments:
+    def test_ids_are_deleted_in_chunks(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "delete-documents",
+                "--collection-id",
+                "lamps",
+                "--ids-file",
+                "-",
+                "--batch-size",
+                "2",
+                "--concurrency",
+                "2",
+            ],
+            input="1\n2\n\n3\n4\n5\n",
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert sorted(documents_api.deleted) == [["1", "2"], ["3", "4"], ["5"]]
+        output = json.loads(result.output[result.output.index("{") :])
+        assert output == {
+            "response": "Successfully deleted.",
+            "deleted": 5,
+            "failed": 0,
+        }
+
+    def test_failed_chunks_are_counted(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # Given
+        documents_api.failing_identifiers = {"3"}
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "--max-retries",
+                "0",
+                "delete-documents",
+                "--collection-id",
+                "lamps",
+                "--batch-size",
+                "2",
+                "1,2,3,4,5",
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 1
+        assert sorted(documents_api.deleted) == [["1", "2"], ["5"]]
+        output = json.loads(result.output[result.output.index("{") :])
+        assert (output["deleted"], output["failed"]) == (3, 2)
+
+    def test_missing_collection_fails(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "delete-documents",
+                "--collection-id",
+                "missing",
+                "--batch-size",
+                "2",
+                "1,2,3",
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 1
+        assert documents_api.deleted == []
+        output = json.loads(result.output[result.output.index("{") :])
+        assert output["response"] == "Collection missing not found."
+        assert output["deleted"] == 0
+
+    def test_ids_are_required(
+        self, config_path, runner, documents_api
+    ) -> None:
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "delete-documents",
+                "--collection-id",
+                "lamps",
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 2
@@ -0,0 +1,76 @@
+import io
+import pyarrow
+import pyarrow.parquet
+from vantage_cli.partitioning import plan_parts, read_parquet_parts
+
+
+def _write_parquet(path, documents: int, row_group_size: int) -> None:
+    table = pyarrow.table(
+        {
+            "id": [str(index) for index in range(documents)],
+            "text": [f"lamp {index}" for index in range(documents)],
+        }
+    )
+    pyarrow.parquet.write_table(
+        table, path, row_group_size=row_group_size, compression="zstd"
+    )
+
+
+class TestPlanParts:
+    def test_row_groups_are_grouped_up_to_size(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "documents.parquet"
+        _write_parquet(path, documents=1000, row_group_size=100)
+        metadata = pyarrow.parquet.ParquetFile(path).metadata
+        row_group = metadata.row_group(0)
+        row_group_size = sum(
+            row_group.column(index).total_compressed_size
+            for index in range(row_group.num_columns)
+        )
+
+        # When
+        parts = plan_parts(metadata, max_bytes=3 * row_group_size)
+
+        # Then
+        assert [index for part in parts for index in part] == list(range(10))
+        assert all(1 <= len(part) <= 3 for part in parts)
+        assert len(parts) >= 4
+
+    def test_large_row_group_makes_a_part_alone(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "documents.parquet"
+        _write_parquet(path, documents=300, row_group_size=100)
+        metadata = pyarrow.parquet.ParquetFile(path).metadata
+
+        # When
+        parts = plan_parts(metadata, max_bytes=1)
+
+        # Then
+        assert parts == [[0], [1], [2]]
+
+
+class TestReadParquetParts:
+    def test_parts_hold_whole_row_groups(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "documents.parquet"
+        _write_parquet(path, documents=250, row_group_size=100)
+
+        # When
+        parts = list(read_parquet_parts(str(path), max_bytes=1))
+
+        # Then
+        assert [part.index for part in parts] == [0, 1, 2]
+        assert [part.documents for part in parts] == [100, 100, 50]
+        tables = [
+            pyarrow.parquet.read_table(io.BytesIO(part.payload))
+            for part in parts
+        ]
+        assert pyarrow.concat_tables(tables).equals(
+            pyarrow.parquet.read_table(path)
+        )
+        metadata = pyarrow.parquet.ParquetFile(
+            io.BytesIO(parts[0].payload)
+        ).metadata
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+        assert parts[0].start_offset < parts[0].end_offset
+        assert parts[0].end_offset <= parts[1].start_offset
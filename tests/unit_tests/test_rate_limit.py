@@ -0,0 +1,159 @@
+import threading
+import time
+from vantage_sdk.client import VantageClient
+from vantage_cli.rate_limit import (
+    RateLimiter,
+    TokenBucket,
+    install_rate_limiter,
+)
+from vantage_cli.vantage import cli
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class CountingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__()
+        self.sizes = []
+
+    def acquire(self, size=0) -> None:
+        self.sizes.append(size() if callable(size) else size)
+
+
+class TestTokenBucket:
+    def test_requests_are_paced_to_rate(self) -> None:
+        # Given
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+
+        # When
+        for _ in range(11):
+            bucket.acquire()
+
+        # Then
+        assert clock.now == 1.0
+
+    def test_large_request_is_sent_and_paid_by_later_ones(self) -> None:
+        # Given
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, clock=clock, sleep=clock.sleep)
+
+        # When
+        first_delay = bucket.acquire(500)
+        second_delay = bucket.acquire(10)
+
+        # Then
+        assert first_delay == 0
+        assert second_delay == 5.0
+
+    def test_bucket_is_shared_by_threads(self) -> None:
+        # Given
+        bucket = TokenBucket(rate=100, capacity=1)
+        start = time.monotonic()
+
+        def acquire() -> None:
+            for _ in range(10):
+                bucket.acquire()
+
+        # When
+        threads = [threading.Thread(target=acquire) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        assert time.monotonic() - start >= 0.99 * 39 / 100
+
+
+class TestInstallRateLimiter:
+    def test_api_requests_go_through_limiter(self) -> None:
+        # Given
+        client = VantageClient.using_vantage_api_key(
+            vantage_api_key="test-key", account_id="test-account"
+        )
+        rest_client = client.search_api.api.api_client.rest_client
+        sent = []
+        rest_client.request = lambda method, url, **kwargs: sent.append(url)
+        limiter = CountingLimiter()
+
+        # When
+        install_rate_limiter(client, limiter)
+        rest_client.request("POST", "https://api/search", body={"a": 1})
+        install_rate_limiter(client, None)
+        rest_client.request("GET", "https://api/account")
+
+        # Then
+        assert sent == ["https://api/search", "https://api/account"]
+        assert limiter.sizes == [len('{"a": 1}')]
+
+
+class TestCommandLimits:
+    def test_command_section_overrides_general(self, tmp_path, runner) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text(
+            "[general]\naccount_id = test\nrate_limit = 10\n"
+            "[validate-jsonl]\nrate_limit = 2\n"
+        )
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+        obj = {}
+
+        # When
+        runner.invoke(
+            cli,
+            [
+                "-c",
+                str(config_path),
+                "--bandwidth-limit",
+                "1000",
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                str(documents_path),
+            ],
+            obj=obj,
+        )
+
+        # Then
+        assert obj["rate_limiter"].requests.rate == 2
+        assert obj["rate_limiter"].bytes.rate == 1000
+
+    def test_command_line_overrides_command_section(
+        self, tmp_path, runner
+    ) -> None:
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text(
+            "[general]\naccount_id = test\n[validate-jsonl]\nrate_limit = 2\n"
+        )
+        obj = {}
+
+        # When
+        runner.invoke(
+            cli,
+            [
+                "-c",
+                str(config_path),
+                "--rate-limit",
+                "5",
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                str(config_path),
+            ],
+            obj=obj,
+        )
+
+        # Then
+        assert obj["rate_limiter"].requests.rate == 5
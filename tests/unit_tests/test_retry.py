@@ -0,0 +1,183 @@
+import logging
+from types import SimpleNamespace
+import pytest
+from vantage_sdk.core.http.exceptions import (
+    NotFoundException,
+    ServiceException,
+)
+from vantage_cli import client as client_module
+from vantage_cli import retry as retry_module
+from vantage_cli.retry import RetryPolicy, is_retryable, retry_after
+from vantage_cli.vantage import cli
+
+LOGGER = logging.getLogger("test")
+
+
+def _failing(exceptions: list[Exception], calls: list):
+    def function() -> str:
+        calls.append(len(calls))
+        if exceptions:
+            raise exceptions.pop(0)
+        return "done"
+
+    return function
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    sleeps = []
+    monkeypatch.setattr(retry_module.time, "sleep", sleeps.append)
+    return sleeps
+
+
+class TestIsRetryable:
+    @pytest.mark.parametrize(
+        "exception, retryable",
+        [
+            (ServiceException(status=503, reason="Unavailable"), True),
+            (SimpleNamespace(status=429), True),
+            (NotFoundException(status=404, reason="Not Found"), False),
+            (ConnectionError("Connection reset."), True),
+            (ValueError("Invalid."), False),
+        ],
+    )
+    def test_classifies_errors(self, exception, retryable) -> None:
+        # When
+        result = is_retryable(exception)
+
+        # Then
+        assert result == retryable
+
+    def test_reads_retry_after(self) -> None:
+        # Given
+        exception = SimpleNamespace(headers={"Retry-After": "7"})
+
+        # When
+        seconds = retry_after(exception)
+
+        # Then
+        assert seconds == 7.0
+        assert retry_after(SimpleNamespace(headers=None)) is None
+
+
+class TestRetryPolicy:
+    def test_transient_failures_are_retried(self, sleeps, caplog) -> None:
+        # Given
+        calls = []
+        function = _failing(
+            [ConnectionError("Reset."), ConnectionError("Reset.")], calls
+        )
+
+        # When
+        with caplog.at_level(logging.WARNING):
+            result = RetryPolicy(max_retries=3).call(function, LOGGER)
+
+        # Then
+        assert result == "done"
+        assert len(calls) == 3
+        assert all(0 <= sleep <= 1.0 for sleep in sleeps)
+        assert "attempt 2 of 4" in caplog.text
+
+    def test_other_failures_are_raised(self, sleeps) -> None:
+        # Given
+        calls = []
+        function = _failing([ValueError("Invalid.")], calls)
+
+        # When
+        with pytest.raises(ValueError):
+            RetryPolicy().call(function, LOGGER)
+
+        # Then
+        assert len(calls) == 1
+        assert sleeps == []
+
+    def test_gives_up_after_max_retries(self, sleeps, caplog) -> None:
+        # Given
+        calls = []
+        function = _failing([TimeoutError()] * 5, calls)
+
+        # When
+        with pytest.raises(TimeoutError):
+            RetryPolicy(max_retries=2).call(function, LOGGER, "Upload")
+
+        # Then
+        assert len(calls) == 3
+        assert "Upload failed after 3 attempts." in caplog.text
+
+    def test_retry_after_is_honored(self, sleeps) -> None:
+        # Given
+        exception = ServiceException(status=503, reason="Unavailable")
+        exception.headers = {"Retry-After": "4"}
+        function = _failing([exception], [])
+
+        # When
+        RetryPolicy().call(function, LOGGER)
+
+        # Then
+        assert sleeps == [4.0]
+
+    def test_deadline_stops_retries(self, sleeps) -> None:
+        # Given
+        exception = ServiceException(status=503, reason="Unavailable")
+        exception.headers = {"Retry-After": "30"}
+        calls = []
+        function = _failing([exception], calls)
+
+        # When
+        with pytest.raises(ServiceException):
+            RetryPolicy(deadline=10).call(function, LOGGER)
+
+        # Then
+        assert len(calls) == 1
+        assert sleeps == []
+
+
+class TestCommandRetries:
+    @pytest.fixture
+    def calls(self, monkeypatch, sleeps) -> list[str]:
+        calls = []
+
+        def unavailable(name):
+            def call(**kwargs):
+                calls.append(name)
+                raise ServiceException(status=503, reason="Unavailable")
+
+            return call
+
+        client = SimpleNamespace(
+            get_collection=unavailable("get_collection"),
+            create_collection=unavailable("create_collection"),
+        )
+        monkeypatch.setattr(
+            client_module,
+            "create_client_from_vantage_api_key",
+            lambda **kwargs: client,
+        )
+        return calls
+
+    def test_reads_are_retried(self, config_path, runner, calls) -> None:
+        # When
+        runner.invoke(cli, ["-c", config_path, "get-collection", "lamps"])
+
+        # Then
+        assert calls == ["get_collection"] * 4
+
+    def test_creates_are_not_retried(self, config_path, runner, calls) -> None:
+        # When
+        runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "create-collection-upe",
+                "--collection-id",
+                "lamps",
+                "--collection-name",
+                "Lamps",
+                "--embeddings-dimension",
+                "3",
+            ],
+        )
+
+        # Then
+        assert calls == ["create_collection"]
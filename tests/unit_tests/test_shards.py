@@ -0,0 +1,46 @@
+import os
+from vantage_cli.shards import discover_shards, shard_names
+
+
+class TestDiscoverShards:
+    def test_directories_and_patterns(self, tmp_path) -> None:
+        # Given
+        (tmp_path / "a").mkdir()
+        for name in ["a/1.jsonl", "a/2.parquet", "a/3.txt", "4.jsonl"]:
+            (tmp_path / name).write_text("")
+
+        # When
+        flat = discover_shards([str(tmp_path)])
+        recursive = discover_shards([str(tmp_path)], recursive=True)
+        pattern = discover_shards(
+            [str(tmp_path / "**" / "*.jsonl"), str(tmp_path / "4.jsonl")]
+        )
+
+        # Then
+        assert flat == [str(tmp_path / "4.jsonl")]
+        assert recursive == [
+            str(tmp_path / "4.jsonl"),
+            str(tmp_path / "a" / "1.jsonl"),
+            str(tmp_path / "a" / "2.parquet"),
+        ]
+        assert pattern == [
+            str(tmp_path / "4.jsonl"),
+            str(tmp_path / "a" / "1.jsonl"),
+        ]
+
+
+class TestShardNames:
+    def test_names_are_relative_to_common_directory(self) -> None:
+        # Given
+        paths = [
+            os.path.join("exports", "a", "part.jsonl"),
+            os.path.join("exports", "b", "part.jsonl"),
+        ]
+
+        # When
+        names = shard_names(paths)
+
+        # Then
+        assert list(names.values()) == ["a-part", "b-part"]
+        assert shard_names([paths[0]]) == {paths[0]: "part"}
+        assert shard_names(["part.jsonl.gz"]) == {"part.jsonl.gz": "part"}
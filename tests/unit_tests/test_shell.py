@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+import vantage_cli.client as client_module
+from vantage_cli.vantage import cli
+
+
+class TestShell:
+    def test_commands_share_session(self, config_path, tmp_path, runner):
+        # Given
+        documents_path = tmp_path / "documents.jsonl"
+        documents_path.write_text('{"id": "1", "text": "lamp"}\n')
+        lines = [
+            f"validate-jsonl --collection-type OpenAI '{documents_path}'",
+            "",
+            "no-such-command",
+            "serve",
+            "exit",
+            "validate-jsonl",
+        ]
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "shell",
+                "--history-file",
+                str(tmp_path / "history"),
+            ],
+            input="\n".join(lines) + "\n",
+        )
+
+        # Then
+        assert result.exit_code == 0
+        assert '"message": "OK"' in result.output
+        assert "No such command 'no-such-command'." in result.output
+        assert "Command serve can't be executed in the shell." in result.output
+        assert result.output.count("[exit code 0, ") == 1
+        assert result.output.count("[exit code 2, ") == 2
+        assert "Missing argument" not in result.output
+
+    def test_commands_share_client_and_use_own_limits(
+        self, tmp_path, monkeypatch, runner
+    ):
+        # Given
+        config_path = tmp_path / "config.ini"
+        config_path.write_text(
+            "[general]\naccount_id = test\nvantage_api_key = key\n"
+            "rate_limit = 10\n[get-collection]\nrate_limit = 2\n"
+        )
+        rest_client = SimpleNamespace(request=lambda *args, **kwargs: None)
+        api = SimpleNamespace(
+            api_client=SimpleNamespace(rest_client=rest_client)
+        )
+        calls = []
+
+        def call(name, result):
+            def limited(**kwargs):
+                calls.append((name, rest_client.rate_limiter.requests.rate))
+                return result
+
+            return limited
+
+        created = []
+        client = SimpleNamespace(
+            management_api=SimpleNamespace(account_api=api),
+            search_api=SimpleNamespace(api=api),
+            get_collection=call("get_collection", SimpleNamespace()),
+            list_collections=call("list_collections", []),
+        )
+        monkeypatch.setattr(
+            client_module,
+            "create_client_from_vantage_api_key",
+            lambda **kwargs: created.append(kwargs) or client,
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                str(config_path),
+                "shell",
+                "--history-file",
+                str(tmp_path / "history"),
+            ],
+            input="get-collection lamps\nlist-collections\n",
+        )
+
+        # Then
+        assert result.output.count("[exit code 0, ") == 2
+        assert len(created) == 1
+        assert calls == [("get_collection", 2), ("list_collections", 10)]
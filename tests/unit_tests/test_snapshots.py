@@ -0,0 +1,137 @@
+import gzip
+import io
+import json
+import random
+from vantage_cli.snapshots import diff_snapshots, sort_documents
+from vantage_cli.vantage import cli
+
+
+def _lines(documents: dict) -> bytes:
+    return b"".join(
+        f'{{"id": "{id}", "text": "{text}"}}\n'.encode()
+        for id, text in documents.items()
+    )
+
+
+class TestSortDocuments:
+    def test_spilled_runs_are_merged_in_order(self, tmp_path) -> None:
+        # Given
+        ids = [str(index) for index in range(500)]
+        random.Random(7).shuffle(ids)
+        stream = io.BytesIO(_lines({id: "lamp" for id in ids}))
+
+        # When
+        documents = list(
+            sort_documents(stream, str(tmp_path), memory_bytes=2000)
+        )
+
+        # Then
+        assert [id for id, _ in documents] == sorted(ids)
+        assert len(list(tmp_path.iterdir())) > 10
+        assert documents[0][1] == _lines({"0": "lamp"})
+
+
+class TestDiffSnapshots:
+    def test_changes_are_written_to_outputs(self, tmp_path) -> None:
+        # Given
+        old = _lines({"1": "lamp", "2": "desk", "3": "chair", "5": "rug"})
+        new = _lines({"5": "rug", "4": "sofa", "2": "table", "1": "lamp"})
+        upserts, deletions = io.BytesIO(), io.BytesIO()
+
+        # When
+        summary = diff_snapshots(
+            old=io.BytesIO(old),
+            new=io.BytesIO(new),
+            upserts=upserts,
+            deletions=deletions,
+            memory_bytes=300,
+            temporary_directory=str(tmp_path),
+        )
+
+        # Then
+        assert upserts.getvalue() == _lines({"2": "table", "4": "sofa"})
+        assert deletions.getvalue() == b"3\n"
+        assert (summary.added, summary.changed) == (1, 1)
+        assert (summary.unchanged, summary.removed) == (2, 1)
+        assert summary.spill_files > 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_last_document_with_the_same_id_is_used(self) -> None:
+        # Given
+        old = _lines({"1": "lamp"})
+        new = _lines({"1": "desk"}) + _lines({"1": "lamp"})
+        upserts, deletions = io.BytesIO(), io.BytesIO()
+
+        # When
+        summary = diff_snapshots(
+            old=io.BytesIO(old),
+            new=io.BytesIO(new),
+            upserts=upserts,
+            deletions=deletions,
+        )
+
+        # Then
+        assert upserts.getvalue() == b""
+        assert summary.unchanged == 1
+
+
+class TestDiffDocuments:
+    def test_compressed_snapshots_are_compared(
+        self, config_path, tmp_path, runner
+    ) -> None:
+        # Given
+        old_path = tmp_path / "old.jsonl.gz"
+        old_path.write_bytes(gzip.compress(_lines({"1": "lamp", "2": "desk"})))
+        new_path = tmp_path / "new.jsonl"
+        new_path.write_bytes(_lines({"1": "lamp", "3": "rug"}))
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "diff-documents",
+                "--upsert-file",
+                str(tmp_path / "upserts.jsonl"),
+                "--deletions-file",
+                str(tmp_path / "deletions.txt"),
+                str(old_path),
+                str(new_path),
+            ],
+        )
+
+        # Then
+        assert result.exit_code == 0
+        output = json.loads(result.output[result.output.index("{") :])
+        assert (output["added"], output["removed"]) == (1, 1)
+        assert (tmp_path / "upserts.jsonl").read_bytes() == _lines(
+            {"3": "rug"}
+        )
+        assert (tmp_path / "deletions.txt").read_text() == "2\n"
+
+    def test_document_without_id_is_rejected(
+        self, config_path, tmp_path, runner
+    ) -> None:
+        # Given
+        old_path = tmp_path / "old.jsonl"
+        old_path.write_bytes(_lines({"1": "lamp"}) + b'{"text": "desk"}\n')
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "diff-documents",
+                "--upsert-file",
+                str(tmp_path / "upserts.jsonl"),
+                "--deletions-file",
+                str(tmp_path / "deletions.txt"),
+                str(old_path),
+                str(old_path),
+            ],
+        )
+
+        # Then
+        assert "Line 2 of the input" in result.output
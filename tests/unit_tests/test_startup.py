@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import pytest
+from vantage_cli.vantage import COMMANDS, cli
+
+# Cumulative import time budget (in milliseconds) for each entry point.
+# Measured at ~40ms for the CLI group on a developer laptop; most of it is
+# click itself. Importing the SDK alone takes ~900ms, so any regression
+# which pulls it back onto the startup path fails this check.
+IMPORT_BUDGET_MS = {
+    "vantage_cli.vantage": 250,
+    "vantage_cli.config": 200,
+}
+# Wall clock budgets are unreliable on shared CI runners, so the check runs
+# only when requested, e.g. VANTAGE_CLI_CHECK_IMPORT_TIME=1 pytest.
+CHECK_IMPORT_TIME = os.environ.get("VANTAGE_CLI_CHECK_IMPORT_TIME") == "1"
+
+# Modules which must not be imported until a subcommand runs.
+DEFERRED_MODULES = ["vantage_sdk", "jsonpickle", "pydantic"]
+
+
+def _import_time_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+
+    raise AssertionError(f"Module {module} was not imported.")
+
+
+def _loaded_modules_after(args: list[str]) -> list[str]:
+    script = (
+        "import sys\n"
+        "from vantage_cli.vantage import cli\n"
+        "try:\n"
+        f"    cli({args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('\\n'.join(sys.modules), file=sys.stderr)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True
+    )
+    return result.stderr.splitlines()
+
+
+class TestStartup:
+    @pytest.mark.skipif(
+        not CHECK_IMPORT_TIME, reason="VANTAGE_CLI_CHECK_IMPORT_TIME not set"
+    )
+    @pytest.mark.parametrize("module", IMPORT_BUDGET_MS.keys())
+    def test_import_time_budget(self, module) -> None:
+        # When
+        import_time = _import_time_ms(module)
+
+        # Then
+        assert import_time < IMPORT_BUDGET_MS[module]
+
+    @pytest.mark.parametrize("option", ["--help", "--version"])
+    def test_options_do_not_import_sdk(self, config_path, option) -> None:
+        # When
+        modules = _loaded_modules_after(["-c", config_path, option])
+
+        # Then
+        assert "vantage_cli.vantage" in modules
+        for deferred in DEFERRED_MODULES:
+            assert deferred not in modules
+
+    def test_help_lists_all_commands(self, config_path, runner) -> None:
+        # When
+        result = runner.invoke(cli, ["-c", config_path, "--help"])
+
+        # Then
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+
+class TestCommandTable:
+    @pytest.mark.parametrize("name", COMMANDS.keys())
+    def test_registered_command_matches_table(self, name) -> None:
+        # When
+        command = COMMANDS[name].load()
+
+        # Then
+        assert command.name == name
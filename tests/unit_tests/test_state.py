@@ -0,0 +1,117 @@
+import io
+from vantage_cli.batching import BatchLimits, read_jsonl_batches
+from vantage_cli.state import DocumentState
+
+
+def _lines(documents: dict) -> bytes:
+    return b"".join(
+        f'{{"id": "{id}", "text": "{text}"}}\n'.encode()
+        for id, text in documents.items()
+    )
+
+
+def _run(path, documents: dict) -> tuple[bytes, list]:
+    state = DocumentState(path=str(path), collection_id="lamps")
+    stream = state.changed(io.BytesIO(_lines(documents)))
+    changed = b"".join(iter(stream.readline, b""))
+    state.record(changed)
+    removed = list(state.removed())
+    state.mark_pending_deletion(removed)
+    state.close()
+    return changed, removed
+
+
+class TestDocumentState:
+    def test_only_new_and_changed_documents_are_read(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        _run(path, {"1": "lamp", "2": "desk", "3": "chair"})
+
+        # When
+        changed, removed = _run(path, {"1": "lamp", "2": "table", "4": "rug"})
+
+        # Then
+        assert changed == _lines({"2": "table", "4": "rug"})
+        assert removed == ["3"]
+
+    def test_unsent_documents_are_read_again(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        state = DocumentState(path=str(path), collection_id="lamps")
+        stream = state.changed(io.BytesIO(_lines({"1": "lamp", "2": "desk"})))
+        state.record(stream.readline())
+        state.close()
+
+        # When
+        changed, removed = _run(path, {"1": "lamp", "2": "desk"})
+
+        # Then
+        assert changed == _lines({"2": "desk"})
+        assert removed == []
+
+    def test_collections_are_tracked_separately(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        _run(path, {"1": "lamp"})
+        state = DocumentState(path=str(path), collection_id="desks")
+
+        # When
+        stream = state.changed(io.BytesIO(_lines({"1": "lamp"})))
+
+        # Then
+        assert stream.readline() == _lines({"1": "lamp"})
+        state.close()
+
+    def test_removed_documents_are_kept_until_deleted(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        _run(path, {"1": "lamp", "2": "desk", "3": "chair"})
+        _, first = _run(path, {"1": "lamp"})
+
+        # When
+        _, second = _run(path, {"1": "lamp"})
+        state = DocumentState(path=str(path), collection_id="lamps")
+        state.forget(["2"])
+        state.close()
+        _, third = _run(path, {"1": "lamp"})
+
+        # Then
+        assert first == second == ["2", "3"]
+        assert third == ["3"]
+
+    def test_reappearing_removed_document_is_sent_again(
+        self, tmp_path
+    ) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        _run(path, {"1": "lamp", "2": "desk"})
+        _run(path, {"1": "lamp"})
+
+        # When
+        changed, removed = _run(path, {"1": "lamp", "2": "desk"})
+
+        # Then
+        assert changed == _lines({"2": "desk"})
+        assert removed == []
+
+    def test_batch_offsets_point_into_input(self, tmp_path) -> None:
+        # Given
+        path = tmp_path / "state.db"
+        _run(path, {"1": "lamp", "2": "desk"})
+        content = _lines({"1": "lamp", "2": "table", "3": "rug"})
+        state = DocumentState(path=str(path), collection_id="lamps")
+
+        # When
+        batches = list(
+            read_jsonl_batches(
+                state.changed(io.BytesIO(content)),
+                limits=BatchLimits(max_documents=1),
+            )
+        )
+        state.close()
+
+        # Then
+        assert [
+            content[batch.start_offset : batch.end_offset] for batch in batches
+        ] == [batch.payload for batch in batches]
+        assert batches[0].payload == _lines({"2": "table"})
@@ -0,0 +1,268 @@
+import gzip
+import http.server
+import logging
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from vantage_sdk.core.http.api.documents_api import DocumentsApi
+from vantage_sdk.core.http.api_client import ApiClient
+from vantage_sdk.core.http.configuration import Configuration
+from vantage_sdk.exceptions import VantageFileUploadError
+from vantage_cli import upload as upload_module
+from vantage_cli.adaptive import AimdController
+from vantage_cli.batching import Batch, BatchLimits
+from vantage_cli.upload import (
+    DirectUploader,
+    upload_batches,
+    upload_documents,
+)
+
+LOGGER = logging.getLogger("test")
+
+
+def _batches(count: int, read: list):
+    for index in range(count):
+        read.append(index)
+        yield Batch(
+            index=index,
+            start_offset=index * 10,
+            end_offset=(index + 1) * 10,
+            documents=2,
+            payload=b"x" * 10,
+        )
+
+
+class TestUploadBatches:
+    def test_batches_are_sent_in_parallel(self) -> None:
+        # Given
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def send(batch: Batch) -> None:
+            with lock:
+                running.append(batch)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(batch)
+
+        # When
+        summary = upload_batches(
+            batches=_batches(20, []),
+            send=send,
+            concurrency=4,
+            logger=LOGGER,
+        )
+
+        # Then
+        assert (summary.batches, summary.documents, summary.bytes) == (
+            20,
+            40,
+            200,
+        )
+        assert max(peak) == 4
+
+    def test_read_ahead_is_limited_by_max_pending(self) -> None:
+        # Given
+        lock = threading.Lock()
+        done = []
+        held = []
+
+        def batches():
+            for batch in _batches(20, []):
+                with lock:
+                    held.append(batch.index + 1 - len(done))
+                yield batch
+
+        def send(batch: Batch) -> None:
+            time.sleep(0.01)
+            with lock:
+                done.append(batch.index)
+
+        # When
+        summary = upload_batches(
+            batches=batches(),
+            send=send,
+            concurrency=2,
+            logger=LOGGER,
+            max_pending=3,
+        )
+
+        # Then
+        assert summary.batches == 20
+        assert max(held) == 3
+
+    def test_reading_stops_after_failure(self) -> None:
+        # Given
+        read = []
+
+        def send(batch: Batch) -> None:
+            if batch.index == 3:
+                raise ValueError("Rejected.")
+
+        # When
+        with pytest.raises(ValueError, match="Rejected."):
+            upload_batches(
+                batches=_batches(100, read),
+                send=send,
+                concurrency=2,
+                logger=LOGGER,
+            )
+
+        # Then
+        assert len(read) < 100
+
+    def test_failed_batches_are_handed_over(self) -> None:
+        # Given
+        failed = []
+
+        def send(batch: Batch) -> None:
+            if batch.index % 3 == 0:
+                raise ValueError("Rejected.")
+
+        # When
+        summary = upload_batches(
+            batches=_batches(10, []),
+            send=send,
+            concurrency=2,
+            logger=LOGGER,
+            on_failure=lambda batch, exception: failed.append(batch.index),
+        )
+
+        # Then
+        assert sorted(failed) == [0, 3, 6, 9]
+        assert (summary.batches, summary.failed_batches) == (6, 4)
+        assert summary.failed_documents == 8
+
+    def test_overloaded_batch_is_sent_again(self, monkeypatch) -> None:
+        # Given
+        monkeypatch.setattr(upload_module.time, "sleep", lambda _: None)
+        controller = AimdController(
+            limits=BatchLimits(), max_concurrency=4, logger=LOGGER
+        )
+        attempts = []
+
+        def send(batch: Batch) -> None:
+            attempts.append(batch.index)
+            if attempts.count(batch.index) == 1 and batch.index == 1:
+                raise VantageFileUploadError("Too Many Requests", 429)
+
+        # When
+        summary = upload_batches(
+            batches=_batches(3, []),
+            send=send,
+            concurrency=4,
+            logger=LOGGER,
+            controller=controller,
+        )
+
+        # Then
+        assert summary.batches == 3
+        assert attempts.count(1) == 2
+        assert controller.epoch == 1
+
+    def test_overload_fails_without_controller(self) -> None:
+        # Given
+        def send(batch: Batch) -> None:
+            raise VantageFileUploadError("Too Many Requests", 429)
+
+        # When
+        with pytest.raises(VantageFileUploadError):
+            upload_batches(
+                batches=_batches(3, []),
+                send=send,
+                concurrency=1,
+                logger=LOGGER,
+            )
+
+
+class TestUploadDocuments:
+    def test_body_is_sent_as_bytes(self) -> None:
+        # Given
+        api_client = ApiClient(Configuration(host="https://api.example.com"))
+        sent = {}
+
+        def request(method, url, headers=None, body=None, **kwargs):
+            sent.update(body=body, headers=headers)
+            return SimpleNamespace(
+                status=200,
+                data=b"",
+                reason="OK",
+                read=lambda: b"",
+                getheaders=lambda: {},
+                getheader=lambda name, default=None: default,
+            )
+
+        api_client.rest_client.request = request
+        client = SimpleNamespace(
+            account_id="test-account",
+            management_api=SimpleNamespace(
+                documents_api=DocumentsApi(api_client)
+            ),
+        )
+        body = b'{"id": "1", "text": "lamp"}\n'
+
+        # When
+        upload_documents(
+            client=client,
+            collection_id="lamps",
+            batch_identifier="lamps-0",
+            body=body,
+        )
+
+        # Then
+        assert sent["body"] is body
+        assert sent["headers"]["Content-Type"] == "text/plain"
+
+
+class TestDirectUploader:
+    def test_compressed_upload_is_decoded_by_server(self) -> None:
+        # Given
+        received = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_PUT(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                received.append(body)
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/upload"
+        client = SimpleNamespace(
+            account_id="test-account",
+            management_api=SimpleNamespace(
+                collection_api=SimpleNamespace(
+                    get_browser_upload_url=lambda **kwargs: SimpleNamespace(
+                        upload_url=url
+                    )
+                )
+            ),
+        )
+        uploader = DirectUploader(
+            client=client, collection_id="lamps", compress=True
+        )
+        content = b'{"id": "1", "text": "lamp"}\n' * 1000
+
+        # When
+        try:
+            sent = uploader.upload(
+                batch_identifier="lamps.jsonl", content=content
+            )
+        finally:
+            uploader.close()
+            server.shutdown()
+            server.server_close()
+
+        # Then
+        assert received == [content]
+        assert sent < len(content) / 10
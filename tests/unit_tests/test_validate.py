@@ -0,0 +1,37 @@
+import gzip
+import json
+from vantage_cli.vantage import cli
+
+
+class TestValidateJsonl:
+    def test_compressed_file_is_validated(
+        self, config_path, tmp_path, runner
+    ) -> None:
+        # Given
+        documents_path = tmp_path / "documents.jsonl.gz"
+        documents_path.write_bytes(
+            gzip.compress(
+                b'{"id": "1", "text": "lamp"}\n'
+                b'{"id": "1", "text": "desk"}\n'
+                b"not json\n"
+            )
+        )
+
+        # When
+        result = runner.invoke(
+            cli,
+            [
+                "-c",
+                config_path,
+                "validate-jsonl",
+                "--collection-type",
+                "OpenAI",
+                str(documents_path),
+            ],
+        )
+
+        # Then
+        errors = json.loads(result.output[result.output.index("[") :])
+        assert result.exit_code == 0
+        assert [error["line_number"] for error in errors] == [1, 2]
+        assert "JSON decoder error" in json.dumps(errors[1])
@@ -0,0 +1,103 @@
+from logging import Logger
+import math
+from vantage_cli.batching import Batch, BatchLimits
+
+DEFAULT_TARGET_LATENCY_SECONDS = 10.0
+# Batches start at this fraction of the configured limits, and grow by
+# INCREASE_STEP of them after each round of successful batches.
+INITIAL_FRACTION = 0.25
+INCREASE_STEP = 0.1
+DECREASE_FACTOR = 0.5
+MIN_FRACTION = 1 / 64
+
+
+class AimdController:
+    """
+    Adjusts batch size and concurrency of an upload, AIMD style.
+
+    Batch limits are a fraction of the configured ones, and concurrency
+    goes up to the configured one. After each round of batches (as many
+    as are sent in parallel) which succeed within the target latency, both
+    increase additively. A slow batch halves batch size, and throttling or
+    a server error halves both. Outcomes of batches which were sent before
+    the last decrease are ignored, so that one overload is reacted to once.
+    """
+
+    def __init__(
+        self,
+        limits: BatchLimits,
+        max_concurrency: int,
+        logger: Logger,
+        target_latency: float = DEFAULT_TARGET_LATENCY_SECONDS,
+    ):
+        self.limits = limits
+        self.max_documents = limits.max_documents
+        self.max_bytes = limits.max_bytes
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.logger = logger
+        self.fraction = INITIAL_FRACTION
+        self.concurrency = 1
+        self.epoch = 0
+        self._successes = 0
+        self._apply()
+
+    def on_success(self, batch: Batch, latency: float, epoch: int) -> None:
+        if epoch != self.epoch:
+            return
+        if latency > self.target_latency:
+            self._decrease(
+                f"batch {batch.index} took {latency:.1f}s",
+                concurrency=False,
+            )
+            return
+
+        self._successes += 1
+        if self._successes < self.concurrency:
+            return
+        if self.fraction >= 1 and self.concurrency >= self.max_concurrency:
+            return
+        self.fraction = min(1.0, self.fraction + INCREASE_STEP)
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        self._changed(f"round of {self._successes} batches succeeded")
+
+    def on_overload(self, batch: Batch, reason: str, epoch: int) -> None:
+        if epoch != self.epoch:
+            return
+        self._decrease(
+            f"batch {batch.index} failed: {reason}", concurrency=True
+        )
+
+    def _decrease(self, reason: str, concurrency: bool) -> None:
+        self.fraction = max(MIN_FRACTION, self.fraction * DECREASE_FACTOR)
+        if concurrency:
+            self.concurrency = max(
+                1, math.floor(self.concurrency * DECREASE_FACTOR)
+            )
+        self.epoch += 1
+        self._changed(reason)
+
+    def _changed(self, reason: str) -> None:
+        self._successes = 0
+        self._apply()
+        self.logger.info(
+            f"Adaptive upload: {reason}, sending batches of up to "
+            f"{self._limits_text()} with concurrency {self.concurrency}."
+        )
+
+    def _apply(self) -> None:
+        if self.max_documents is not None:
+            self.limits.max_documents = max(
+                1, math.ceil(self.max_documents * self.fraction)
+            )
+        self.limits.max_bytes = max(
+            1, math.ceil(self.max_bytes * self.fraction)
+        )
+
+    def _limits_text(self) -> str:
+        if self.max_documents is None:
+            return f"{self.limits.max_bytes} bytes"
+        return (
+            f"{self.limits.max_documents} documents "
+            f"/ {self.limits.max_bytes} bytes"
+        )
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+import hashlib
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+DEFAULT_BATCH_DOCUMENTS = 500
+DEFAULT_BATCH_BYTES = 5 * 1024 * 1024
+_SKIP_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Batch:
+    """
+    Consecutive JSONL lines which are sent in a single request.
+
+    Offsets are byte positions of the batch in the input, end is exclusive.
+    """
+
+    index: int
+    start_offset: int
+    end_offset: int
+    documents: int
+    payload: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+@dataclass
+class BatchLimits:
+    """
+    Size limits of batches. Read for every line, so they can be changed
+    while the input is being read (e.g. by adaptive upload).
+    """
+
+    max_documents: Optional[int] = DEFAULT_BATCH_DOCUMENTS
+    max_bytes: int = DEFAULT_BATCH_BYTES
+
+
+def batch_digest(collection_id: str, payload: bytes) -> str:
+    """
+    Hex digest of a batch sent to a collection. Batch identifiers derived
+    from it stay the same when the batch is sent again (e.g. after a
+    timeout), so the service can drop duplicates.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(collection_id.encode())
+    digest.update(b"\0")
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+def read_jsonl_batches(
+    stream: BinaryIO,
+    limits: Optional[BatchLimits] = None,
+    skip: Iterable[tuple[int, int]] = (),
+    start_index: int = 0,
+) -> Iterator[Batch]:
+    """
+    Splits JSONL stream into batches, without reading all of it at once.
+
+    Each batch has at most limits.max_documents lines (unless it is None),
+    and at most limits.max_bytes bytes, unless a single line is larger than
+    that, in which case it is sent alone. Blank lines are skipped. Only one
+    batch is kept in memory at a time.
+
+    Byte ranges in skip (e.g. batches sent by a previous run) are left out,
+    seeking over them if the stream allows it. Batches are numbered from
+    start_index. Streams which leave lines of their input out (e.g.
+    DocumentState.changed) report the input position of each line they
+    return as line_offset, so that batch offsets point into the input.
+    """
+    limits = limits or BatchLimits()
+    skip = sorted(skip)
+    index = start_index
+    offset = 0
+    batch_start = 0
+    lines: list[bytes] = []
+    size = 0
+
+    while True:
+        while skip and skip[0][1] <= offset:
+            skip.pop(0)
+        if skip and skip[0][0] <= offset:
+            if lines:
+                yield Batch(
+                    index=index,
+                    start_offset=batch_start,
+                    end_offset=offset,
+                    documents=len(lines),
+                    payload=b"".join(lines),
+                )
+                index += 1
+                lines = []
+                size = 0
+            _skip_to(stream, offset, skip[0][1])
+            offset = batch_start = skip[0][1]
+            continue
+
+        line = stream.readline()
+        if not line:
+            break
+        line_start = getattr(stream, "line_offset", offset)
+        offset = line_start + len(line)
+        if not lines:
+            batch_start = line_start
+        if not line.strip():
+            if not lines:
+                batch_start = offset
+            continue
+        if not line.endswith(b"\n"):
+            line += b"\n"
+
+        if lines and (
+            (
+                limits.max_documents is not None
+                and len(lines) >= limits.max_documents
+            )
+            or size + len(line) > limits.max_bytes
+        ):
+            yield Batch(
+                index=index,
+                start_offset=batch_start,
+                end_offset=line_start,
+                documents=len(lines),
+                payload=b"".join(lines),
+            )
+            index += 1
+            batch_start = line_start
+            lines = []
+            size = 0
+
+        lines.append(line)
+        size += len(line)
+
+    if lines:
+        yield Batch(
+            index=index,
+            start_offset=batch_start,
+            end_offset=offset,
+            documents=len(lines),
+            payload=b"".join(lines),
+        )
+
+
+def _skip_to(stream: BinaryIO, offset: int, target: int) -> None:
+    if stream.seekable():
+        stream.seek(target)
+        return
+    while offset < target:
+        data = stream.read(min(_SKIP_CHUNK_SIZE, target - offset))
+        if not data:
+            break
+        offset += len(data)
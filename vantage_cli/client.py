@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from logging import Logger
+import sys
+import time
+from typing import Optional
+import click
+from vantage_sdk.client import VantageClient
+from vantage_cli.commands.util import mask_sensitive_string
+from vantage_cli.rate_limit import RateLimiter, install_rate_limiter
+from vantage_cli.token_cache import (
+    REFRESH_MARGIN_SECONDS,
+    TokenCache,
+    fetch_token,
+)
+
+
+def create_client_from_vantage_api_key(
+    vantage_api_key: str, account_id: str, api_host: str
+):
+    return VantageClient.using_vantage_api_key(
+        vantage_api_key=vantage_api_key,
+        api_host=api_host,
+        account_id=account_id,
+    )
+
+
+def create_client_from_jwt(jwt_token: str, account_id: str, api_host: str):
+    return VantageClient.using_jwt_token(
+        vantage_api_jwt_token=jwt_token,
+        api_host=api_host,
+        account_id=account_id,
+    )
+
+
+def create_client_from_credentials(
+    account_id: str,
+    client_id: str,
+    client_secret: str,
+    api_host: str,
+    auth_host: str,
+):
+    return VantageClient.using_client_credentials(
+        vantage_client_id=client_id,
+        vantage_client_secret=client_secret,
+        api_host=api_host,
+        auth_host=auth_host,
+        account_id=account_id,
+    )
+
+
+@dataclass
+class _CachedClient:
+    client: VantageClient
+    jwt_token: Optional[str] = None
+    expires_at: Optional[float] = None
+
+    def is_fresh(self) -> bool:
+        return (
+            self.expires_at is None
+            or self.expires_at - REFRESH_MARGIN_SECONDS > time.time()
+        )
+
+
+class ClientFactory:
+    """
+    Creates VantageClient on first use and reuses it afterwards.
+
+    Stored in the click context instead of the client itself, so that
+    commands which don't talk to the API (e.g. validation) never
+    authenticate, nor require credentials to be configured.
+
+    Long-running processes (e.g. daemon) can pass a shared cache, which
+    keeps clients, and their connection pools, warm between commands.
+
+    All API requests of the client, from any thread, go through the rate
+    limiter, if one is given.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        account_id: Optional[str],
+        api_host: str,
+        auth_host: str,
+        vantage_api_key: Optional[str] = None,
+        jwt_token: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        token_cache: Optional[TokenCache] = None,
+        cache: Optional[dict] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.logger = logger
+        self.account_id = account_id
+        self.api_host = api_host
+        self.auth_host = auth_host
+        self.vantage_api_key = vantage_api_key
+        self.jwt_token = jwt_token
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_cache = token_cache
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._client: Optional[VantageClient] = None
+
+    def __call__(self) -> VantageClient:
+        if self._client is None:
+            self._client = self._get_client()
+            # NOTE: Also replaces limiter of a previous command, when client
+            # comes from the shared cache.
+            install_rate_limiter(self._client, self.rate_limiter)
+        return self._client
+
+    def set_rate_limiter(self, rate_limiter: Optional[RateLimiter]) -> None:
+        """Replaces the rate limiter, also for an already created client."""
+        self.rate_limiter = rate_limiter
+        if self._client is not None:
+            install_rate_limiter(self._client, rate_limiter)
+
+    def _get_client(self) -> VantageClient:
+        if self.cache is None:
+            jwt_token = self.jwt_token
+            if (
+                self._uses_client_credentials()
+                and self.token_cache is not None
+            ):
+                jwt_token = self._get_cached_token()
+            return self._create_client(jwt_token=jwt_token)
+
+        # NOTE: Token is not part of the key, cached client gets replaced
+        # once its token changes or expires instead.
+        key = (
+            self.account_id,
+            self.api_host,
+            self.auth_host,
+            self.vantage_api_key,
+            self.jwt_token,
+            self.client_id,
+            self.client_secret,
+        )
+        cached = self.cache.get(key)
+
+        if not self._uses_client_credentials():
+            if cached is None:
+                cached = _CachedClient(
+                    client=self._create_client(jwt_token=self.jwt_token)
+                )
+                self.cache[key] = cached
+            else:
+                self.logger.debug("Reusing existing client.")
+            return cached.client
+
+        if self.token_cache is not None:
+            jwt_token, expires_at = self._get_cached_token(), None
+        elif cached is not None and cached.is_fresh():
+            jwt_token, expires_at = cached.jwt_token, cached.expires_at
+        else:
+            # Client authenticated by the SDK itself never refreshes its
+            # token, so the token is fetched here, where its expiry is known.
+            token = fetch_token(
+                auth_host=self.auth_host,
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                audience=self.api_host,
+            )
+            jwt_token, expires_at = token["access_token"], token["expires_at"]
+
+        if cached is not None and cached.jwt_token == jwt_token:
+            self.logger.debug("Reusing existing client.")
+            return cached.client
+
+        cached = _CachedClient(
+            client=self._create_client(jwt_token=jwt_token),
+            jwt_token=jwt_token,
+            expires_at=expires_at,
+        )
+        self.cache[key] = cached
+        return cached.client
+
+    def _uses_client_credentials(self) -> bool:
+        return bool(
+            not self.vantage_api_key
+            and not self.jwt_token
+            and self.client_id
+            and self.client_secret
+        )
+
+    def _get_cached_token(self) -> str:
+        self.logger.debug("Creating client using Client ID/secret pair.")
+        self.logger.debug(f"Using auth host: {self.auth_host}")
+        return self.token_cache.get_token(
+            auth_host=self.auth_host,
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            account_id=self.account_id,
+            api_host=self.api_host,
+        )
+
+    def _create_client(self, jwt_token: Optional[str]) -> VantageClient:
+        if self.vantage_api_key:
+            self.logger.debug(
+                f"Creating client using API key: {mask_sensitive_string(self.vantage_api_key)}"
+            )
+            return create_client_from_vantage_api_key(
+                vantage_api_key=self.vantage_api_key,
+                account_id=self.account_id,
+                api_host=self.api_host,
+            )
+        elif jwt_token:
+            self.logger.debug("Creating client using JWT Token.")
+            return create_client_from_jwt(
+                jwt_token=jwt_token,
+                account_id=self.account_id,
+                api_host=self.api_host,
+            )
+        elif self.client_id and self.client_secret:
+            self.logger.debug("Creating client using Client ID/secret pair.")
+            self.logger.debug(f"Using auth host: {self.auth_host}")
+            return create_client_from_credentials(
+                account_id=self.account_id,
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                api_host=self.api_host,
+                auth_host=self.auth_host,
+            )
+
+        click.echo(
+            "Either Vantage API ket, JWT token or client ID and secret need to be specified."
+        )
+        sys.exit(127)
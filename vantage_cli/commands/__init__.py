@@ -0,0 +1,8 @@
+# Used to pass API key from configuration. Kept outside of the search
+# module, so that reading the configuration doesn't import the SDK.
+SEARCH_COMMAND_NAMES = [
+    "search-embedding",
+    "search-semantic",
+    "search-more-like-this",
+    "search-more-like-these",
+]
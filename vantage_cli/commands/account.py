@@ -13,7 +13,7 @@ from vantage_cli.commands.util import (
 @click.pass_obj
 def get_account(ctx):
     """Fetches Vantage account details."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -24,6 +24,7 @@ def get_account(ctx):
         command=lambda: client.get_account().__dict__,
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -41,7 +42,7 @@ def get_account(ctx):
 @click.pass_obj
 def update_account(ctx, new_account_name):
     """Updates details of a Vantage account."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -14,7 +14,7 @@ from vantage_cli.commands.util import (
 @click.pass_obj
 def get_vantage_api_keys(ctx):
     """Lists existing Vantage API keys."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -26,6 +26,7 @@ def get_vantage_api_keys(ctx):
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
     )
 
 
@@ -38,7 +39,7 @@ def get_vantage_api_keys(ctx):
 @click.pass_obj
 def get_vantage_api_key(ctx, vantage_api_key_id):
     """Shows a specific Vantage API key details."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -52,6 +53,7 @@ def get_vantage_api_key(ctx, vantage_api_key_id):
         ).__dict__,
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -82,7 +84,7 @@ def get_vantage_api_key(ctx, vantage_api_key_id):
 @click.pass_obj
 def create_external_api_key(ctx, llm_provider, llm_secret, url):
     """Creates a new external API key."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -108,7 +110,7 @@ def create_external_api_key(ctx, llm_provider, llm_secret, url):
 @click.pass_obj
 def get_external_api_keys(ctx):
     """Lists existing external API keys."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -120,6 +122,7 @@ def get_external_api_keys(ctx):
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
     )
 
 
@@ -132,7 +135,7 @@ def get_external_api_keys(ctx):
 @click.pass_obj
 def get_external_api_key(ctx, external_key_id):
     """Shows a specific external API key details."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -144,6 +147,7 @@ def get_external_api_key(ctx, external_key_id):
         ).__dict__,
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -181,7 +185,7 @@ def update_external_api_key(
     ctx, llm_provider, llm_secret, url, external_key_id
 ):
     """Updates external API key data."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -218,7 +222,7 @@ def update_external_api_key(
 @click.pass_obj
 def delete_external_api_key(ctx, external_key_id):
     """Deletes an external API key."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -230,6 +234,7 @@ def delete_external_api_key(ctx, external_key_id):
         ).__dict__,
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -49,7 +49,7 @@ def _delete_collection(client, collection_id: str) -> str:
 @click.pass_obj
 def list_collections(ctx):
     """Lists existing colections."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -59,6 +59,7 @@ def list_collections(ctx):
         command=lambda: [item.__dict__ for item in client.list_collections()],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
     )
 
 
@@ -71,7 +72,7 @@ def list_collections(ctx):
 @click.pass_obj
 def get_collection(ctx, collection_id):
     """Fetches collection details."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -81,6 +82,7 @@ def get_collection(ctx, collection_id):
         lambda: client.get_collection(collection_id=collection_id).__dict__,
         ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -122,7 +124,7 @@ def update_collection(
     collection_id,
 ):
     """Updates collection data."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -160,7 +162,7 @@ def update_collection(
 @click.pass_obj
 def delete_collection(ctx, collection_id):
     """Deletes a collection."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -170,6 +172,7 @@ def delete_collection(ctx, collection_id):
         lambda: _delete_collection(client=client, collection_id=collection_id),
         ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -250,7 +253,7 @@ def create_collection_openai(
         )
 
     """Creates a new OpenAI collection."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -359,7 +362,7 @@ def create_collection_hf(
         )
 
     """Creates a new HuggingFace collection."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -430,7 +433,7 @@ def create_collection_upe(
     collection_preview_url_pattern,
 ):
     """Creates a new collection with user provided embeddings."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
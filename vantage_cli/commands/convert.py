@@ -0,0 +1,113 @@
+from logging import Logger
+import os
+import click
+from vantage_cli.commands.util import CommandExecutor
+from vantage_cli.compression import decompress, strip_compression_suffix
+from vantage_cli.conversion import (
+    DEFAULT_BLOCK_BYTES,
+    DEFAULT_ROW_GROUP_DOCUMENTS,
+    PARQUET_COMPRESSIONS,
+    convert_jsonl_to_parquet as convert,
+)
+from vantage_cli.printer import ContentType, Printer
+
+
+def _default_output_file(input_path: str) -> str:
+    return (
+        strip_compression_suffix(input_path).removesuffix(".jsonl")
+        + ".parquet"
+    )
+
+
+@click.command("convert-jsonl-to-parquet")
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the Parquet file. Defaults to the input path, with .parquet suffix.",
+)
+@click.option(
+    "--row-group-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_ROW_GROUP_DOCUMENTS,
+    show_default=True,
+    help="Maximum number of documents in a row group.",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(PARQUET_COMPRESSIONS, case_sensitive=False),
+    default="snappy",
+    show_default=True,
+    help="Compression of the Parquet file.",
+)
+@click.option(
+    "--embeddings-dimension",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Dimension of embeddings. Defaults to the size of the first ones.",
+)
+@click.option(
+    "--block-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BLOCK_BYTES,
+    show_default=True,
+    help="Number of input bytes parsed at once. Fields are inferred from the first block.",
+)
+@click.argument(
+    "documents-file",
+    type=click.File("rb"),
+    default="-",
+    required=True,
+)
+@click.pass_obj
+def convert_jsonl_to_parquet(
+    ctx,
+    documents_file,
+    output_file,
+    row_group_size,
+    compression,
+    embeddings_dimension,
+    block_size,
+):
+    """
+    Converts documents from a JSONL file to Parquet.
+
+    DOCUMENTS_FILE is a file containing documents in JSONL format, possibly
+    compressed. It can be passed as a path to a file, or it can be read
+    from stdin. Output is ready for upload-documents-from-parquet: it is
+    written in row groups of at most --row-group-size documents, with
+    embeddings stored as fixed size lists of float32 numbers, which is a
+    fraction of their size in JSON. Size reduction and throughput of the
+    conversion are printed once it completes.
+    """
+    printer: Printer = ctx["printer"]
+    executor: CommandExecutor = ctx["executor"]
+    logger: Logger = ctx["logger"]
+
+    # NOTE: Binary stdin might not have a name (e.g. when testing).
+    file_name = getattr(documents_file, "name", "<stdin>")
+    if output_file is None:
+        if file_name == "<stdin>":
+            raise click.UsageError(
+                "--output-file is required when reading from STDIN."
+            )
+        output_file = _default_output_file(file_name)
+    if os.path.abspath(output_file) == os.path.abspath(file_name):
+        raise click.UsageError("Output file can't be the input file.")
+
+    logger.debug(f"Converting {file_name} to {output_file}")
+    printer.print_text(text=f"Converting to '{output_file}'...")
+
+    executor.execute_and_print_output(
+        command=lambda: convert(
+            stream=decompress(documents_file),
+            output_path=output_file,
+            row_group_documents=row_group_size,
+            compression=compression.lower(),
+            embeddings_dimension=embeddings_dimension,
+            block_bytes=block_size,
+        ).to_dict(),
+        output_type=ContentType.OBJECT,
+        printer=printer,
+        retry=False,
+    )
@@ -0,0 +1,82 @@
+from logging import Logger
+import click
+from vantage_cli.commands.util import CommandExecutor
+from vantage_cli.compression import decompress
+from vantage_cli.printer import ContentType, Printer
+from vantage_cli.snapshots import DEFAULT_MEMORY_BYTES, diff_snapshots
+
+
+@click.command("diff-documents")
+@click.option(
+    "--upsert-file",
+    type=click.File("wb"),
+    required=True,
+    help="Path of the JSONL file with new and changed documents.",
+)
+@click.option(
+    "--deletions-file",
+    type=click.File("wb"),
+    required=True,
+    help="Path of the file with IDs of removed documents, one per line.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MEMORY_BYTES,
+    show_default=True,
+    help="Approximate number of bytes of each snapshot sorted in memory, before it is spilled to disk.",
+)
+@click.option(
+    "--temp-dir",
+    type=click.Path(file_okay=False, exists=True),
+    default=None,
+    help="Directory of spill files. Defaults to the system temporary directory.",
+)
+@click.argument("old-file", type=click.File("rb"), required=True)
+@click.argument("new-file", type=click.File("rb"), required=True)
+@click.pass_obj
+def diff_documents(
+    ctx,
+    old_file,
+    new_file,
+    upsert_file,
+    deletions_file,
+    memory_limit,
+    temp_dir,
+):
+    """
+    Compares two JSONL snapshots of documents.
+
+    OLD_FILE and NEW_FILE are JSONL files (possibly compressed), e.g. two
+    consecutive exports of a collection, one of which can be read from
+    stdin. Documents of NEW_FILE which are missing from OLD_FILE, or whose
+    content changed, are written to --upsert-file, ready for
+    upsert-documents-from-jsonl, while IDs of documents missing from
+    NEW_FILE are written to --deletions-file, ready for delete-documents.
+    Snapshots are sorted by document ID on disk, so they don't need to fit
+    in memory.
+    """
+    printer: Printer = ctx["printer"]
+    executor: CommandExecutor = ctx["executor"]
+    logger: Logger = ctx["logger"]
+
+    # NOTE: Binary stdin might not have a name (e.g. when testing).
+    logger.debug(
+        f"Comparing {getattr(old_file, 'name', '<stdin>')} to "
+        f"{getattr(new_file, 'name', '<stdin>')}"
+    )
+    printer.print_text(text="Comparing snapshots...")
+
+    executor.execute_and_print_output(
+        command=lambda: diff_snapshots(
+            old=decompress(old_file),
+            new=decompress(new_file),
+            upserts=upsert_file,
+            deletions=deletions_file,
+            memory_bytes=memory_limit,
+            temporary_directory=temp_dir,
+        ).to_dict(),
+        output_type=ContentType.OBJECT,
+        printer=printer,
+        retry=False,
+    )
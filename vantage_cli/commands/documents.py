@@ -1,89 +1,927 @@
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
 from logging import Logger
+import contextlib
+import gzip
 import os
 import sys
+import tempfile
+import time
+import traceback
+from typing import Callable, Iterable, Iterator, Optional
 import click
 from vantage_sdk import VantageClient
 from vantage_sdk.core.http.exceptions import NotFoundException
 from vantage_cli.printer import Printer, ContentType
 import uuid
+from vantage_cli.adaptive import (
+    DEFAULT_TARGET_LATENCY_SECONDS,
+    AimdController,
+)
+from vantage_cli.batching import (
+    DEFAULT_BATCH_BYTES,
+    DEFAULT_BATCH_DOCUMENTS,
+    Batch,
+    BatchLimits,
+    batch_digest,
+    read_jsonl_batches,
+)
+from vantage_cli.compression import (
+    UPLOAD_COMPRESSION_LEVEL,
+    decompress,
+    is_compressed,
+    open_input,
+    strip_compression_suffix,
+)
+from vantage_cli.conversion import ParquetJsonlReader
+from vantage_cli.dead_letters import (
+    UPLOAD,
+    UPSERT,
+    DeadLetterSpool,
+    read_dead_letters,
+)
+from vantage_cli.manifest import (
+    UploadManifest,
+    default_manifest_file,
+    input_fingerprint,
+    read_manifest_header,
+)
+from vantage_cli.partitioning import read_parquet_parts
+from vantage_cli.rate_limit import RateLimiter
+from vantage_cli.retry import RetryPolicy
+from vantage_cli.shards import (
+    PARQUET_SUFFIX,
+    discover_shards,
+    shard_names,
+)
+from vantage_cli.state import DocumentState
+from vantage_cli.upload import (
+    DirectUploader,
+    TransferStats,
+    upload_batches,
+    upload_documents,
+)
 from vantage_cli.commands.util import (
     CommandExecutor,
-    specific_exception_handler,
+    get_generic_message_for_exception,
 )
 
+# Uploaded files aren't limited like request bodies, parts only keep
+# memory usage bounded.
+DEFAULT_UPLOAD_BATCH_BYTES = 64 * 1024 * 1024
+DEFAULT_DELETE_BATCH_SIZE = 1000
+PARQUET_MAGIC = b"PAR1"
+STDIN = "-"
+
+
+def _open_manifest(
+    command_name: str,
+    collection_id: str,
+    input_path: Optional[str],
+    manifest_path: Optional[str],
+    resume: bool,
+    options: dict,
+) -> Optional[UploadManifest]:
+    if manifest_path is None:
+        if input_path is None:
+            if resume:
+                raise click.UsageError(
+                    "Uploads from STDIN can be resumed only using --manifest."
+                )
+            return None
+        manifest_path = default_manifest_file(
+            command=command_name,
+            collection_id=collection_id,
+            input_path=input_path,
+        )
+
+    header = {
+        **input_fingerprint(input_path),
+        "collection_id": collection_id,
+        **options,
+    }
+    if resume:
+        return UploadManifest.resume(path=manifest_path, header=header)
+    return UploadManifest.create(path=manifest_path, header=header)
+
+
+def _create_controller(
+    adaptive: bool,
+    target_latency: float,
+    limits: BatchLimits,
+    concurrency: int,
+    logger: Logger,
+) -> Optional[AimdController]:
+    if not adaptive:
+        return None
+    return AimdController(
+        limits=limits,
+        max_concurrency=concurrency,
+        logger=logger,
+        target_latency=target_latency,
+    )
+
+
+def _send_jsonl(
+    stream,
+    send: Callable[[Batch], str],
+    manifest: Optional[UploadManifest],
+    limits: BatchLimits,
+    concurrency: int,
+    controller: Optional[AimdController],
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    on_failure: Optional[Callable[[Batch, Exception], None]] = None,
+) -> dict:
+    if manifest is None:
+        batches = read_jsonl_batches(stream=stream, limits=limits)
+    else:
+        batches = manifest.batches(stream=stream, limits=limits)
+
+    def send_and_record(batch: Batch) -> None:
+        batch_identifier = send(batch)
+        if manifest is not None:
+            manifest.record(batch=batch, batch_identifier=batch_identifier)
+
+    try:
+        summary = upload_batches(
+            batches=batches,
+            send=send_and_record,
+            concurrency=concurrency,
+            logger=logger,
+            controller=controller,
+            retry_policy=retry_policy,
+            on_failure=on_failure,
+        )
+    except BaseException:
+        if manifest is not None:
+            manifest.close()
+            logger.error(
+                "Sent batches are recorded, run the same command with "
+                "--resume to send only the remaining ones."
+            )
+        raise
+
+    response = {
+        "response": "Successfully sent to processing.",
+        "batches": summary.batches,
+        "documents": summary.documents,
+    }
+    if summary.failed_batches:
+        response.update(
+            response=(
+                f"{summary.failed_batches} batches failed, and were written "
+                f"to the dead-letter directory."
+            ),
+            failed_batches=summary.failed_batches,
+            failed_documents=summary.failed_documents,
+        )
+    if manifest is not None:
+        manifest.close(finished=True)
+        if manifest.completed:
+            response["skipped_batches"] = len(manifest.completed)
+    return response
+
+
+def _dead_letter_handler(
+    dead_letters: Optional[DeadLetterSpool],
+    identify: Callable[[Batch], str],
+    logger: Logger,
+) -> Optional[Callable[[Batch, Exception], None]]:
+    if dead_letters is None:
+        return None
+
+    def on_failure(batch: Batch, exception: Exception) -> None:
+        letter = dead_letters.write(
+            batch=batch,
+            batch_identifier=identify(batch),
+            error=get_generic_message_for_exception(exception),
+        )
+        logger.warning(f"Batch {batch.index} written to {letter.path}.")
+
+    return on_failure
+
+
+def _open_dead_letters(
+    dead_letter_dir: Optional[str],
+    kind: str,
+    collection_id: str,
+    input_name: str,
+) -> Optional[DeadLetterSpool]:
+    if dead_letter_dir is None:
+        return None
+    return DeadLetterSpool(
+        directory=dead_letter_dir,
+        kind=kind,
+        collection_id=collection_id,
+        input_name=input_name,
+    )
+
 
 def _upsert_jsonl(
     client: VantageClient,
     collection_id: str,
-    batch_identifier: str,
+    batch_identifier: Optional[str],
     documents_file,
-) -> str:
-    response = client.upsert_documents_from_jsonl_string(
-        collection_id=collection_id,
-        documents_jsonl=documents_file.read(),
-        batch_identifier=batch_identifier,
+    limits: BatchLimits,
+    concurrency: int,
+    controller: Optional[AimdController],
+    retry_policy: Optional[RetryPolicy],
+    manifest: Optional[UploadManifest],
+    logger: Logger,
+    state: Optional[DocumentState] = None,
+    deletions_path: Optional[str] = None,
+    compress: bool = False,
+    stats: Optional[TransferStats] = None,
+    dead_letters: Optional[DeadLetterSpool] = None,
+) -> dict:
+    def identify(batch: Batch) -> str:
+        digest = batch_digest(collection_id, batch.payload)
+        if batch_identifier is None:
+            return digest
+        return f"{batch_identifier}-{digest}"
+
+    def send(batch: Batch) -> str:
+        identifier = identify(batch)
+        logger.debug(
+            f"Sending batch {identifier} with {batch.documents} documents "
+            f"({batch.size} bytes)."
+        )
+        sent = upload_documents(
+            client=client,
+            collection_id=collection_id,
+            batch_identifier=identifier,
+            body=batch.payload,
+            compress=compress,
+        )
+        if stats is not None:
+            stats.add(logical_bytes=batch.size, wire_bytes=sent)
+        if state is not None:
+            state.record(batch.payload)
+        return identifier
+
+    response = _send_jsonl(
+        stream=(
+            documents_file if state is None else state.changed(documents_file)
+        ),
+        send=send,
+        manifest=manifest,
+        limits=limits,
+        concurrency=concurrency,
+        controller=controller,
+        retry_policy=retry_policy,
+        logger=logger,
+        on_failure=_dead_letter_handler(
+            dead_letters=dead_letters, identify=identify, logger=logger
+        ),
     )
+    if state is not None:
+        response["unchanged_documents"] = state.unchanged
+        if deletions_path is not None and "failed_batches" in response:
+            # NOTE: Documents of failed batches weren't recorded as seen.
+            logger.warning("Deletions aren't emitted, since batches failed.")
+        elif deletions_path is not None:
+            response["removed_documents"] = _emit_deletions(
+                state=state, deletions_path=deletions_path
+            )
+    return response
 
-    if response is None:
-        message = "Successfully sent to processing."
-    else:
-        message = f"Sending to processing failed with status {response}"
 
-    return {"response": message}
+def _emit_deletions(state: DocumentState, deletions_path: str) -> int:
+    removed = list(state.removed())
+    with open(deletions_path, "w") as file:
+        file.writelines(f"{id}\n" for id in removed)
+    # NOTE: Removed documents are kept until delete-documents (with the same
+    # --state-db) confirms they were deleted, so that they are emitted again
+    # if the deletion doesn't happen.
+    state.mark_pending_deletion(removed)
+    return len(removed)
 
 
 def _upload_parquet(
     client: VantageClient,
     collection_id: str,
     parquet_file_name: str,
-) -> str:
-    response = client.upload_documents_from_parquet_file(
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    with open(parquet_file_name, "rb") as file:
+        if file.read(len(PARQUET_MAGIC)) != PARQUET_MAGIC:
+            raise ValueError("File must be a valid parquet file.")
+    uploader = DirectUploader(
+        client=client,
         collection_id=collection_id,
-        parquet_file_path=parquet_file_name,
+        rate_limiter=rate_limiter,
     )
+    try:
+        uploader.upload_file(
+            batch_identifier=os.path.basename(parquet_file_name),
+            path=parquet_file_name,
+        )
+    finally:
+        uploader.close()
 
-    if response == 200:
-        message = "Successfully sent to processing."
-    else:
-        message = f"Processing failed with status {response}"
+    return {"response": "Successfully sent to processing."}
+
+
+def _upload_parquet_parts(
+    client: VantageClient,
+    collection_id: str,
+    parquet_file_name: str,
+    part_bytes: int,
+    concurrency: int,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    stem = os.path.basename(parquet_file_name).removesuffix(PARQUET_SUFFIX)
+    uploader = DirectUploader(
+        client=client,
+        collection_id=collection_id,
+        concurrency=concurrency,
+        rate_limiter=rate_limiter,
+    )
+
+    def send(batch: Batch) -> None:
+        # NOTE: Batch identifier MUST have a ".parquet" suffix,
+        # otherwise service won't process it.
+        identifier = f"{stem}-{batch.index}{PARQUET_SUFFIX}"
+        logger.debug(
+            f"Uploading {identifier} with {batch.documents} documents "
+            f"({batch.size} bytes)."
+        )
+        uploader.upload(batch_identifier=identifier, content=batch.payload)
 
-    return {"response": message}
+    try:
+        summary = upload_batches(
+            batches=read_parquet_parts(
+                parquet_file_name, max_bytes=part_bytes
+            ),
+            send=send,
+            concurrency=concurrency,
+            logger=logger,
+            retry_policy=retry_policy,
+            # NOTE: Parts are large, so only one is created ahead of those
+            # being uploaded.
+            max_pending=concurrency + 1,
+        )
+    finally:
+        uploader.close()
+
+    return {
+        "response": "Successfully sent to processing.",
+        "parts": summary.batches,
+        "documents": summary.documents,
+    }
 
 
 def _upload_jsonl(
     client: VantageClient,
     collection_id: str,
-    documents_file,
-) -> str:
-    response = client.upload_documents_from_jsonl_file(
+    documents_file: str,
+    limits: Optional[BatchLimits],
+    concurrency: int,
+    controller: Optional[AimdController],
+    retry_policy: Optional[RetryPolicy],
+    manifest: Optional[UploadManifest],
+    logger: Logger,
+    rate_limiter: Optional[RateLimiter] = None,
+    name: Optional[str] = None,
+    compress: bool = False,
+    stats: Optional[TransferStats] = None,
+    dead_letters: Optional[DeadLetterSpool] = None,
+) -> dict:
+    """
+    Uploads JSONL input as a single file, or split into parts limited by
+    limits, unless they are None.
+    """
+    stem = name or strip_compression_suffix(
+        os.path.basename(documents_file)
+    ).removesuffix(".jsonl")
+    uploader = DirectUploader(
+        client=client,
         collection_id=collection_id,
-        jsonl_file_path=documents_file,
+        concurrency=concurrency,
+        rate_limiter=rate_limiter,
+        compress=compress,
     )
+    if limits is None:
+        try:
+            return _upload_jsonl_file(
+                uploader=uploader,
+                documents_file=documents_file,
+                batch_identifier=f"{stem}.jsonl",
+                retry_policy=retry_policy,
+                logger=logger,
+                stats=stats,
+            )
+        finally:
+            uploader.close()
 
-    if response == 200:
-        message = "Successfully sent to processing."
+    # NOTE: Size of compressed input (or STDIN) isn't known before it is
+    # read, so all of its parts are numbered.
+    if documents_file == STDIN:
+        file_size = None
+        input_context = contextlib.nullcontext(
+            decompress(click.get_binary_stream("stdin"))
+        )
     else:
-        message = f"Sending to processing failed with status {response}"
+        file_size = (
+            None
+            if is_compressed(documents_file)
+            else os.path.getsize(documents_file)
+        )
+        input_context = open_input(documents_file)
 
-    return {"response": message}
+    def identify(batch: Batch) -> str:
+        # NOTE: Batch identifier MUST have a ".jsonl" suffix, otherwise
+        # service will process it as Parquet.
+        if batch.start_offset == 0 and batch.end_offset == file_size:
+            return f"{stem}.jsonl"
+        return f"{stem}-{batch.index}.jsonl"
 
+    def send(batch: Batch) -> str:
+        identifier = identify(batch)
+        logger.debug(
+            f"Uploading {identifier} with {batch.documents} documents "
+            f"({batch.size} bytes)."
+        )
+        sent = uploader.upload(
+            batch_identifier=identifier, content=batch.payload
+        )
+        if stats is not None:
+            stats.add(logical_bytes=batch.size, wire_bytes=sent)
+        return identifier
 
-def _delete_documents(
+    with input_context as file:
+        try:
+            return _send_jsonl(
+                stream=file,
+                send=send,
+                manifest=manifest,
+                limits=limits,
+                concurrency=concurrency,
+                controller=controller,
+                retry_policy=retry_policy,
+                logger=logger,
+                on_failure=_dead_letter_handler(
+                    dead_letters=dead_letters, identify=identify, logger=logger
+                ),
+            )
+        finally:
+            uploader.close()
+
+
+def _upload_jsonl_file(
+    uploader: DirectUploader,
+    documents_file: str,
+    batch_identifier: str,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    stats: Optional[TransferStats] = None,
+) -> dict:
+    """
+    Uploads JSONL input as a single file. Uncompressed files are streamed
+    from disk, other input (STDIN, compressed files, or files sent gzip
+    compressed) is written to a temporary file first, so that the upload
+    can be retried.
+    """
+
+    def upload(path: str, headers: Optional[dict] = None) -> int:
+        return _call_with_retry(
+            function=lambda: uploader.upload_file(
+                batch_identifier=batch_identifier, path=path, headers=headers
+            ),
+            retry_policy=retry_policy,
+            logger=logger,
+            description=f"Uploading {batch_identifier}",
+        )
+
+    if (
+        documents_file != STDIN
+        and not uploader.compress
+        and not is_compressed(documents_file)
+    ):
+        with open(documents_file, "rb") as file:
+            documents = sum(1 for line in file if line.strip())
+        size = upload(documents_file)
+        logical_size = size
+    else:
+        with tempfile.TemporaryDirectory(
+            prefix="vantage-upload-"
+        ) as directory:
+            spool_path = os.path.join(directory, batch_identifier)
+            input_context = (
+                contextlib.nullcontext(
+                    decompress(click.get_binary_stream("stdin"))
+                )
+                if documents_file == STDIN
+                else open_input(documents_file)
+            )
+            documents = 0
+            logical_size = 0
+            with input_context as file, open(spool_path, "wb") as spool:
+                output = (
+                    gzip.GzipFile(
+                        fileobj=spool,
+                        mode="wb",
+                        compresslevel=UPLOAD_COMPRESSION_LEVEL,
+                        mtime=0,
+                    )
+                    if uploader.compress
+                    else contextlib.nullcontext(spool)
+                )
+                with output as target:
+                    for line in file:
+                        if line.strip():
+                            documents += 1
+                        logical_size += len(line)
+                        target.write(line)
+            size = upload(
+                spool_path,
+                headers=(
+                    {"Content-Encoding": "gzip"} if uploader.compress else None
+                ),
+            )
+    if stats is not None:
+        stats.add(logical_bytes=logical_size, wire_bytes=size)
+    return {
+        "response": "Successfully sent to processing.",
+        "batches": 1,
+        "documents": documents,
+    }
+
+
+def _upload_shard(
     client: VantageClient,
     collection_id: str,
-    documents_ids: [str],
-) -> str:
-    response = client.delete_documents(
+    path: str,
+    name: str,
+    upsert: bool,
+    limits: Optional[BatchLimits],
+    uploader: DirectUploader,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    rate_limiter: Optional[RateLimiter],
+    compress: bool = False,
+    stats: Optional[TransferStats] = None,
+    dead_letter_dir: Optional[str] = None,
+) -> dict:
+    result = {"file": path, "bytes": os.path.getsize(path)}
+    dead_letters = _open_dead_letters(
+        dead_letter_dir=dead_letter_dir,
+        kind=UPSERT if upsert else UPLOAD,
         collection_id=collection_id,
-        document_ids=documents_ids,
+        input_name=path,
     )
+    start = time.perf_counter()
+    sent = {}
+    try:
+        if path.endswith(PARQUET_SUFFIX):
+            _call_with_retry(
+                function=lambda: uploader.upload_file(
+                    batch_identifier=f"{name}{PARQUET_SUFFIX}",
+                    path=path,
+                ),
+                retry_policy=retry_policy,
+                logger=logger,
+                description=f"Uploading {path}",
+            )
+            result["batches"] = 1
+        elif upsert:
+            with open_input(path) as file:
+                sent = _upsert_jsonl(
+                    client=client,
+                    collection_id=collection_id,
+                    batch_identifier=name,
+                    documents_file=file,
+                    limits=limits,
+                    concurrency=1,
+                    controller=None,
+                    retry_policy=retry_policy,
+                    manifest=None,
+                    logger=logger,
+                    compress=compress,
+                    stats=stats,
+                    dead_letters=dead_letters,
+                )
+            result.update(batches=sent["batches"], documents=sent["documents"])
+        else:
+            sent = _upload_jsonl(
+                client=client,
+                collection_id=collection_id,
+                documents_file=path,
+                limits=limits,
+                concurrency=1,
+                controller=None,
+                retry_policy=retry_policy,
+                manifest=None,
+                logger=logger,
+                rate_limiter=rate_limiter,
+                name=name,
+                compress=compress,
+                stats=stats,
+                dead_letters=dead_letters,
+            )
+            result.update(batches=sent["batches"], documents=sent["documents"])
+        if "failed_batches" in sent:
+            result["failed_batches"] = sent["failed_batches"]
+    except Exception as exception:
+        logger.debug(traceback.format_exc())
+        result["error"] = get_generic_message_for_exception(exception)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(
+        f"{'Failed' if 'error' in result else 'Sent'} {path} "
+        f"in {result['seconds']}s."
+    )
+    return result
 
-    if response is None:
-        message = "Sucessfully deleted."
-    else:
-        message = f"Deleting failed with status {response}"
 
-    return {"response": message}
+def _call_with_retry(
+    function: Callable,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    description: str,
+):
+    if retry_policy is None:
+        return function()
+    return retry_policy.call(
+        function=function, logger=logger, description=description
+    )
+
+
+def _upload_shards(
+    client: VantageClient,
+    collection_id: str,
+    paths: list,
+    upsert: bool,
+    limits: Optional[BatchLimits],
+    concurrency: int,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    rate_limiter: Optional[RateLimiter],
+    compress: bool = False,
+    stats: Optional[TransferStats] = None,
+    dead_letter_dir: Optional[str] = None,
+) -> dict:
+    names = shard_names(paths)
+    uploader = DirectUploader(
+        client=client,
+        collection_id=collection_id,
+        concurrency=concurrency,
+        rate_limiter=rate_limiter,
+    )
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="shard"
+        ) as pool:
+            results = list(
+                pool.map(
+                    lambda path: _upload_shard(
+                        client=client,
+                        collection_id=collection_id,
+                        path=path,
+                        name=names[path],
+                        upsert=upsert,
+                        # NOTE: Limits are shared, but never changed.
+                        limits=limits,
+                        uploader=uploader,
+                        retry_policy=retry_policy,
+                        logger=logger,
+                        rate_limiter=rate_limiter,
+                        compress=compress,
+                        stats=stats,
+                        dead_letter_dir=dead_letter_dir,
+                    ),
+                    paths,
+                )
+            )
+    finally:
+        uploader.close()
+    # NOTE: Guards against division by zero, e.g. for empty files.
+    seconds = max(time.perf_counter() - start, 1e-6)
+
+    sent = [result for result in results if "error" not in result]
+    documents = sum(result.get("documents", 0) for result in sent)
+    size = sum(result["bytes"] for result in sent)
+    return {
+        "files": results,
+        "summary": {
+            "files": len(results),
+            "failed": len(results) - len(sent),
+            "failed_batches": sum(
+                result.get("failed_batches", 0) for result in sent
+            ),
+            "documents": documents,
+            "bytes": size,
+            "seconds": round(seconds, 3),
+            "documents_per_second": round(documents / seconds, 1),
+            "megabytes_per_second": round(size / seconds / 1024**2, 3),
+            **(stats.to_dict() if stats is not None else {}),
+        },
+    }
+
+
+def _replay_dead_letters(
+    client: VantageClient,
+    directory: str,
+    concurrency: int,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    rate_limiter: Optional[RateLimiter],
+    compress: bool,
+) -> dict:
+    letters = list(read_dead_letters(directory))
+    uploaders = {
+        collection_id: DirectUploader(
+            client=client,
+            collection_id=collection_id,
+            concurrency=concurrency,
+            rate_limiter=rate_limiter,
+            compress=compress,
+        )
+        for collection_id in {
+            letter.metadata["collection_id"]
+            for letter in letters
+            if letter.metadata["kind"] == UPLOAD
+        }
+    }
+
+    def read_batches() -> Iterator[Batch]:
+        for index, letter in enumerate(letters):
+            yield Batch(
+                index=index,
+                start_offset=letter.metadata["start_offset"],
+                end_offset=letter.metadata["end_offset"],
+                documents=letter.metadata["documents"],
+                payload=letter.read_payload(),
+            )
+
+    def send(batch: Batch) -> None:
+        metadata = letters[batch.index].metadata
+        logger.debug(
+            f"Sending {metadata['batch_identifier']} from "
+            f"{letters[batch.index].path}."
+        )
+        if metadata["kind"] == UPLOAD:
+            uploaders[metadata["collection_id"]].upload(
+                batch_identifier=metadata["batch_identifier"],
+                content=batch.payload,
+            )
+        else:
+            upload_documents(
+                client=client,
+                collection_id=metadata["collection_id"],
+                batch_identifier=metadata["batch_identifier"],
+                body=batch.payload,
+                compress=compress,
+            )
+        letters[batch.index].remove()
+
+    def on_failure(batch: Batch, exception: Exception) -> None:
+        letters[batch.index].update_error(
+            get_generic_message_for_exception(exception)
+        )
+
+    try:
+        summary = upload_batches(
+            batches=read_batches(),
+            send=send,
+            concurrency=concurrency,
+            logger=logger,
+            retry_policy=retry_policy,
+            on_failure=on_failure,
+        )
+    finally:
+        for uploader in uploaders.values():
+            uploader.close()
+
+    return {
+        "response": (
+            f"{summary.failed_batches} batches failed again, and were kept."
+            if summary.failed_batches
+            else "Successfully sent to processing."
+        ),
+        "batches": summary.batches,
+        "documents": summary.documents,
+        "failed_batches": summary.failed_batches,
+        "failed_documents": summary.failed_documents,
+    }
+
+
+def _read_id_chunks(ids: Iterable[str], size: int) -> Iterator[list]:
+    chunk = []
+    for id in ids:
+        id = id.strip()
+        if not id:
+            continue
+        chunk.append(id)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _delete_chunk(
+    client: VantageClient,
+    collection_id: str,
+    chunk: list,
+    index: int,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+) -> str:
+    try:
+        _call_with_retry(
+            function=lambda: client.delete_documents(
+                collection_id=collection_id,
+                document_ids=chunk,
+            ),
+            retry_policy=retry_policy,
+            logger=logger,
+            description=f"Deleting chunk {index}",
+        )
+    except NotFoundException:
+        # NOTE: Deletion is an upsert of the collection, so it is the
+        # collection which wasn't found, not the documents.
+        logger.error(f"Deleting chunk {index} failed: collection not found.")
+        return "collection_not_found"
+    except Exception as exception:
+        logger.debug(traceback.format_exc())
+        logger.error(
+            f"Deleting chunk {index} ({len(chunk)} documents, starting with "
+            f"{chunk[0]}) failed: {get_generic_message_for_exception(exception)}"
+        )
+        return "failed"
+    return "deleted"
+
+
+def _delete_documents(
+    client: VantageClient,
+    collection_id: str,
+    documents_ids: Iterable[str],
+    chunk_size: int,
+    concurrency: int,
+    retry_policy: Optional[RetryPolicy],
+    logger: Logger,
+    state: Optional[DocumentState] = None,
+) -> dict:
+    """
+    Deletes documents in chunks of chunk_size IDs, concurrency at a time.
+
+    IDs are read only when there is room for their chunk, so any number of
+    them can be deleted. Failed chunks don't stop the others, unless the
+    collection wasn't found, in which case no further chunks are sent.
+    """
+    counts = {"deleted": 0, "failed": 0}
+    collection_not_found = False
+    chunks = enumerate(_read_id_chunks(documents_ids, size=chunk_size))
+    pending = {}
+
+    def collect(return_when: str) -> None:
+        nonlocal collection_not_found
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            result = future.result()
+            chunk = pending.pop(future)
+            if result == "collection_not_found":
+                collection_not_found = True
+                result = "failed"
+            elif result == "deleted" and state is not None:
+                state.forget(chunk)
+            counts[result] += len(chunk)
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="delete"
+    ) as pool:
+        for index, chunk in chunks:
+            if collection_not_found:
+                break
+            if len(pending) >= 2 * concurrency:
+                collect(return_when=FIRST_COMPLETED)
+            future = pool.submit(
+                _delete_chunk,
+                client=client,
+                collection_id=collection_id,
+                chunk=chunk,
+                index=index,
+                retry_policy=retry_policy,
+                logger=logger,
+            )
+            pending[future] = chunk
+        collect(return_when=ALL_COMPLETED)
+
+    if collection_not_found:
+        message = f"Collection {collection_id} not found."
+    elif counts["failed"]:
+        message = f"Deleting failed for {counts['failed']} documents."
+    else:
+        message = "Successfully deleted."
+    return {"response": message, **counts}
 
 
 @click.command("upload-documents-from-parquet")
@@ -93,20 +931,41 @@ def _delete_documents(
     required=True,
     help="Collection ID.",
 )
+@click.option(
+    "--part-bytes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Split the file along row groups into parts of at most this many bytes.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of parts uploaded in parallel.",
+)
 @click.argument(
     "parquet-file",
     required=True,
     type=click.STRING,
 )
 @click.pass_obj
-def upload_documents_from_parquet(ctx, collection_id, parquet_file):
+def upload_documents_from_parquet(
+    ctx, collection_id, parquet_file, part_bytes, concurrency
+):
     """
     Uploads documents from a Parquet file.
 
     DOCUMENTS_FILE is a file containing documents in Parquet format.
     It can be passed as a path to a file, or it can be read from stdin.
+    With --part-bytes, the file is uploaded in parts, named
+    <file name>-<part>.parquet, each holding whole row groups of the file
+    (a row group larger than --part-bytes makes a part alone). Parts are
+    created in memory while others are uploaded, so up to --concurrency + 2
+    of them (those uploaded, one waiting, and one being created) take
+    memory at once.
     """
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -121,14 +980,35 @@ def upload_documents_from_parquet(ctx, collection_id, parquet_file):
 
     printer.print_text(text=f"Uploading file '{parquet_file}'...")
 
+    if part_bytes is not None:
+        executor.execute_and_print_output(
+            command=lambda: _upload_parquet_parts(
+                client=client,
+                collection_id=collection_id,
+                parquet_file_name=parquet_file,
+                part_bytes=part_bytes,
+                concurrency=concurrency,
+                retry_policy=executor.retry_policy,
+                logger=logger,
+                rate_limiter=ctx["rate_limiter"],
+            ),
+            output_type=ContentType.OBJECT,
+            printer=printer,
+            # NOTE: Parts are retried individually instead.
+            retry=False,
+        )
+        return
+
     executor.execute_and_print_output(
         command=lambda: _upload_parquet(
             client=client,
             collection_id=collection_id,
             parquet_file_name=parquet_file,
+            rate_limiter=ctx["rate_limiter"],
         ),
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
     )
 
 
@@ -145,6 +1025,66 @@ def upload_documents_from_parquet(ctx, collection_id, parquet_file):
     required=False,
     help="Customer batch identifier.",
 )
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Upload the file in parts of at most this many documents.",
+)
+@click.option(
+    "--batch-bytes",
+    type=click.IntRange(min=1),
+    default=None,
+    help=f"Upload the file in parts of at most this many bytes ({DEFAULT_UPLOAD_BATCH_BYTES} with --batch-size).",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of files uploaded in parallel.",
+)
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    default=False,
+    help=(
+        "Adjust batch size and concurrency to observed latency and "
+        "throttling, up to --batch-size, --batch-bytes and --concurrency."
+    ),
+)
+@click.option(
+    "--target-latency",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_TARGET_LATENCY_SECONDS,
+    show_default=True,
+    help="Request latency in seconds, above which adaptive upload reduces batch size.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Skip batches sent by a previous, interrupted, run of the same upload.",
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the file recording sent batches. Defaults to a file in the application config directory.",
+)
+@click.option(
+    "--dead-letter-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write batches which failed after all retries to this directory, for replay-dead-letters, and go on.",
+)
+@click.option(
+    "--compress-upload",
+    is_flag=True,
+    default=False,
+    help="Send JSONL documents gzip compressed, and report bytes sent before and after compression.",
+)
 @click.argument(
     "documents-file",
     type=click.STRING,
@@ -156,32 +1096,121 @@ def upload_documents_from_jsonl(
     collection_id,
     documents_file,
     batch_identifier,
+    batch_size,
+    batch_bytes,
+    concurrency,
+    adaptive,
+    target_latency,
+    resume,
+    manifest_path,
+    dead_letter_dir,
+    compress_upload,
 ):
     """
     Uploads documents from a JSONL file.
 
     DOCUMENTS_FILE is a file containing documents in JSONL format.
-    It can be passed as a path to a file, or it can be read from stdin.
-    This command will replace all of the documents in a collection.
+    It can be passed as a path to a file, or it can be read from stdin
+    (as "-"). By default, it is uploaded as a single file, which replaces
+    all of the documents in a collection.
+
+    With --batch-bytes or --batch-size, it is uploaded in parts instead,
+    named <file name>-<part>.jsonl (or <batch identifier>-<part>.jsonl),
+    and STDIN is uploaded while it is being written. Each part is
+    processed as a separate file, so documents of the collection are
+    replaced by those of the parts which were uploaded, and parts which
+    failed leave their documents missing. Uploaded parts are recorded, so
+    that an interrupted upload can be continued using --resume (uploads
+    from STDIN are recorded only when --manifest is given).
     """
-    # TODO: implement uploading both from file and stdin
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
 
-    logger.debug(f"Upserting documents from JSONL file: {documents_file}")
+    split = batch_size is not None or batch_bytes is not None
+    if not split and (
+        resume or manifest_path or adaptive or dead_letter_dir is not None
+    ):
+        raise click.UsageError(
+            "--resume, --manifest, --adaptive and --dead-letter-dir require "
+            "--batch-bytes or --batch-size."
+        )
+
+    logger.debug(f"Uploading documents from JSONL file: {documents_file}")
+    input_path = None if documents_file == STDIN else documents_file
+    options = {}
+    if input_path is None:
+        if batch_identifier is None and resume and manifest_path is not None:
+            # Resumed upload from STDIN continues with the same identifiers.
+            header = read_manifest_header(manifest_path) or {}
+            batch_identifier = header.get("batch_identifier")
+        if batch_identifier is None:
+            batch_identifier = str(uuid.uuid4())
+        options = {"batch_identifier": batch_identifier}
+    manifest = None
+    limits = None
+    if split:
+        manifest = _open_manifest(
+            command_name="upload-documents-from-jsonl",
+            collection_id=collection_id,
+            input_path=input_path,
+            manifest_path=manifest_path,
+            resume=resume,
+            options=options,
+        )
+        limits = BatchLimits(
+            max_documents=batch_size,
+            max_bytes=batch_bytes or DEFAULT_UPLOAD_BATCH_BYTES,
+        )
+    controller = _create_controller(
+        adaptive=adaptive,
+        target_latency=target_latency,
+        limits=limits,
+        concurrency=concurrency,
+        logger=logger,
+    )
     printer.print_text(text="Uploading...")
+    stats = TransferStats() if compress_upload else None
 
-    executor.execute_and_print_output(
-        command=lambda: _upload_jsonl(
+    def upload() -> dict:
+        response = _upload_jsonl(
             client=client,
             collection_id=collection_id,
             documents_file=documents_file,
-        ),
+            limits=limits,
+            concurrency=concurrency,
+            controller=controller,
+            retry_policy=executor.retry_policy,
+            manifest=manifest,
+            logger=logger,
+            rate_limiter=ctx["rate_limiter"],
+            name=batch_identifier,
+            compress=compress_upload,
+            stats=stats,
+            dead_letters=_open_dead_letters(
+                dead_letter_dir=dead_letter_dir,
+                kind=UPLOAD,
+                collection_id=collection_id,
+                input_name=input_path or "<stdin>",
+            ),
+        )
+        if stats is not None:
+            response.update(stats.to_dict())
+        responses.append(response)
+        return response
+
+    responses = []
+    executor.execute_and_print_output(
+        command=upload,
         output_type=ContentType.OBJECT,
         printer=printer,
+        # NOTE: Input is consumed while sending, so batches are retried
+        # individually instead.
+        retry=False,
     )
+    if responses and "failed_batches" in responses[0]:
+        sys.exit(1)
 
 
 @click.command("upsert-documents-from-jsonl")
@@ -197,10 +1226,86 @@ def upload_documents_from_jsonl(
     required=False,
     help="Customer batch identifier.",
 )
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_DOCUMENTS,
+    show_default=True,
+    help="Maximum number of documents sent in a single request.",
+)
+@click.option(
+    "--batch-bytes",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_BYTES,
+    show_default=True,
+    help="Maximum size of a single request in bytes.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of batches sent in parallel.",
+)
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    default=False,
+    help=(
+        "Adjust batch size and concurrency to observed latency and "
+        "throttling, up to --batch-size, --batch-bytes and --concurrency."
+    ),
+)
+@click.option(
+    "--target-latency",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_TARGET_LATENCY_SECONDS,
+    show_default=True,
+    help="Request latency in seconds, above which adaptive upload reduces batch size.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Skip batches sent by a previous, interrupted, run of the same upload.",
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the file recording sent batches. Defaults to a file in the application config directory.",
+)
+@click.option(
+    "--state-db",
+    "state_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="SQLite database recording content hashes of sent documents. Only new and changed documents are sent.",
+)
+@click.option(
+    "--emit-deletions",
+    "deletions_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write IDs of documents recorded in --state-db, but missing from the input, to this file.",
+)
+@click.option(
+    "--dead-letter-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write batches which failed after all retries to this directory, for replay-dead-letters, and go on.",
+)
+@click.option(
+    "--compress-upload",
+    is_flag=True,
+    default=False,
+    help="Send JSONL documents gzip compressed, and report bytes sent before and after compression.",
+)
 @click.argument(
     "documents-file",
-    type=click.File('r'),
-    default=sys.stdin,
+    type=click.File("rb"),
+    default="-",
     required=True,
 )
 @click.pass_obj
@@ -209,39 +1314,468 @@ def upsert_documents_from_jsonl(
     collection_id,
     documents_file,
     batch_identifier,
+    batch_size,
+    batch_bytes,
+    concurrency,
+    adaptive,
+    target_latency,
+    resume,
+    manifest_path,
+    state_path,
+    deletions_path,
+    dead_letter_dir,
+    compress_upload,
 ):
     """
     Upserts documents from a JSONL file.
 
     DOCUMENTS_FILE is a file containing documents in JSONL format.
     It can be passed as a path to a file, or it can be read from stdin.
+    File is read in batches limited by --batch-size and --batch-bytes,
+    and each batch is sent in a separate request, with batch identifier
+    suffixed by a hash of the batch and collection ID (only the hash for
+    STDIN), so that a batch sent again gets the same identifier. With
+    --concurrency, batches are sent in parallel, using the same client.
+    Sent batches are recorded, so that an interrupted upload can be
+    continued using --resume (uploads from STDIN are recorded only when
+    --manifest is given).
+
+    With --state-db, IDs and content hashes of sent documents are recorded
+    in a local database, and documents which didn't change since they were
+    sent are skipped. Such upsert doesn't need a manifest, since it skips
+    documents sent by an interrupted run anyway. With --emit-deletions,
+    IDs of documents which disappeared from the input are written to a
+    file, which can be passed to delete-documents.
     """
-    # TODO: implement uploading both from file and stdin
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
 
+    if state_path is not None and (resume or manifest_path is not None):
+        raise click.UsageError(
+            "--state-db can't be used with --resume or --manifest."
+        )
+    if deletions_path is not None and state_path is None:
+        raise click.UsageError("--emit-deletions requires --state-db.")
+
     logger.debug(f"Upserting documents from JSONL file: {documents_file}")
     printer.print_text(text="Uploading...")
 
-    if batch_identifier is None:
-        if documents_file.name == "<stdin>":
-            batch_identifier = {str(uuid.uuid4())}
-        else:
-            batch_identifier = os.path.basename(documents_file.name)
+    # NOTE: Binary stdin might not have a name (e.g. when testing).
+    file_name = getattr(documents_file, "name", "<stdin>")
+    input_path = None if file_name == "<stdin>" else file_name
+    documents_file = decompress(documents_file)
+
+    # NOTE: Batches from STDIN are identified by their content only.
+    if batch_identifier is None and input_path is not None:
+        batch_identifier = os.path.basename(input_path)
     logger.debug(f"Batch identifier set to {batch_identifier}")
 
-    executor.execute_and_print_output(
-        command=lambda: _upsert_jsonl(
+    limits = BatchLimits(max_documents=batch_size, max_bytes=batch_bytes)
+    controller = _create_controller(
+        adaptive=adaptive,
+        target_latency=target_latency,
+        limits=limits,
+        concurrency=concurrency,
+        logger=logger,
+    )
+
+    manifest = None
+    state = None
+    if state_path is None:
+        manifest = _open_manifest(
+            command_name="upsert-documents-from-jsonl",
+            collection_id=collection_id,
+            input_path=input_path,
+            manifest_path=manifest_path,
+            resume=resume,
+            options={"batch_identifier": batch_identifier},
+        )
+    else:
+        state = DocumentState(path=state_path, collection_id=collection_id)
+
+    stats = TransferStats() if compress_upload else None
+
+    def upsert() -> dict:
+        response = _upsert_jsonl(
             client=client,
             collection_id=collection_id,
             batch_identifier=batch_identifier,
             documents_file=documents_file,
-        ),
+            limits=limits,
+            concurrency=concurrency,
+            controller=controller,
+            retry_policy=executor.retry_policy,
+            manifest=manifest,
+            logger=logger,
+            state=state,
+            deletions_path=deletions_path,
+            compress=compress_upload,
+            stats=stats,
+            dead_letters=_open_dead_letters(
+                dead_letter_dir=dead_letter_dir,
+                kind=UPSERT,
+                collection_id=collection_id,
+                input_name=file_name,
+            ),
+        )
+        if stats is not None:
+            response.update(stats.to_dict())
+        responses.append(response)
+        return response
+
+    responses = []
+    try:
+        executor.execute_and_print_output(
+            command=upsert,
+            output_type=ContentType.OBJECT,
+            printer=printer,
+            # NOTE: Input is consumed while sending, so batches are retried
+            # individually instead.
+            retry=False,
+        )
+    finally:
+        if state is not None:
+            state.close()
+    if responses and "failed_batches" in responses[0]:
+        sys.exit(1)
+
+
+@click.command("upsert-documents-from-parquet")
+@click.option(
+    "--collection-id",
+    type=click.STRING,
+    required=True,
+    help="Collection ID.",
+)
+@click.option(
+    "--batch-identifier",
+    type=click.STRING,
+    required=False,
+    help="Customer batch identifier.",
+)
+@click.option(
+    "--column",
+    "columns",
+    type=click.STRING,
+    multiple=True,
+    help="Column sent as a document field. Defaults to all columns, ID is always sent.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_DOCUMENTS,
+    show_default=True,
+    help="Maximum number of documents sent in a single request.",
+)
+@click.option(
+    "--batch-bytes",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_BYTES,
+    show_default=True,
+    help="Maximum size of a single request in bytes.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of batches sent in parallel.",
+)
+@click.option(
+    "--dead-letter-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write batches which failed after all retries to this directory, for replay-dead-letters, and go on.",
+)
+@click.option(
+    "--compress-upload",
+    is_flag=True,
+    default=False,
+    help="Send documents gzip compressed, and report bytes sent before and after compression.",
+)
+@click.argument(
+    "parquet-file",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+)
+@click.pass_obj
+def upsert_documents_from_parquet(
+    ctx,
+    collection_id,
+    parquet_file,
+    batch_identifier,
+    columns,
+    batch_size,
+    batch_bytes,
+    concurrency,
+    dead_letter_dir,
+    compress_upload,
+):
+    """
+    Upserts documents from a Parquet file.
+
+    PARQUET_FILE is a file containing documents in Parquet format, one
+    per row. Row groups are read as they are sent, and only columns given
+    by --column, so the file is never loaded at once. Rows are converted
+    to JSONL documents and sent in batches limited by --batch-size and
+    --batch-bytes, same as by upsert-documents-from-jsonl.
+    """
+    client: VantageClient = ctx["client_factory"]()
+    printer: Printer = ctx["printer"]
+    executor: CommandExecutor = ctx["executor"]
+    logger: Logger = ctx["logger"]
+
+    logger.debug(f"Upserting documents from Parquet file: {parquet_file}")
+    documents_file = ParquetJsonlReader(path=parquet_file, columns=columns)
+    if batch_identifier is None:
+        batch_identifier = os.path.basename(parquet_file)
+    printer.print_text(text="Uploading...")
+    stats = TransferStats() if compress_upload else None
+
+    def upsert() -> dict:
+        response = _upsert_jsonl(
+            client=client,
+            collection_id=collection_id,
+            batch_identifier=batch_identifier,
+            documents_file=documents_file,
+            limits=BatchLimits(
+                max_documents=batch_size, max_bytes=batch_bytes
+            ),
+            concurrency=concurrency,
+            controller=None,
+            retry_policy=executor.retry_policy,
+            manifest=None,
+            logger=logger,
+            compress=compress_upload,
+            stats=stats,
+            dead_letters=_open_dead_letters(
+                dead_letter_dir=dead_letter_dir,
+                kind=UPSERT,
+                collection_id=collection_id,
+                input_name=parquet_file,
+            ),
+        )
+        if stats is not None:
+            response.update(stats.to_dict())
+        responses.append(response)
+        return response
+
+    responses = []
+    try:
+        executor.execute_and_print_output(
+            command=upsert,
+            output_type=ContentType.OBJECT,
+            printer=printer,
+            # NOTE: Input is consumed while sending, so batches are retried
+            # individually instead.
+            retry=False,
+        )
+    finally:
+        documents_file.close()
+    if responses and "failed_batches" in responses[0]:
+        sys.exit(1)
+
+
+@click.command("upload-documents-from-directory")
+@click.option(
+    "--collection-id",
+    type=click.STRING,
+    required=True,
+    help="Collection ID.",
+)
+@click.option(
+    "--recursive",
+    is_flag=True,
+    default=False,
+    help="Search directories recursively.",
+)
+@click.option(
+    "--upsert",
+    is_flag=True,
+    default=False,
+    help="Upsert JSONL files instead of uploading them. Parquet files are always uploaded.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of files sent in parallel.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of documents in a request, or file part. JSONL files are otherwise uploaded whole.",
+)
+@click.option(
+    "--batch-bytes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum size of a single request, or file part, in bytes. JSONL files are uploaded whole by default.",
+)
+@click.option(
+    "--dead-letter-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write batches which failed after all retries to this directory, for replay-dead-letters, and go on.",
+)
+@click.option(
+    "--compress-upload",
+    is_flag=True,
+    default=False,
+    help="Send JSONL documents gzip compressed, and report bytes sent before and after compression.",
+)
+@click.argument("sources", nargs=-1, required=True)
+@click.pass_obj
+def upload_documents_from_directory(
+    ctx,
+    collection_id,
+    sources,
+    recursive,
+    upsert,
+    concurrency,
+    batch_size,
+    batch_bytes,
+    dead_letter_dir,
+    compress_upload,
+):
+    """
+    Uploads documents from JSONL and Parquet files in directories.
+
+    SOURCES are directories, glob patterns (e.g. "exports/**/*.jsonl") or
+    files. Files are sent in parallel, using a single client, same as by
+    upload-documents-from-jsonl (or upsert-documents-from-jsonl, with
+    --upsert) and upload-documents-from-parquet. Batch identifiers are
+    based on file paths relative to their common directory. Result of each
+    file, and overall throughput, are printed once all of them are sent.
+    """
+    client: VantageClient = ctx["client_factory"]()
+    printer: Printer = ctx["printer"]
+    executor: CommandExecutor = ctx["executor"]
+    logger: Logger = ctx["logger"]
+
+    paths = discover_shards(sources=sources, recursive=recursive)
+    if not paths:
+        printer.stderr("No JSONL or Parquet files found.")
+        sys.exit(1)
+    logger.debug(f"Found {len(paths)} files: {paths}")
+
+    if upsert:
+        limits = BatchLimits(
+            max_documents=batch_size or DEFAULT_BATCH_DOCUMENTS,
+            max_bytes=batch_bytes or DEFAULT_BATCH_BYTES,
+        )
+    elif batch_size is not None or batch_bytes is not None:
+        limits = BatchLimits(
+            max_documents=batch_size,
+            max_bytes=batch_bytes or DEFAULT_UPLOAD_BATCH_BYTES,
+        )
+    else:
+        # NOTE: Files are uploaded whole, unless they should be split.
+        limits = None
+    printer.print_text(text=f"Uploading {len(paths)} files...")
+
+    results = []
+
+    def upload() -> dict:
+        result = _upload_shards(
+            client=client,
+            collection_id=collection_id,
+            paths=paths,
+            upsert=upsert,
+            limits=limits,
+            concurrency=concurrency,
+            retry_policy=executor.retry_policy,
+            logger=logger,
+            rate_limiter=ctx["rate_limiter"],
+            compress=compress_upload,
+            stats=TransferStats() if compress_upload else None,
+            dead_letter_dir=dead_letter_dir,
+        )
+        results.append(result)
+        return result
+
+    executor.execute_and_print_output(
+        command=upload,
+        output_type=ContentType.OBJECT,
+        printer=printer,
+        # NOTE: Each request is retried instead, so that files which were
+        # sent aren't sent again.
+        retry=False,
+    )
+    if (
+        not results
+        or results[0]["summary"]["failed"]
+        or results[0]["summary"]["failed_batches"]
+    ):
+        sys.exit(1)
+
+
+@click.command("replay-dead-letters")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of batches sent in parallel.",
+)
+@click.option(
+    "--compress-upload",
+    is_flag=True,
+    default=False,
+    help="Send batches gzip compressed.",
+)
+@click.argument(
+    "dead-letter-dir",
+    type=click.Path(file_okay=False, exists=True),
+    required=True,
+)
+@click.pass_obj
+def replay_dead_letters(ctx, dead_letter_dir, concurrency, compress_upload):
+    """
+    Sends batches from a dead-letter directory again.
+
+    DEAD_LETTER_DIR is a directory, which upload and upsert commands wrote
+    batches which failed to, using --dead-letter-dir. Each batch is sent
+    the same way, to the same collection and with the same batch
+    identifier, as originally, and removed once it is sent. Batches which
+    fail again are kept, with the new error.
+    """
+    client: VantageClient = ctx["client_factory"]()
+    printer: Printer = ctx["printer"]
+    executor: CommandExecutor = ctx["executor"]
+    logger: Logger = ctx["logger"]
+
+    logger.debug(f"Replaying dead letters from: {dead_letter_dir}")
+    printer.print_text(text="Sending...")
+    responses = []
+
+    def replay() -> dict:
+        response = _replay_dead_letters(
+            client=client,
+            directory=dead_letter_dir,
+            concurrency=concurrency,
+            retry_policy=executor.retry_policy,
+            logger=logger,
+            rate_limiter=ctx["rate_limiter"],
+            compress=compress_upload,
+        )
+        responses.append(response)
+        return response
+
+    executor.execute_and_print_output(
+        command=replay,
         output_type=ContentType.OBJECT,
         printer=printer,
+        # NOTE: Each batch is retried instead, so that sent ones aren't
+        # sent again.
+        retry=False,
     )
+    if not responses or responses[0]["failed_batches"]:
+        sys.exit(1)
 
 
 @click.command("delete-documents")
@@ -250,31 +1784,103 @@ def upsert_documents_from_jsonl(
     type=click.STRING,
     required=True,
 )
-@click.argument("documents-ids", type=click.STRING, required=True)
+@click.option(
+    "--ids-file",
+    type=click.File("r"),
+    default=None,
+    help='File with IDs of documents to delete, one per line, or "-" for stdin.',
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DELETE_BATCH_SIZE,
+    show_default=True,
+    help="Maximum number of documents deleted in a single request.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of requests sent in parallel.",
+)
+@click.option(
+    "--state-db",
+    "state_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="SQLite database of upsert-documents-from-jsonl --state-db, from which deleted documents are removed.",
+)
+@click.argument("documents-ids", type=click.STRING, required=False)
 @click.pass_obj
-def delete_documents(ctx, collection_id: str, documents_ids: str):
+def delete_documents(
+    ctx,
+    collection_id: str,
+    documents_ids: Optional[str],
+    ids_file,
+    batch_size: int,
+    concurrency: int,
+    state_path: Optional[str],
+):
     """
     Deletes documents by ID.
 
     DOCUMENTS_IDS: IDs of documents to delete, separated by a comma. For example: \"1,2,3,4,5\".
+    Alternatively, IDs can be read from --ids-file, one per line (e.g. as
+    written by diff-documents). Documents are deleted in requests of at
+    most --batch-size IDs, each retried on its own, and numbers of deleted
+    and failed documents are printed once all are sent. With --state-db,
+    deleted documents are removed from the state database, which keeps
+    emitting them for deletion until then.
     """
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
 
-    logger.debug(f"Deleting documents with IDs: {documents_ids}")
-    executor.execute_and_print_output(
-        command=lambda: _delete_documents(
+    if (documents_ids is None) == (ids_file is None):
+        raise click.UsageError(
+            "Pass either DOCUMENTS_IDS or --ids-file, but not both."
+        )
+    if ids_file is None:
+        logger.debug(f"Deleting documents with IDs: {documents_ids}")
+        ids = documents_ids.split(",")
+    else:
+        logger.debug(f"Deleting documents with IDs from: {ids_file.name}")
+        ids = ids_file
+
+    results = []
+    state = (
+        None
+        if state_path is None
+        else DocumentState(path=state_path, collection_id=collection_id)
+    )
+
+    def delete() -> dict:
+        result = _delete_documents(
             client=client,
             collection_id=collection_id,
-            documents_ids=documents_ids.split(","),
-        ),
-        output_type=ContentType.OBJECT,
-        printer=printer,
-        exception_handler=lambda exception: specific_exception_handler(
-            exception=exception,
-            class_type=NotFoundException,
-            message="Account not found.",
-        ),
-    )
+            documents_ids=ids,
+            chunk_size=batch_size,
+            concurrency=concurrency,
+            retry_policy=executor.retry_policy,
+            logger=logger,
+            state=state,
+        )
+        results.append(result)
+        return result
+
+    try:
+        executor.execute_and_print_output(
+            command=delete,
+            output_type=ContentType.OBJECT,
+            printer=printer,
+            # NOTE: Each request is retried instead, so that IDs aren't read
+            # again.
+            retry=False,
+        )
+    finally:
+        if state is not None:
+            state.close()
+    if not results or results[0]["failed"]:
+        sys.exit(1)
@@ -1,6 +1,5 @@
 import traceback
 from logging import Logger
-import sys
 from typing import List, Optional
 import click
 import jsonpickle
@@ -23,15 +22,6 @@ from vantage_cli.commands.util import (
 )
 
 
-# Used to pass API key from configuration.
-COMMAND_NAMES = [
-    "search-embedding",
-    "search-semantic",
-    "search-more-like-this",
-    "search-more-like-these",
-]
-
-
 def _create_weighted_field_values(
     weighted_field_values: str,
 ) -> Optional[List[WeightedFieldValueItem]]:
@@ -261,7 +251,7 @@ def embedding_search(
     collection_id,
 ):
     """Search based on the provided embedding vector."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -309,6 +299,7 @@ def embedding_search(
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -421,7 +412,7 @@ def semantic_search(
     collection_id,
 ):
     """Search based on the provided text query."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -468,6 +459,7 @@ def semantic_search(
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -580,7 +572,7 @@ def more_like_this_search(
     collection_id,
 ):
     """Search based on the provided document ID."""
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -628,6 +620,7 @@ def more_like_this_search(
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
@@ -640,7 +633,7 @@ def more_like_this_search(
 @click.option(
     "--more-like-these-json",
     type=click.File('r'),
-    default=sys.stdin,
+    default="-",
     required=True,
     help="Path to the JSON file containing a list of `these` objects.",
 )
@@ -743,7 +736,7 @@ def more_like_these_search(
     """
     Search based on the provided MoreLikeThese items.
     """
-    client: VantageClient = ctx["client"]
+    client: VantageClient = ctx["client_factory"]()
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
@@ -803,6 +796,7 @@ def more_like_these_search(
         ],
         output_type=ContentType.OBJECT,
         printer=printer,
+        retry=True,
         exception_handler=lambda exception: specific_exception_handler(
             exception=exception,
             class_type=NotFoundException,
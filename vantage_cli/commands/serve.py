@@ -0,0 +1,32 @@
+from logging import Logger
+import click
+from vantage_cli.daemon import default_socket_path, serve as serve_daemon
+
+
+@click.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    default=default_socket_path,
+    help="Path of the Unix socket to listen on.",
+)
+@click.pass_obj
+def serve(ctx, socket_path):
+    """
+    Runs a daemon which executes commands in a warm process.
+
+    Commands are received over a Unix socket. Set VANTAGE_CLI_SOCKET
+    environment variable to the socket path, and the CLI will send
+    commands to the daemon instead of executing them itself, reusing
+    authenticated clients and their connections.
+
+    The daemon executes one command at a time. While it is busy, other
+    invocations execute the command themselves after a short wait.
+    """
+    logger: Logger = ctx["logger"]
+
+    if ctx.get("daemon"):
+        raise click.UsageError("Command can't be executed by the daemon.")
+
+    serve_daemon(socket_path=socket_path, logger=logger)
@@ -0,0 +1,167 @@
+from logging import Logger
+import os
+import shlex
+import sys
+import time
+import traceback
+from typing import Optional
+import click
+from vantage_cli.config import APP_NAME
+
+HISTORY_FILE = "shell_history"
+HISTORY_LENGTH = 1000
+PROMPT = "vantage> "
+# Commands which would start another long-running session.
+_EXCLUDED_COMMANDS = {"serve", "shell"}
+_EXIT_COMMANDS = {"exit", "quit"}
+
+
+def default_history_file() -> str:
+    return os.path.join(click.get_app_dir(APP_NAME), HISTORY_FILE)
+
+
+def _load_history(history_file: str):
+    try:
+        import readline
+    except ImportError:  # pragma: no cover
+        # Not available on Windows, shell works without history there.
+        return None
+
+    readline.set_history_length(HISTORY_LENGTH)
+    if os.path.exists(history_file):
+        readline.read_history_file(history_file)
+    return readline
+
+
+def _save_history(readline, history_file: str) -> None:
+    os.makedirs(os.path.dirname(history_file) or ".", exist_ok=True)
+    readline.write_history_file(history_file)
+    # Commands can contain secrets (e.g. external API keys).
+    os.chmod(history_file, 0o600)
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    click.echo(code, err=True)
+    return 1
+
+
+def _use_command_limits(group_context: click.Context, name: str) -> None:
+    # NOTE: Limits of the session were resolved for the shell command, so
+    # sections of the executed commands in configuration would be ignored.
+    from vantage_cli.vantage import command_rate_limiter
+
+    obj = group_context.obj
+    rate_limiter = command_rate_limiter(group_context, name)
+    obj["rate_limiter"] = rate_limiter
+    obj["client_factory"].set_rate_limiter(rate_limiter)
+
+
+def execute_line(group_context: click.Context, line: str) -> Optional[int]:
+    """
+    Executes one shell line as a CLI command, using group context of the
+    shell, and returns its exit code. Returns None for empty lines.
+    """
+    try:
+        args = shlex.split(line)
+    except ValueError as exception:
+        click.echo(f"Error: {exception}", err=True)
+        return 2
+    if not args:
+        return None
+
+    group: click.Group = group_context.command
+    if args[0] == "help":
+        click.echo(group_context.get_help())
+        return 0
+
+    try:
+        name, command, args = group.resolve_command(group_context, args)
+        if name in _EXCLUDED_COMMANDS:
+            raise click.UsageError(
+                f"Command {name} can't be executed in the shell.",
+                ctx=group_context,
+            )
+        _use_command_limits(group_context, name)
+        with command.make_context(name, args, parent=group_context) as ctx:
+            command.invoke(ctx)
+    except click.exceptions.Exit as exit:
+        return exit.exit_code
+    except click.ClickException as exception:
+        exception.show()
+        return exception.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as exit:
+        return _exit_code(exit.code)
+    except Exception:
+        # Unexpected errors end only the command, not the whole session.
+        click.echo(traceback.format_exc(), err=True)
+        return 1
+    return 0
+
+
+@click.command("shell")
+@click.option(
+    "--history-file",
+    type=click.Path(dir_okay=False),
+    default=default_history_file,
+    help="Path of the command history file.",
+)
+@click.pass_context
+def shell(context: click.Context, history_file):
+    """
+    Runs commands interactively, in a single session.
+
+    Commands are entered without the program name and general options,
+    e.g. search-semantic --text lamp my-collection. Client, configuration and
+    output settings are shared by all of them, so authentication and
+    startup happen only once. Execution time of each command is printed
+    to STDERR. Enter help to list commands, and exit (or Ctrl-D) to quit.
+    """
+    ctx = context.obj
+    logger: Logger = ctx["logger"]
+
+    if ctx.get("daemon"):
+        raise click.UsageError("Command can't be executed by the daemon.")
+
+    # NOTE: Prompt is shown only to humans, so that output of commands
+    # piped into the shell stays machine readable.
+    prompt = PROMPT if sys.stdin.isatty() else ""
+    readline = _load_history(history_file)
+    try:
+        while True:
+            try:
+                line = input(prompt)
+            except KeyboardInterrupt:
+                click.echo()
+                continue
+            except EOFError:
+                if prompt:
+                    click.echo()
+                break
+
+            if line.strip() in _EXIT_COMMANDS:
+                break
+
+            start = time.perf_counter()
+            try:
+                exit_code = execute_line(context.parent, line)
+            except KeyboardInterrupt:
+                exit_code = 130
+                click.echo("Interrupted.", err=True)
+            if exit_code is None:
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"Command {line!r} exited with {exit_code}.")
+            click.echo(
+                f"[exit code {exit_code}, {elapsed_ms:.1f} ms]", err=True
+            )
+    finally:
+        if readline is not None:
+            _save_history(readline, history_file)
@@ -1,6 +1,7 @@
 from logging import Logger
 from typing import Callable, Optional, Type
 from vantage_cli.printer import Printable, ContentType, Printer
+from vantage_cli.retry import RetryPolicy
 import traceback
 from vantage_sdk.model.search import MoreLikeTheseItem
 import jsonpickle
@@ -32,9 +33,15 @@ def get_generic_message_for_exception(exception: Exception) -> str:
 
 
 class CommandExecutor:
-    def __init__(self, logger: Logger, debug: bool = False):
+    def __init__(
+        self,
+        logger: Logger,
+        debug: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.debug = debug
         self.logger = logger
+        self.retry_policy = retry_policy
 
     def execute_and_print_output(
         self,
@@ -42,12 +49,21 @@ class CommandExecutor:
         output_type: ContentType,
         printer: Printer,
         exception_handler: Optional[Callable] = None,
+        retry: bool = False,
     ) -> None:
+        """
+        Executes command and prints its result, or the error it raised.
+
+        Transient failures are retried according to the retry policy only
+        if retry is True, which idempotent commands (reads, deletes and
+        uploads) pass. Requests which create or update resources might have
+        been applied even if they timed out, so they aren't sent again.
+        """
         printable = None
 
         try:
             printable = Printable.stdout(
-                content=command(),
+                content=self._run(command=command, retry=retry),
                 content_type=output_type,
             )
         except Exception as exception:
@@ -68,11 +84,12 @@ class CommandExecutor:
         output_type: ContentType,
         printer: Printer,
         exception_handler: Optional[Callable] = None,
+        retry: bool = False,
     ) -> None:
         printable = None
 
         try:
-            printable = command()
+            printable = self._run(command=command, retry=retry)
         except Exception as exception:
             self.logger.debug(traceback.format_exc())
 
@@ -85,6 +102,13 @@ class CommandExecutor:
                 )
         printer.print(printable)
 
+    def _run(self, command: Callable, retry: bool):
+        if not retry or self.retry_policy is None:
+            return command()
+        return self.retry_policy.call(
+            function=command, logger=self.logger, description="Command"
+        )
+
 
 def specific_exception_handler(
     exception: Exception, class_type: Type, message: str
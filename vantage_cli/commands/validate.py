@@ -1,15 +1,29 @@
 from logging import Logger
+import os
+import shutil
 import sys
+import tempfile
 from typing import Optional
 import click
+from vantage_cli.compression import is_compressed, open_input
 from vantage_cli.printer import ContentType, Printer
 from vantage_cli.commands.util import (
     CommandExecutor,
 )
-from vantage_sdk.core.validation import VALIDATOR as validator
+from vantage_sdk.core.validation import DocumentValidator
 from vantage_sdk.model.validation import CollectionType
 
 
+def _create_validator() -> DocumentValidator:
+    validator = DocumentValidator()
+    # NOTE: SDK keeps encountered document IDs in a class attribute, so they
+    # would be shared by all validations executed in the same process
+    # (e.g. by the daemon), and reported as duplicates. Still the case in
+    # vantage-sdk 0.9.5; drop this once SDK keeps them per instance.
+    validator._encountered_ids = set()
+    return validator
+
+
 def _get_collection_type(name: str) -> CollectionType:
     if name == CollectionType.USER_PROVIDED_EMBEDDINGS.value.upper:
         return CollectionType.USER_PROVIDED_EMBEDDINGS
@@ -45,12 +59,22 @@ def _validate_jsonl_file(
         model=model_name,
         embeddings_dimension=embeddings_dimension,
     )
-    errors = validator.validate_jsonl(
-        file_path=jsonl_file,
-        collection_type=collection_type,
-        model=model_name,
-        embeddings_dimension=embeddings_dimension,
-    )
+    with tempfile.TemporaryDirectory(prefix="vantage-validate-") as directory:
+        file_path = jsonl_file
+        if is_compressed(jsonl_file):
+            # NOTE: SDK validates only paths of uncompressed files, so the
+            # file is decompressed to a temporary one first.
+            file_path = os.path.join(directory, "documents.jsonl")
+            with open_input(jsonl_file) as stream, open(
+                file_path, "wb"
+            ) as decompressed:
+                shutil.copyfileobj(stream, decompressed)
+        errors = _create_validator().validate_jsonl(
+            file_path=file_path,
+            collection_type=collection_type,
+            model=model_name,
+            embeddings_dimension=embeddings_dimension,
+        )
 
     if any(errors):
         return [error.to_dict() for error in errors]
@@ -70,7 +94,7 @@ def _validate_parquet_file(
         model=model_name,
         embeddings_dimension=embeddings_dimension,
     )
-    errors = validator.validate_parquet(
+    errors = _create_validator().validate_parquet(
         file_path=parquet_file,
         collection_type=collection_type,
         model=model_name,
@@ -115,7 +139,12 @@ def validate_jsonl(
     model_name,
     embeddings_dimension,
 ):
-    """Validates JSONL file."""
+    """
+    Validates JSONL file.
+
+    File can be compressed using gzip, bzip2 or Zstandard, in which case it
+    is decompressed while being validated.
+    """
     printer: Printer = ctx["printer"]
     executor: CommandExecutor = ctx["executor"]
     logger: Logger = ctx["logger"]
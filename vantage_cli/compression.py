@@ -0,0 +1,106 @@
+import bz2
+import gzip
+import io
+from typing import BinaryIO, Optional
+import click
+
+GZIP = "gzip"
+BZIP2 = "bz2"
+ZSTANDARD = "zstd"
+
+_MAGIC_BYTES = {
+    GZIP: b"\x1f\x8b",
+    BZIP2: b"BZh",
+    ZSTANDARD: b"\x28\xb5\x2f\xfd",
+}
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zst")
+# Level of gzip compression of uploads, which favours speed over size.
+UPLOAD_COMPRESSION_LEVEL = 6
+
+
+def detect_compression(stream: BinaryIO) -> Optional[str]:
+    """
+    Compression format of stream, detected from its magic bytes, without
+    consuming them. Stream needs to support peek (e.g. BufferedReader).
+    """
+    head = stream.peek(4)[:4]
+    for compression, magic in _MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def decompress(stream: BinaryIO) -> BinaryIO:
+    """
+    Wraps stream, so that reading it returns decompressed content, if it is
+    compressed using one of the supported formats. Content is decompressed
+    incrementally, as it is read.
+    """
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    compression = detect_compression(stream)
+    if compression == GZIP:
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == BZIP2:
+        return bz2.BZ2File(stream, mode="rb")
+    if compression == ZSTANDARD:
+        return _zstandard_reader(stream)
+    return stream
+
+
+def open_input(path: str) -> BinaryIO:
+    """Opens file for reading its decompressed content."""
+    file = open(path, "rb")
+    try:
+        stream = decompress(file)
+    except BaseException:
+        file.close()
+        raise
+    if stream is not file:
+        # NOTE: Decompressing readers don't close the file they read from.
+        stream = _ClosingReader(stream, file)
+    return stream
+
+
+def is_compressed(path: str) -> bool:
+    with open(path, "rb") as file:
+        return detect_compression(file) is not None
+
+
+def strip_compression_suffix(name: str) -> str:
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name.removesuffix(suffix)
+    return name
+
+
+def gzip_body(body: bytes) -> bytes:
+    """Compresses request body, for sending with gzip Content-Encoding."""
+    return gzip.compress(body, compresslevel=UPLOAD_COMPRESSION_LEVEL, mtime=0)
+
+
+def _zstandard_reader(stream: BinaryIO) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError:
+        raise click.ClickException(
+            "Reading Zstandard compressed input requires the zstandard "
+            "package, install it using: pip install vantage-cli[zstd]"
+        )
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        stream, read_across_frames=True, closefd=False
+    )
+    # NOTE: Zstandard reader doesn't support readline.
+    return io.BufferedReader(reader)
+
+
+class _ClosingReader(io.BufferedReader):
+    def __init__(self, stream: BinaryIO, file: BinaryIO):
+        super().__init__(stream)
+        self._file = file
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._file.close()
@@ -1,15 +1,36 @@
 import click
-from configparser import ConfigParser
+import marshal
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
-from vantage_cli.commands.search import COMMAND_NAMES as search_commands
+import vantage_cli
+from vantage_cli.commands import SEARCH_COMMAND_NAMES as search_commands
+
+if TYPE_CHECKING:
+    from configparser import ConfigParser
 
 
 CONFIG_FILE = "config.ini"
 APP_NAME = "vantage-cli"
 GENERAL_SECTION = "general"
 SEARCH_SECTION = "general.search"
+CONFIG_CACHE_FILE = "config_cache.bin"
+
+
+def write_private_file(path: str, content: bytes) -> None:
+    """Atomically replaces file with content readable only by the owner."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 
 def default_config_file() -> str:
@@ -29,7 +50,9 @@ class ConfigLoader:
     def file_exists(self) -> bool:
         return Path(self.path).is_file()
 
-    def load(self) -> ConfigParser:
+    def load(self) -> "ConfigParser":
+        from configparser import ConfigParser
+
         config = ConfigParser()
         config.read(self.path)
         return config
@@ -68,6 +91,87 @@ class ConfigInitializer:
         pass
 
 
+def default_config_cache_file() -> str:
+    return os.path.join(click.get_app_dir(APP_NAME), CONFIG_CACHE_FILE)
+
+
+def build_default_map(config: "ConfigParser") -> dict:
+    general_config = {}
+    search_config = {}
+
+    if GENERAL_SECTION in config.sections():
+        general_config = dict(config[GENERAL_SECTION])
+
+    if SEARCH_SECTION in config.sections():
+        search_config = dict(config[SEARCH_SECTION])
+        for command in search_commands:
+            general_config[command] = search_config
+
+    for section in config.sections():
+        if section == GENERAL_SECTION or section == SEARCH_SECTION:
+            continue
+        if section in general_config:
+            general_config[section] = general_config[section] | dict(
+                config[section]
+            )
+        else:
+            general_config[section] = dict(config[section])
+
+    return general_config
+
+
+class ConfigCache:
+    """
+    Compiled cache of default maps built from configuration files.
+
+    Entries are keyed by configuration file path, and are valid as long as
+    file modification time and size, and CLI version, stay the same. Cache
+    is stored using marshal, which loads faster than parsing and merging
+    configuration sections. It holds credentials, so it is readable only by
+    its owner.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_config_cache_file()
+
+    def load_default_map(self, config_path: str) -> dict:
+        config_path = os.path.abspath(config_path)
+        stat = os.stat(config_path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size, vantage_cli.__version__)
+
+        entries = self._read()
+        entry = entries.get(config_path)
+        if (
+            isinstance(entry, tuple)
+            and len(entry) == 2
+            and entry[0] == fingerprint
+        ):
+            return entry[1]
+
+        default_map = build_default_map(ConfigLoader(path=config_path).load())
+        # Entries of configuration files which were removed are dropped.
+        entries = {
+            path: entry
+            for path, entry in entries.items()
+            if os.path.exists(path)
+        }
+        entries[config_path] = (fingerprint, default_map)
+        try:
+            write_private_file(self.path, marshal.dumps(entries))
+        except OSError:
+            # Cache is an optimization only, e.g. home might be read-only.
+            pass
+        return default_map
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "rb") as file:
+                entries = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+
 def configuration_callback(ctx: click.core.Context, param, filename):
     config_loader = ConfigLoader(path=filename)
 
@@ -76,29 +180,7 @@ def configuration_callback(ctx: click.core.Context, param, filename):
         initial_configuration_prompt(config_loader=config_loader)
 
     if config_loader.file_exists():
-        config = config_loader.load()
-        general_config = {}
-        search_config = {}
-
-        if GENERAL_SECTION in config.sections():
-            general_config = dict(config[GENERAL_SECTION])
-
-        if SEARCH_SECTION in config.sections():
-            search_config = dict(config[SEARCH_SECTION])
-            for command in search_commands:
-                general_config[command] = search_config
-
-        for section in config.sections():
-            if section == GENERAL_SECTION or section == SEARCH_SECTION:
-                continue
-            if section in general_config:
-                general_config[section] = general_config[section] | dict(
-                    config[section]
-                )
-            else:
-                general_config[section] = dict(config[section])
-
-        ctx.default_map = general_config
+        ctx.default_map = ConfigCache().load_default_map(config_loader.path)
 
 
 def initial_configuration_prompt(config_loader: ConfigLoader) -> None:
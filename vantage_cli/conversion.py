@@ -0,0 +1,326 @@
+import collections
+from dataclasses import dataclass
+import itertools
+import json
+import os
+import time
+from typing import BinaryIO, Optional, Sequence
+import click
+
+EMBEDDINGS_FIELD = "embeddings"
+DEFAULT_ROW_GROUP_DOCUMENTS = 10_000
+DEFAULT_BLOCK_BYTES = 16 * 1024 * 1024
+PARQUET_COMPRESSIONS = ["snappy", "zstd", "gzip", "none"]
+ID_FIELD = "id"
+# Rows of a Parquet file decoded into Python objects at a time.
+DEFAULT_READ_ROWS = 1024
+
+
+@dataclass
+class ConversionSummary:
+    documents: int = 0
+    row_groups: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        seconds = max(self.seconds, 1e-6)
+        return {
+            "documents": self.documents,
+            "row_groups": self.row_groups,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "size_reduction": (
+                f"{1 - self.output_bytes / self.input_bytes:.1%}"
+                if self.input_bytes
+                else None
+            ),
+            "seconds": round(self.seconds, 3),
+            "documents_per_second": round(self.documents / seconds, 1),
+            "megabytes_per_second": round(
+                self.input_bytes / seconds / 1024**2, 3
+            ),
+        }
+
+
+class _CountingReader:
+    """File-like wrapper counting bytes read from the stream."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.count = 0
+        self.closed = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def convert_jsonl_to_parquet(
+    stream: BinaryIO,
+    output_path: str,
+    row_group_documents: int = DEFAULT_ROW_GROUP_DOCUMENTS,
+    compression: str = "snappy",
+    embeddings_dimension: Optional[int] = None,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> ConversionSummary:
+    """
+    Streams JSONL documents into a Parquet file.
+
+    Input is parsed by Arrow, block_bytes at a time, and written in row
+    groups of at most row_group_documents documents, so only a row group
+    is kept in memory. Schema is inferred from the first block, in which
+    all of the fields need to be present. Embeddings are stored as fixed
+    size lists of float32, of embeddings_dimension (by default, the size
+    of the first embeddings in the input).
+    """
+    import pyarrow
+    import pyarrow.json
+    import pyarrow.parquet
+
+    start = time.perf_counter()
+    summary = ConversionSummary()
+    reader = _CountingReader(stream)
+    try:
+        batches = pyarrow.json.open_json(
+            reader,
+            read_options=pyarrow.json.ReadOptions(block_size=block_bytes),
+        )
+        first = batches.read_next_batch()
+    except StopIteration:
+        raise click.ClickException("Input contains no documents.")
+    except pyarrow.ArrowInvalid as exception:
+        raise _conversion_error(exception)
+    schema = _parquet_schema(
+        batches.schema, embeddings_dimension or _dimension(first)
+    )
+    pending = []
+    pending_rows = 0
+
+    writer = pyarrow.parquet.ParquetWriter(
+        output_path,
+        schema=schema,
+        compression=None if compression == "none" else compression,
+    )
+
+    def write_row_group(rows: int) -> None:
+        nonlocal pending, pending_rows
+        table = pyarrow.Table.from_batches(pending, schema=schema)
+        writer.write_table(table.slice(0, rows))
+        pending = table.slice(rows).to_batches()
+        pending_rows -= rows
+        summary.row_groups += 1
+
+    try:
+        for batch in itertools.chain([first], batches):
+            pending.append(_convert_batch(batch, schema))
+            pending_rows += batch.num_rows
+            summary.documents += batch.num_rows
+            while pending_rows >= row_group_documents:
+                write_row_group(row_group_documents)
+        if pending_rows:
+            write_row_group(pending_rows)
+        writer.close()
+    except BaseException as exception:
+        # NOTE: Incomplete output isn't a valid Parquet file.
+        writer.close()
+        os.remove(output_path)
+        if isinstance(exception, pyarrow.ArrowInvalid):
+            raise _conversion_error(exception)
+        raise
+
+    summary.input_bytes = reader.count
+    summary.output_bytes = os.path.getsize(output_path)
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+class ParquetJsonlReader:
+    """
+    Reads a Parquet file as a JSONL stream.
+
+    Row groups are read lazily, as the stream is consumed, in record
+    batches of at most read_rows rows, so only one of them is decoded at
+    a time. Only the given columns (and the ID) are read. Values which
+    aren't JSON types (e.g. timestamps) are written as strings. Float32
+    values (e.g. embeddings) are written as their shortest decimal form,
+    and non-finite floats, which JSON has no values for, as nulls.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Optional[Sequence[str]] = None,
+        read_rows: int = DEFAULT_READ_ROWS,
+    ):
+        import pyarrow
+        import pyarrow.parquet
+
+        try:
+            self._file = pyarrow.parquet.ParquetFile(path)
+        except (OSError, pyarrow.ArrowInvalid) as exception:
+            raise click.ClickException(f"Can't read {path}: {exception}")
+        names = self._file.schema_arrow.names
+        if columns:
+            columns = list(dict.fromkeys([ID_FIELD, *columns]))
+        missing = [name for name in columns or [ID_FIELD] if name not in names]
+        if missing:
+            raise click.ClickException(
+                f"Parquet file has no {', '.join(missing)} column."
+            )
+        self._batches = self._file.iter_batches(
+            batch_size=read_rows, columns=columns
+        )
+        self._lines: collections.deque = collections.deque()
+
+    def readline(self) -> bytes:
+        import pyarrow
+
+        while not self._lines:
+            batch = next(self._batches, None)
+            if batch is None:
+                return b""
+            batch = pyarrow.RecordBatch.from_arrays(
+                [
+                    (
+                        _json_floats(column)
+                        if _has_floats(column.type)
+                        else column
+                    )
+                    for column in batch.columns
+                ],
+                names=batch.schema.names,
+            )
+            self._lines.extend(
+                json.dumps(
+                    row, separators=(",", ":"), default=str, allow_nan=False
+                ).encode()
+                + b"\n"
+                for row in batch.to_pylist()
+            )
+        return self._lines.popleft()
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _has_floats(data_type) -> bool:
+    import pyarrow
+
+    if pyarrow.types.is_floating(data_type):
+        return True
+    return any(
+        _has_floats(data_type.field(index).type)
+        for index in range(data_type.num_fields)
+    )
+
+
+def _json_floats(array):
+    """
+    Converts floats of array, also nested in lists and structs, to doubles
+    which are written to JSON as they are read from the file.
+    """
+    import pyarrow
+    import pyarrow.compute
+
+    data_type = array.type
+    if pyarrow.types.is_floating(data_type):
+        if data_type.bit_width < 64:
+            # NOTE: Shortest text which reads back as the same float32, so
+            # that e.g. 0.1 isn't written as 0.10000000149011612.
+            array = array.cast(pyarrow.string()).cast(pyarrow.float64())
+        return pyarrow.compute.if_else(
+            pyarrow.compute.is_finite(array),
+            array,
+            pyarrow.scalar(None, pyarrow.float64()),
+        )
+    if pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(
+        data_type
+    ):
+        # NOTE: Offsets are positions in all values, also of sliced arrays.
+        return type(array).from_arrays(
+            array.offsets, _json_floats(array.values), mask=array.is_null()
+        )
+    if pyarrow.types.is_fixed_size_list(data_type):
+        size = data_type.list_size
+        values = array.values.slice(array.offset * size, len(array) * size)
+        return pyarrow.FixedSizeListArray.from_arrays(
+            _json_floats(values), size, mask=array.is_null()
+        )
+    if pyarrow.types.is_struct(data_type):
+        return pyarrow.StructArray.from_arrays(
+            [_json_floats(field) for field in array.flatten()],
+            names=[field.name for field in data_type],
+            mask=array.is_null(),
+        )
+    # NOTE: Other nested types (e.g. maps) keep their floats.
+    return array
+
+
+def _conversion_error(exception: Exception) -> Exception:
+    if "unexpected field" in str(exception):
+        return click.ClickException(
+            "A document has a field which none of the documents in the "
+            "first block of the input have. Increase the block size, or "
+            "make sure the first document has all of the fields."
+        )
+    return click.ClickException(f"Invalid input: {exception}")
+
+
+def _parquet_schema(schema, embeddings_dimension: Optional[int]):
+    import pyarrow
+
+    index = schema.get_field_index(EMBEDDINGS_FIELD)
+    if index == -1:
+        return schema
+    if embeddings_dimension is None:
+        raise click.ClickException(
+            "Embeddings dimension can't be inferred, because none of the "
+            "documents in the first block of the input have embeddings."
+        )
+    return schema.set(
+        index,
+        pyarrow.field(
+            EMBEDDINGS_FIELD,
+            pyarrow.list_(pyarrow.float32(), embeddings_dimension),
+        ),
+    )
+
+
+def _dimension(batch) -> Optional[int]:
+    index = batch.schema.get_field_index(EMBEDDINGS_FIELD)
+    if index == -1:
+        return None
+    embeddings = batch.column(index).drop_null()
+    return len(embeddings[0]) if len(embeddings) else None
+
+
+def _convert_batch(batch, schema):
+    import pyarrow
+
+    index = batch.schema.get_field_index(EMBEDDINGS_FIELD)
+    if index == -1:
+        return batch
+    embeddings = batch.column(index)
+    try:
+        embeddings = embeddings.cast(schema.field(EMBEDDINGS_FIELD).type)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+        raise click.ClickException(
+            f"Embeddings need to be lists of "
+            f"{schema.field(EMBEDDINGS_FIELD).type.list_size} numbers."
+        )
+    return batch.set_column(index, EMBEDDINGS_FIELD, embeddings)
@@ -0,0 +1,331 @@
+from contextlib import contextmanager
+import io
+import json
+import logging
+from logging import Logger
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import traceback
+from typing import Optional
+import click
+from vantage_cli.config import APP_NAME
+
+SOCKET_FILE = "daemon.sock"
+SOCKET_ENVVAR = "VANTAGE_CLI_SOCKET"
+# Only these environment variables are passed from the shim to the daemon,
+# the rest of the daemon environment stays as it was when it started.
+ENVVAR_PREFIX = "VANTAGE_"
+
+# Each frame is a one byte channel, followed by payload length and payload.
+_FRAME_HEADER = struct.Struct(">cI")
+_ACCEPT = b"a"
+_REQUEST = b"r"
+_STDIN = b"i"
+_STDOUT = b"o"
+_STDERR = b"e"
+_EXIT = b"x"
+_CHUNK_SIZE = 64 * 1024
+# Daemon executes one request at a time. If it doesn't pick up the
+# connection within this many seconds, the shim executes the command itself.
+ACCEPT_TIMEOUT_SECONDS = 0.5
+
+
+def default_socket_path() -> str:
+    return os.environ.get(SOCKET_ENVVAR) or os.path.join(
+        click.get_app_dir(APP_NAME), SOCKET_FILE
+    )
+
+
+def _send_frame(connection: socket.socket, channel: bytes, data: bytes):
+    connection.sendall(_FRAME_HEADER.pack(channel, len(data)) + data)
+
+
+def _receive_exact(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed unexpectedly.")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _receive_frame(connection: socket.socket) -> tuple[bytes, bytes]:
+    channel, size = _FRAME_HEADER.unpack(
+        _receive_exact(connection, _FRAME_HEADER.size)
+    )
+    return channel, _receive_exact(connection, size)
+
+
+class _FrameWriter(io.RawIOBase):
+    def __init__(self, connection: socket.socket, channel: bytes):
+        self.connection = connection
+        self.channel = channel
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        _send_frame(self.connection, self.channel, bytes(data))
+        return len(data)
+
+
+class _FrameReader(io.RawIOBase):
+    name = "<stdin>"
+
+    def __init__(self, connection: socket.socket):
+        self.connection = connection
+        self.pending = b""
+        self.finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.pending and not self.finished:
+            _, data = _receive_frame(self.connection)
+            self.finished = len(data) == 0
+            self.pending = data
+
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        # NOTE: Request is sent only once the daemon accepts the connection,
+        # so a shim which gave up waiting never gets its command executed.
+        try:
+            _send_frame(self.request, _ACCEPT, b"")
+            _, data = _receive_frame(self.request)
+        except OSError:
+            self.server.logger.debug(
+                "Client went away before sending request."
+            )
+            return
+        request = json.loads(data)
+
+        exit_code = self.server.execute(
+            connection=self.request,
+            argv=request["argv"],
+            prog_name=request["prog_name"],
+            cwd=request["cwd"],
+            env=request["env"],
+            encoding=request["encoding"],
+        )
+        _send_frame(self.request, _EXIT, struct.pack(">i", exit_code))
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Runs CLI commands received over a Unix socket in a warm process.
+
+    Requests are executed one at a time, since working directory,
+    environment and standard streams are process wide. Shims which can't
+    be served in time execute the command themselves. Clients created by
+    commands are kept in a shared cache, together with their connection
+    pools, and reused by subsequent requests for the same account.
+    """
+
+    def __init__(self, socket_path: str, logger: Logger):
+        self.logger = logger
+        self.client_cache: dict = {}
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self):
+        # Anyone who can connect can run commands with our credentials.
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+    def execute(
+        self,
+        connection: socket.socket,
+        argv: list[str],
+        prog_name: str,
+        cwd: str,
+        env: dict[str, str],
+        encoding: str,
+    ) -> int:
+        from vantage_cli.vantage import cli
+
+        self.logger.debug(f"Executing {argv}")
+        with _request_environment(cwd=cwd, env=env), _request_streams(
+            connection=connection, encoding=encoding
+        ):
+            try:
+                cli.main(
+                    args=argv,
+                    prog_name=prog_name,
+                    obj={"client_cache": self.client_cache, "daemon": True},
+                )
+            except SystemExit as exit:
+                return _exit_code(exit.code)
+            except Exception:
+                traceback.print_exc()
+                return 1
+        return 0
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+@contextmanager
+def _request_environment(cwd: str, env: dict[str, str]):
+    previous_cwd = os.getcwd()
+    previous_env = {
+        name: value
+        for name, value in os.environ.items()
+        if name.startswith(ENVVAR_PREFIX)
+    }
+    for name in previous_env:
+        del os.environ[name]
+    os.environ.update(env)
+    os.chdir(cwd)
+    try:
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        for name in env:
+            os.environ.pop(name, None)
+        os.environ.update(previous_env)
+
+
+@contextmanager
+def _request_streams(connection: socket.socket, encoding: str):
+    streams = (sys.stdin, sys.stdout, sys.stderr)
+    # Commands reconfigure logging to write into request's stderr.
+    handlers = logging.root.handlers[:]
+    level = logging.root.level
+    sys.stdin = io.TextIOWrapper(
+        io.BufferedReader(_FrameReader(connection)), encoding=encoding
+    )
+    sys.stdout = io.TextIOWrapper(
+        _FrameWriter(connection, _STDOUT),
+        encoding=encoding,
+        write_through=True,
+    )
+    sys.stderr = io.TextIOWrapper(
+        _FrameWriter(connection, _STDERR),
+        encoding=encoding,
+        write_through=True,
+    )
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdin, sys.stdout, sys.stderr = streams
+        logging.root.handlers[:] = handlers
+        logging.root.setLevel(level)
+
+
+def serve(socket_path: str, logger: Logger) -> None:
+    from vantage_cli.vantage import COMMANDS
+
+    # Import all of the commands up front, so that requests don't pay for it.
+    for command in COMMANDS.values():
+        command.load()
+
+    os.makedirs(os.path.dirname(socket_path) or ".", mode=0o700, exist_ok=True)
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise click.ClickException(
+                f"Daemon is already listening on {socket_path}."
+            )
+        os.remove(socket_path)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    with DaemonServer(socket_path=socket_path, logger=logger) as server:
+        logger.info(f"Listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def _forward_stdin(connection: socket.socket) -> None:
+    try:
+        if not sys.stdin.isatty():
+            while True:
+                data = sys.stdin.buffer.read1(_CHUNK_SIZE)
+                if not data:
+                    break
+                _send_frame(connection, _STDIN, data)
+        _send_frame(connection, _STDIN, b"")
+    except OSError:
+        # Daemon has finished the command and closed the connection.
+        pass
+
+
+def run_via_daemon(socket_path: str, argv: list[str]) -> Optional[int]:
+    """
+    Executes command in the daemon, and returns its exit code.
+
+    Returns None if the daemon is not reachable, or busy executing another
+    command, so that the caller can execute the command directly instead.
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(ACCEPT_TIMEOUT_SECONDS)
+    try:
+        connection.connect(socket_path)
+        _receive_frame(connection)
+    except OSError:
+        connection.close()
+        return None
+    connection.settimeout(None)
+
+    request = {
+        "argv": argv,
+        "prog_name": os.path.basename(sys.argv[0]),
+        "cwd": os.getcwd(),
+        "env": {
+            name: value
+            for name, value in os.environ.items()
+            if name.startswith(ENVVAR_PREFIX) and name != SOCKET_ENVVAR
+        },
+        "encoding": sys.stdout.encoding,
+    }
+
+    with connection:
+        _send_frame(connection, _REQUEST, json.dumps(request).encode())
+        threading.Thread(
+            target=_forward_stdin, args=(connection,), daemon=True
+        ).start()
+
+        outputs = {_STDOUT: sys.stdout.buffer, _STDERR: sys.stderr.buffer}
+        while True:
+            channel, data = _receive_frame(connection)
+            if channel == _EXIT:
+                return struct.unpack(">i", data)[0]
+            outputs[channel].write(data)
+            outputs[channel].flush()
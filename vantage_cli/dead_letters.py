@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+import json
+import os
+import re
+import time
+from typing import Iterator
+from vantage_cli.batching import Batch
+
+# Kinds of dead letters, which are sent again the same way as originally.
+UPSERT = "upsert"
+UPLOAD = "upload"
+
+_METADATA_SUFFIX = ".json"
+_PAYLOAD_SUFFIX = ".jsonl"
+
+
+@dataclass
+class DeadLetter:
+    """Failed batch stored in a dead-letter directory."""
+
+    path: str
+    metadata: dict
+
+    @property
+    def payload_path(self) -> str:
+        return self.path.removesuffix(_METADATA_SUFFIX) + _PAYLOAD_SUFFIX
+
+    def read_payload(self) -> bytes:
+        with open(self.payload_path, "rb") as file:
+            return file.read()
+
+    def update_error(self, error: str) -> None:
+        self.metadata.update(
+            error=error, attempts=self.metadata.get("attempts", 1) + 1
+        )
+        _write_json(self.path, self.metadata)
+
+    def remove(self) -> None:
+        os.remove(self.payload_path)
+        os.remove(self.path)
+
+
+class DeadLetterSpool:
+    """
+    Writes batches which failed after all retries to a directory, so that
+    they can be sent again later, using replay-dead-letters.
+
+    Each batch is stored in two files: its payload, and metadata with the
+    collection, batch identifier, input and byte range it came from, and
+    the error. Metadata is written last, so a letter without one (e.g. if
+    process was killed) is never replayed half-written.
+    """
+
+    def __init__(
+        self, directory: str, kind: str, collection_id: str, input_name: str
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.kind = kind
+        self.collection_id = collection_id
+        self.input_name = input_name
+
+    def write(
+        self, batch: Batch, batch_identifier: str, error: str
+    ) -> DeadLetter:
+        name = f"{_safe_name(batch_identifier)}-{time.time_ns()}"
+        path = os.path.join(self.directory, name + _METADATA_SUFFIX)
+        letter = DeadLetter(
+            path=path,
+            metadata={
+                "kind": self.kind,
+                "collection_id": self.collection_id,
+                "batch_identifier": batch_identifier,
+                "input": self.input_name,
+                "start_offset": batch.start_offset,
+                "end_offset": batch.end_offset,
+                "documents": batch.documents,
+                "error": error,
+                "attempts": 1,
+            },
+        )
+        with open(letter.payload_path, "wb") as file:
+            file.write(batch.payload)
+        _write_json(path, letter.metadata)
+        return letter
+
+
+def read_dead_letters(directory: str) -> Iterator[DeadLetter]:
+    """Dead letters in directory, sorted by batch identifier."""
+    paths = sorted(
+        entry.path
+        for entry in os.scandir(directory)
+        if entry.name.endswith(_METADATA_SUFFIX)
+    )
+    for path in paths:
+        with open(path, "r") as file:
+            yield DeadLetter(path=path, metadata=json.load(file))
+
+
+def _safe_name(batch_identifier: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", batch_identifier)
+
+
+def _write_json(path: str, content: dict) -> None:
+    # NOTE: Replacing the file makes the write atomic.
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(content, file)
+    os.replace(temporary_path, path)
@@ -0,0 +1,84 @@
+import importlib
+from dataclasses import dataclass
+from typing import Optional
+import click
+
+
+@dataclass(frozen=True)
+class LazyCommand:
+    """Registration entry for a command whose module is imported on use."""
+
+    import_path: str
+    short_help: str
+
+    def load(self) -> click.Command:
+        module_name, attribute = self.import_path.split(":")
+        module = importlib.import_module(module_name)
+        return getattr(module, attribute)
+
+
+class LazyGroup(click.Group):
+    """
+    Click group which resolves subcommands from a static table.
+
+    Command modules pull in the SDK, pydantic models and jsonpickle, so they
+    are imported only when the command is actually invoked. Listing commands
+    (e.g. in --help) uses the short help stored in the table instead.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_commands: Optional[dict[str, LazyCommand]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+
+        lazy_command = self.lazy_commands.get(cmd_name)
+        if lazy_command is None:
+            return None
+
+        command = lazy_command.load()
+        if command.name != cmd_name:
+            raise RuntimeError(
+                f"Command {lazy_command.import_path} is registered as "
+                f"'{cmd_name}' but named '{command.name}'."
+            )
+        self.add_command(command)
+        return command
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        rows = []
+        limit = (
+            formatter.width
+            - 6
+            - max((len(name) for name in self.list_commands(ctx)), default=0)
+        )
+
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                help = command.get_short_help_str(limit)
+            else:
+                help = click.utils.make_default_short_help(
+                    self.lazy_commands[name].short_help, limit
+                )
+            rows.append((name, help))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
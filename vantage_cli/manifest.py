@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+from typing import BinaryIO, Iterator, Optional
+import click
+from vantage_cli.batching import Batch, BatchLimits, read_jsonl_batches
+from vantage_cli.config import APP_NAME
+
+MANIFEST_DIRECTORY = "manifests"
+MANIFEST_VERSION = 1
+
+
+def default_manifest_file(
+    command: str, collection_id: str, input_path: str
+) -> str:
+    key = "\0".join([command, collection_id, os.path.abspath(input_path)])
+    return os.path.join(
+        click.get_app_dir(APP_NAME),
+        MANIFEST_DIRECTORY,
+        f"{hashlib.sha256(key.encode()).hexdigest()}.jsonl",
+    )
+
+
+def input_fingerprint(input_path: Optional[str]) -> dict:
+    if input_path is None:
+        return {"input": "<stdin>"}
+    stat = os.stat(input_path)
+    return {
+        "input": os.path.abspath(input_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def read_manifest_header(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r") as file:
+            return json.loads(file.readline())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class UploadManifest:
+    """
+    Append-only log of batches which were sent successfully.
+
+    First line is a header describing the upload: input fingerprint,
+    collection and batch identifier. Each following line records one sent
+    batch, with its number, identifier and input byte range. Resumed upload
+    skips recorded byte ranges, so it can use different batching options
+    (e.g. when adaptive upload changed batch size on the way).
+    """
+
+    def __init__(self, path: str, header: dict, completed: dict[int, dict]):
+        self.path = path
+        self.header = header
+        self.completed = completed
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    @staticmethod
+    def create(path: str, header: dict) -> "UploadManifest":
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        with open(path, "w") as file:
+            file.write(json.dumps({"version": MANIFEST_VERSION, **header}))
+            file.write("\n")
+        return UploadManifest(path=path, header=header, completed={})
+
+    @staticmethod
+    def resume(path: str, header: dict) -> "UploadManifest":
+        recorded = read_manifest_header(path)
+        if recorded is None:
+            return UploadManifest.create(path=path, header=header)
+
+        recorded.pop("version", None)
+        changed = sorted(
+            name
+            for name in recorded.keys() | header.keys()
+            if recorded.get(name) != header.get(name)
+        )
+        if changed:
+            raise click.ClickException(
+                f"Can't resume upload recorded in {path}, because "
+                f"{', '.join(changed)} changed since. Run without --resume "
+                f"to upload everything again."
+            )
+
+        completed = {}
+        with open(path, "r") as file:
+            file.readline()
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Last record might be cut short, if process was killed
+                    # while writing it. Batch is sent again.
+                    continue
+                completed[record["index"]] = record
+        return UploadManifest(path=path, header=header, completed=completed)
+
+    def batches(
+        self, stream: BinaryIO, limits: BatchLimits
+    ) -> Iterator[Batch]:
+        """Reads batches of the input which haven't been sent yet."""
+        return read_jsonl_batches(
+            stream=stream,
+            limits=limits,
+            skip=[
+                (record["start"], record["end"])
+                for record in self.completed.values()
+            ],
+            # Batch numbers (and identifiers) of a resumed upload continue
+            # after the recorded ones.
+            start_index=max(self.completed, default=-1) + 1,
+        )
+
+    def record(self, batch: Batch, batch_identifier: str) -> None:
+        record = {
+            "index": batch.index,
+            "identifier": batch_identifier,
+            "start": batch.start_offset,
+            "end": batch.end_offset,
+            "documents": batch.documents,
+        }
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def close(self, finished: bool = False) -> None:
+        """Closes the manifest, and removes it once the upload finished."""
+        self._file.close()
+        if finished:
+            os.remove(self.path)
@@ -0,0 +1,82 @@
+from typing import Iterator
+from vantage_cli.batching import Batch
+
+
+def _row_group_range(row_group) -> tuple[int, int]:
+    """Byte range of row group's column chunks in the file."""
+    start, end = None, 0
+    for index in range(row_group.num_columns):
+        column = row_group.column(index)
+        offset = (
+            column.dictionary_page_offset
+            if column.has_dictionary_page
+            else column.data_page_offset
+        )
+        start = offset if start is None else min(start, offset)
+        end = max(end, offset + column.total_compressed_size)
+    return start or 0, end
+
+
+def plan_parts(metadata, max_bytes: int) -> list[list[int]]:
+    """
+    Splits row groups of a Parquet file into parts of consecutive row
+    groups, each at most max_bytes large (compressed), unless a single row
+    group is larger than that, in which case it makes a part alone.
+    """
+    parts: list[list[int]] = []
+    size = 0
+    for index in range(metadata.num_row_groups):
+        start, end = _row_group_range(metadata.row_group(index))
+        if parts and size + (end - start) <= max_bytes:
+            parts[-1].append(index)
+            size += end - start
+        else:
+            parts.append([index])
+            size = end - start
+    return parts
+
+
+def read_parquet_parts(path: str, max_bytes: int) -> Iterator[Batch]:
+    """
+    Repartitions Parquet file along row group boundaries into files of at
+    most max_bytes, which are created only as they are read.
+
+    Row groups are copied as they are, using compression of the input,
+    but Arrow can't copy encoded column chunks, so they are decoded into
+    Arrow (not Python) objects and encoded again. Batch offsets are byte
+    positions of the row groups in the input.
+    """
+    import pyarrow
+    import pyarrow.parquet
+
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    metadata = parquet_file.metadata
+    compression = "none"
+    if metadata.num_row_groups and metadata.num_columns:
+        compression = metadata.row_group(0).column(0).compression.lower()
+        if compression == "uncompressed":
+            compression = "none"
+
+    for index, row_groups in enumerate(plan_parts(metadata, max_bytes)):
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.parquet.ParquetWriter(
+            sink,
+            schema=parquet_file.schema_arrow,
+            compression=compression,
+        ) as writer:
+            for row_group in row_groups:
+                writer.write_table(parquet_file.read_row_group(row_group))
+        ranges = [
+            _row_group_range(metadata.row_group(row_group))
+            for row_group in row_groups
+        ]
+        yield Batch(
+            index=index,
+            start_offset=ranges[0][0],
+            end_offset=ranges[-1][1],
+            documents=sum(
+                metadata.row_group(row_group).num_rows
+                for row_group in row_groups
+            ),
+            payload=sink.getvalue().to_pybytes(),
+        )
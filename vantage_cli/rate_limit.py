@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from typing import Callable, Optional, Union
+
+# Buckets hold at most this many seconds worth of tokens, so that requests
+# after an idle period don't go out in a burst which exceeds the quota.
+BURST_SECONDS = 0.1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, refilled at rate tokens per second.
+
+    Callers wait until there are enough tokens (or the bucket is full, if
+    they ask for more than it holds), and then take all of them, possibly
+    putting the bucket into debt, which later callers wait out. Requests
+    larger than the bucket (e.g. big uploads when limiting bytes) are thus
+    sent without delay, while the average rate still follows the limit.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate * BURST_SECONDS)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Takes amount tokens, waiting until they are available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            needed = min(amount, self.capacity)
+            delay = max(0.0, (needed - self._tokens) / self.rate)
+            self._tokens -= amount
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """Limits both number of requests and bytes sent per second."""
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        bytes_per_second: Optional[float] = None,
+    ):
+        self.requests = (
+            TokenBucket(rate=requests_per_second)
+            if requests_per_second
+            else None
+        )
+        self.bytes = (
+            TokenBucket(rate=bytes_per_second) if bytes_per_second else None
+        )
+
+    def acquire(self, size: Union[Callable[[], int], int] = 0) -> None:
+        """
+        Waits until a request of size bytes can be sent. Size can be given
+        as a function, which is called only when bytes are limited.
+        """
+        if self.requests is not None:
+            self.requests.acquire()
+        if self.bytes is not None:
+            self.bytes.acquire(size() if callable(size) else size)
+
+
+def create_rate_limiter(
+    requests_per_second: Optional[float],
+    bytes_per_second: Optional[float],
+) -> Optional[RateLimiter]:
+    if not requests_per_second and not bytes_per_second:
+        return None
+    return RateLimiter(
+        requests_per_second=requests_per_second,
+        bytes_per_second=bytes_per_second,
+    )
+
+
+def body_size(body) -> int:
+    """Size of an API request body, as it is sent by the SDK."""
+    if body is None:
+        return 0
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode())
+    return len(json.dumps(body).encode())
+
+
+def install_rate_limiter(client, rate_limiter: Optional[RateLimiter]) -> None:
+    """
+    Makes all API requests of client go through rate_limiter (or none).
+
+    Client's REST client is wrapped once, and reads the limiter for every
+    request, so that a client which is reused by several commands (e.g. in
+    the daemon) follows limits of the one being executed.
+    """
+    if rate_limiter is None and not getattr(client, "_rate_limited", False):
+        return
+    client._rate_limited = True
+    api_clients = {
+        id(api_client): api_client
+        for api_client in (
+            client.management_api.account_api.api_client,
+            client.search_api.api.api_client,
+        )
+    }
+    for api_client in api_clients.values():
+        rest_client = api_client.rest_client
+        if not hasattr(rest_client, "rate_limiter"):
+            rest_client.request = _limited(rest_client, rest_client.request)
+        rest_client.rate_limiter = rate_limiter
+
+
+def _limited(rest_client, request: Callable) -> Callable:
+    def limited_request(method, url, headers=None, body=None, **kwargs):
+        if rest_client.rate_limiter is not None:
+            rest_client.rate_limiter.acquire(size=lambda: body_size(body))
+        return request(method, url, headers=headers, body=body, **kwargs)
+
+    return limited_request
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from logging import Logger
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DEADLINE_SECONDS = 120.0
+BASE_DELAY_SECONDS = 0.5
+MAX_DELAY_SECONDS = 30.0
+
+T = TypeVar("T")
+
+
+def is_retryable(exception: Exception) -> bool:
+    """
+    Whether request failed due to a transient condition, i.e. it was
+    throttled, failed on server side or the connection failed or timed out.
+    """
+    # NOTE: Imported here, so that defaults can be imported for --help
+    # without the SDK.
+    import requests
+    import urllib3
+    from vantage_sdk.exceptions import VantageFileUploadError
+
+    status = getattr(exception, "status", None)
+    if status is None and isinstance(exception, VantageFileUploadError):
+        status = exception.args[1]
+    if status:
+        return status == 429 or status >= 500
+    return isinstance(
+        exception,
+        (
+            ConnectionError,
+            TimeoutError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            urllib3.exceptions.HTTPError,
+        ),
+    )
+
+
+def retry_after(exception: Exception) -> Optional[float]:
+    """Seconds to wait according to Retry-After header of the response."""
+    headers = getattr(exception, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries transient failures (see is_retryable) up to max_retries times,
+    waiting a random time between zero and an exponentially growing limit
+    ("full jitter"), or as long as the service asked using Retry-After.
+    No retry is attempted if it would start after deadline seconds since
+    the first attempt.
+    """
+
+    max_retries: int = DEFAULT_MAX_RETRIES
+    deadline: Optional[float] = DEFAULT_RETRY_DEADLINE_SECONDS
+    base_delay: float = BASE_DELAY_SECONDS
+    max_delay: float = MAX_DELAY_SECONDS
+
+    def delay(self, attempt: int, exception: Exception) -> float:
+        requested = retry_after(exception)
+        if requested is not None:
+            return requested
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def call(
+        self,
+        function: Callable[[], T],
+        logger: Logger,
+        description: str = "Request",
+    ) -> T:
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return function()
+            except Exception as exception:
+                if attempt > self.max_retries or not is_retryable(exception):
+                    self._give_up(logger, description, attempt)
+                    raise
+                delay = self.delay(attempt, exception)
+                elapsed = time.monotonic() - start
+                if (
+                    self.deadline is not None
+                    and elapsed + delay > self.deadline
+                ):
+                    logger.error(
+                        f"{description} isn't retried, because retry "
+                        f"deadline of {self.deadline:g}s would be exceeded."
+                    )
+                    self._give_up(logger, description, attempt)
+                    raise
+                logger.warning(
+                    f"{description} failed (attempt {attempt} of "
+                    f"{self.max_retries + 1}): {exception!r}, retrying in "
+                    f"{delay:.1f}s."
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    @staticmethod
+    def _give_up(logger: Logger, description: str, attempt: int) -> None:
+        if attempt > 1:
+            logger.error(f"{description} failed after {attempt} attempts.")
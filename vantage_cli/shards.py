@@ -0,0 +1,65 @@
+import glob
+import os
+from typing import Iterable
+from vantage_cli.compression import COMPRESSED_SUFFIXES
+
+JSONL_SUFFIX = ".jsonl"
+PARQUET_SUFFIX = ".parquet"
+SHARD_SUFFIXES = (
+    JSONL_SUFFIX,
+    *(JSONL_SUFFIX + suffix for suffix in COMPRESSED_SUFFIXES),
+    PARQUET_SUFFIX,
+)
+
+
+def discover_shards(sources: Iterable[str], recursive: bool = False) -> list:
+    """
+    Finds JSONL (possibly compressed) and Parquet files in sources, which are directories, glob
+    patterns or files. Directories are searched recursively only when
+    recursive is set, while patterns can use "**" for that. Files are
+    returned sorted, without duplicates.
+    """
+    shards = set()
+    for source in sources:
+        if os.path.isdir(source):
+            pattern = "**/*" if recursive else "*"
+            paths = glob.glob(
+                os.path.join(glob.escape(source), pattern), recursive=True
+            )
+        elif _is_pattern(source):
+            paths = glob.glob(source, recursive=True)
+        else:
+            paths = [source]
+        shards.update(
+            os.path.normpath(path)
+            for path in paths
+            if path.endswith(SHARD_SUFFIXES) and os.path.isfile(path)
+        )
+    return sorted(shards)
+
+
+def shard_names(paths: list) -> dict:
+    """
+    Unique names of shards, used in batch identifiers: path relative to
+    the common directory of all shards, with separators replaced by "-"
+    and without the suffix.
+    """
+    if not paths:
+        return {}
+    root = os.path.commonpath([os.path.abspath(p) for p in paths])
+    if len(paths) == 1 or os.path.isfile(root):
+        root = os.path.dirname(root)
+    names = {}
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), root)
+        name = relative.replace(os.sep, "-")
+        for suffix in SHARD_SUFFIXES:
+            if name.endswith(suffix):
+                name = name.removesuffix(suffix)
+                break
+        names[path] = name
+    return names
+
+
+def _is_pattern(source: str) -> bool:
+    return any(character in source for character in "*?[")
@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import time
+from typing import BinaryIO, Iterator, Optional
+import click
+from vantage_cli.state import content_hash, document_id
+
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+# Approximate memory used by a buffered document, on top of its line.
+_DOCUMENT_OVERHEAD_BYTES = 200
+
+
+@dataclass
+class DiffSummary:
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    spill_files: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "added": self.added,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "spill_files": self.spill_files,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def sort_documents(
+    stream: BinaryIO,
+    directory: str,
+    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+    summary: Optional[DiffSummary] = None,
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Sorts JSONL documents by ID, yielding (ID, line) pairs.
+
+    Documents are buffered until they take about memory_bytes, sorted and
+    spilled to a file in directory. Spilled runs are then merged, reading
+    one line of each at a time. Input which fits in memory isn't spilled.
+    Order of documents with the same ID is kept.
+    """
+    runs = []
+    documents = []
+    size = 0
+    for number, line in enumerate(iter(stream.readline, b""), start=1):
+        if not line.strip():
+            continue
+        id = document_id(line)
+        if id is None:
+            raise click.ClickException(
+                f"Line {number} of the input isn't a document with an ID."
+            )
+        if not line.endswith(b"\n"):
+            line += b"\n"
+        documents.append((id, line))
+        size += len(line) + len(id) + _DOCUMENT_OVERHEAD_BYTES
+        if size >= memory_bytes:
+            runs.append(_spill(documents, directory))
+            documents = []
+            size = 0
+
+    if not runs:
+        documents.sort(key=_id)
+        yield from documents
+        return
+    if documents:
+        runs.append(_spill(documents, directory))
+        documents = []
+    if summary is not None:
+        summary.spill_files += len(runs)
+    yield from heapq.merge(*(_read_run(path) for path in runs), key=_id)
+
+
+def diff_snapshots(
+    old: BinaryIO,
+    new: BinaryIO,
+    upserts: BinaryIO,
+    deletions: BinaryIO,
+    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+    temporary_directory: Optional[str] = None,
+) -> DiffSummary:
+    """
+    Compares two JSONL snapshots of a collection, writing lines of new and
+    changed documents to upserts, and IDs of removed documents (one per
+    line) to deletions.
+
+    Both snapshots are sorted by ID (using at most memory_bytes each, and
+    spilling the rest to temporary_directory), and merged. Documents are
+    compared by content hash of their lines. When a snapshot has several
+    documents with the same ID, the last one is used, same as by upsert.
+    """
+    start = time.perf_counter()
+    summary = DiffSummary()
+    with tempfile.TemporaryDirectory(
+        prefix="vantage-diff-", dir=temporary_directory
+    ) as directory:
+        old_documents = _last_by_id(
+            sort_documents(
+                old,
+                os.path.join(directory, "old"),
+                memory_bytes,
+                summary,
+            )
+        )
+        old_document = next(old_documents, None)
+        new_documents = _last_by_id(
+            sort_documents(
+                new,
+                os.path.join(directory, "new"),
+                memory_bytes,
+                summary,
+            )
+        )
+        new_document = next(new_documents, None)
+
+        while old_document is not None or new_document is not None:
+            if new_document is None or (
+                old_document is not None and old_document[0] < new_document[0]
+            ):
+                deletions.write(f"{old_document[0]}\n".encode())
+                summary.removed += 1
+                old_document = next(old_documents, None)
+                continue
+            if old_document is None or new_document[0] < old_document[0]:
+                upserts.write(new_document[1])
+                summary.added += 1
+            elif content_hash(old_document[1]) != content_hash(
+                new_document[1]
+            ):
+                upserts.write(new_document[1])
+                summary.changed += 1
+            else:
+                summary.unchanged += 1
+            if old_document is not None and old_document[0] == new_document[0]:
+                old_document = next(old_documents, None)
+            new_document = next(new_documents, None)
+
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+def _id(document: tuple[str, bytes]) -> str:
+    return document[0]
+
+
+def _last_by_id(
+    documents: Iterator[tuple[str, bytes]]
+) -> Iterator[tuple[str, bytes]]:
+    for _, group in itertools.groupby(documents, key=_id):
+        *_, last = group
+        yield last
+
+
+def _spill(documents: list, directory: str) -> str:
+    documents.sort(key=_id)
+    os.makedirs(directory, exist_ok=True)
+    file = tempfile.NamedTemporaryFile(
+        "wb", dir=directory, suffix=".jsonl", delete=False
+    )
+    with file:
+        for id, line in documents:
+            # NOTE: JSON strings have no tabs, so the ID ends at the first.
+            file.write(json.dumps(id).encode() + b"\t" + line)
+    return file.name
+
+
+def _read_run(path: str) -> Iterator[tuple[str, bytes]]:
+    with open(path, "rb") as file:
+        for record in file:
+            id, line = record.split(b"\t", 1)
+            yield json.loads(id), line
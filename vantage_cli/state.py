@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import BinaryIO, Iterator, Optional
+
+# Unchanged documents are marked as seen in transactions of this many.
+_SEEN_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    hash BLOB NOT NULL,
+    run INTEGER NOT NULL,
+    pending_deletion INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (collection_id, id)
+) WITHOUT ROWID
+"""
+
+
+def content_hash(line: bytes) -> bytes:
+    """Hash of a JSONL line, ignoring surrounding whitespace."""
+    return hashlib.blake2b(line.strip(), digest_size=16).digest()
+
+
+def document_id(line: bytes) -> Optional[str]:
+    try:
+        document = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(document, dict) or "id" not in document:
+        return None
+    return str(document["id"])
+
+
+class DocumentState:
+    """
+    SQLite store of IDs and content hashes of documents sent to collections.
+
+    Each upsert is a run, which marks documents of its input as seen. New
+    and changed documents are recorded once they are sent, so an upsert
+    which failed half-way sends only the remaining ones when it is run
+    again. Documents of a collection which weren't seen by a complete run
+    have been removed from its input. Once emitted for deletion, they are
+    kept (and emitted by every run) until delete-documents confirms they
+    were deleted, and sent again if they reappear in the input meanwhile.
+    """
+
+    def __init__(self, path: str, collection_id: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.collection_id = collection_id
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        # NOTE: Documents are read in the main thread, and recorded by the
+        # threads sending them.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+            columns = {
+                row[1]
+                for row in self._connection.execute(
+                    "PRAGMA table_info(documents)"
+                )
+            }
+            if "pending_deletion" not in columns:
+                # NOTE: Databases created by older versions lack it.
+                self._connection.execute(
+                    "ALTER TABLE documents ADD COLUMN pending_deletion "
+                    "INTEGER NOT NULL DEFAULT 0"
+                )
+        (self.run,) = self._connection.execute(
+            "SELECT COALESCE(MAX(run), 0) + 1 FROM documents "
+            "WHERE collection_id = ?",
+            (collection_id,),
+        ).fetchone()
+
+    def changed(self, stream: BinaryIO) -> BinaryIO:
+        """
+        Wraps JSONL stream, so that reading it returns only lines of new or
+        changed documents (and lines without an ID, which are passed on).
+        """
+        return _ChangedDocumentsReader(self, stream)
+
+    def is_unchanged(self, id: str, hash: bytes) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT hash, pending_deletion FROM documents "
+                "WHERE collection_id = ? AND id = ?",
+                (self.collection_id, id),
+            ).fetchone()
+        return row is not None and row[0] == hash and not row[1]
+
+    def mark_seen(self, ids: list) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE documents SET run = ? "
+                "WHERE collection_id = ? AND id = ?",
+                [(self.run, self.collection_id, id) for id in ids],
+            )
+
+    def record(self, payload: bytes) -> None:
+        """Records documents of a batch which was sent."""
+        rows = []
+        for line in payload.splitlines():
+            id = document_id(line)
+            if id is not None:
+                rows.append(
+                    (self.collection_id, id, content_hash(line), self.run)
+                )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO documents (collection_id, id, hash, "
+                "run) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def removed(self) -> Iterator[str]:
+        """IDs of documents which weren't seen by the current run."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id FROM documents WHERE collection_id = ? "
+                "AND run < ? ORDER BY id",
+                (self.collection_id, self.run),
+            ).fetchall()
+        return (id for (id,) in rows)
+
+    def mark_pending_deletion(self, ids: list) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE documents SET pending_deletion = 1 "
+                "WHERE collection_id = ? AND id = ?",
+                [(self.collection_id, id) for id in ids],
+            )
+
+    def forget(self, ids: list) -> None:
+        """Forgets documents, once they were deleted from the collection."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM documents WHERE collection_id = ? AND id = ?",
+                [(self.collection_id, id) for id in ids],
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class _ChangedDocumentsReader:
+    def __init__(self, state: DocumentState, stream: BinaryIO):
+        self.state = state
+        self.stream = stream
+        # Position of the line last returned, in the input.
+        self.line_offset = 0
+        self._offset = 0
+        self._seen: list[str] = []
+
+    def readline(self) -> bytes:
+        while True:
+            line = self.stream.readline()
+            self.line_offset = self._offset
+            self._offset += len(line)
+            if not line:
+                self._flush()
+                return line
+            if not line.strip():
+                continue
+            id = document_id(line)
+            if id is None or not self.state.is_unchanged(
+                id, content_hash(line)
+            ):
+                return line
+            self.state.unchanged += 1
+            self._seen.append(id)
+            if len(self._seen) >= _SEEN_BATCH_SIZE:
+                self._flush()
+
+    def seekable(self) -> bool:
+        return False
+
+    def _flush(self) -> None:
+        if self._seen:
+            self.state.mark_seen(self._seen)
+            self._seen = []
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+import hashlib
+import json
+from logging import Logger
+import os
+import time
+from typing import Optional
+import click
+import requests
+from vantage_sdk.config import AUTH_ENDPOINT
+from vantage_cli.config import APP_NAME, write_private_file
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+
+TOKEN_CACHE_FILE = "token_cache.json"
+# Tokens are refreshed this many seconds before they expire, so that a
+# command never starts with a token which runs out while it executes.
+REFRESH_MARGIN_SECONDS = 300
+# Connect and read timeouts of token requests. Tokens are fetched while
+# holding the cache lock, so a hanging auth host mustn't block other
+# invocations waiting for it.
+AUTH_TIMEOUT_SECONDS = (5, 30)
+
+
+def default_token_cache_file() -> str:
+    return os.path.join(click.get_app_dir(APP_NAME), TOKEN_CACHE_FILE)
+
+
+def fetch_token(
+    auth_host: str,
+    client_id: str,
+    client_secret: str,
+    audience: str,
+) -> dict:
+    response = requests.post(
+        f"{auth_host}{AUTH_ENDPOINT}",
+        data={
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": "client_credentials",
+            "audience": audience,
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        timeout=AUTH_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+    authentication = response.json()
+
+    return {
+        "access_token": authentication["access_token"],
+        "expires_at": time.time() + authentication["expires_in"],
+    }
+
+
+class TokenCache:
+    """
+    On-disk cache of OAuth tokens obtained using client credentials.
+
+    Tokens are keyed by auth host, client ID, account ID and API host
+    (the token audience). Refreshing is done while holding an exclusive lock
+    on a sidecar lock file, so concurrent invocations wait for the one
+    which is fetching the token instead of all hitting the auth server.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        path: Optional[str] = None,
+        refresh_margin: int = REFRESH_MARGIN_SECONDS,
+    ):
+        self.logger = logger
+        self.path = path or default_token_cache_file()
+        self.refresh_margin = refresh_margin
+
+    def get_token(
+        self,
+        auth_host: str,
+        client_id: str,
+        client_secret: str,
+        account_id: str,
+        api_host: str,
+    ) -> str:
+        key = self._key(auth_host, client_id, account_id, api_host)
+
+        token = self._read().get(key)
+        if self._is_fresh(token):
+            self.logger.debug("Using cached authentication token.")
+            return token["access_token"]
+
+        with self._locked():
+            # Another process might have refreshed the token while we were
+            # waiting for the lock.
+            tokens = self._read()
+            token = tokens.get(key)
+            if self._is_fresh(token):
+                self.logger.debug("Using cached authentication token.")
+                return token["access_token"]
+
+            self.logger.debug(f"Fetching new token from {auth_host}.")
+            token = fetch_token(
+                auth_host=auth_host,
+                client_id=client_id,
+                client_secret=client_secret,
+                audience=api_host,
+            )
+            tokens = {
+                cached_key: cached_token
+                for cached_key, cached_token in tokens.items()
+                if self._expires_at(cached_token) > time.time()
+            }
+            tokens[key] = token
+            write_private_file(self.path, json.dumps(tokens).encode())
+
+        return token["access_token"]
+
+    def _key(self, *parts: str) -> str:
+        key = "\0".join(str(part) for part in parts)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _is_fresh(self, token) -> bool:
+        return self._expires_at(token) - self.refresh_margin > time.time()
+
+    def _expires_at(self, token) -> float:
+        # NOTE: Entries written by other versions, or edited by hand, are
+        # treated as expired instead of failing the command.
+        if not isinstance(token, dict) or not isinstance(
+            token.get("access_token"), str
+        ):
+            return 0
+        expires_at = token.get("expires_at")
+        if isinstance(expires_at, bool) or not isinstance(
+            expires_at, (int, float)
+        ):
+            return 0
+        return expires_at
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as file:
+                tokens = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return tokens if isinstance(tokens, dict) else {}
+
+    @contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:  # pragma: no cover
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            os.close(fd)
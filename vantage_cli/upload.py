@@ -0,0 +1,347 @@
+from collections import deque
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+import functools
+from logging import Logger
+import os
+import threading
+import time
+from typing import BinaryIO, Callable, Iterable, Optional, Union
+import requests
+from requests.adapters import HTTPAdapter
+from vantage_sdk.client import VantageClient
+from vantage_sdk.exceptions import VantageFileUploadError
+from vantage_cli.adaptive import AimdController
+from vantage_cli.batching import Batch
+from vantage_cli.compression import gzip_body
+from vantage_cli.rate_limit import RateLimiter
+from vantage_cli.retry import RetryPolicy, is_retryable
+
+# Adaptive upload sends a batch which failed due to overload this many times
+# in total, before giving up.
+MAX_OVERLOAD_ATTEMPTS = 5
+
+
+@dataclass
+class UploadSummary:
+    batches: int = 0
+    documents: int = 0
+    bytes: int = 0
+    failed_batches: int = 0
+    failed_documents: int = 0
+
+    def add(self, batch: Batch) -> None:
+        self.batches += 1
+        self.documents += batch.documents
+        self.bytes += batch.size
+
+    def add_failed(self, batch: Batch) -> None:
+        self.failed_batches += 1
+        self.failed_documents += batch.documents
+
+
+def upload_batches(
+    batches: Iterable[Batch],
+    send: Callable[[Batch], None],
+    concurrency: int,
+    logger: Logger,
+    controller: Optional[AimdController] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    on_failure: Optional[Callable[[Batch, Exception], None]] = None,
+    max_pending: Optional[int] = None,
+) -> UploadSummary:
+    """
+    Sends batches using a pool of concurrency threads.
+
+    Batches are read from the iterable only when there is room for them,
+    at most max_pending (by default two per thread) in flight or waiting
+    for a thread, so memory usage stays bounded regardless of input size.
+    After the first failed batch, no new batches are sent, the ones in
+    flight are completed, and the error is raised.
+
+    With a controller, number of batches in flight follows its concurrency,
+    and batches which failed due to overload are sent again (after the
+    controller reduced the load), up to MAX_OVERLOAD_ATTEMPTS times.
+    Without one, each batch is retried according to retry_policy.
+
+    With on_failure, batches which failed (after retries) are passed to it
+    instead, and the upload goes on.
+    """
+    return _BatchUploader(
+        send=send,
+        concurrency=concurrency,
+        logger=logger,
+        controller=controller,
+        retry_policy=retry_policy,
+        on_failure=on_failure,
+        max_pending=max_pending,
+    ).run(batches)
+
+
+class TransferStats:
+    """Thread-safe totals of bytes uploaded, before and after compression."""
+
+    def __init__(self):
+        self.logical_bytes = 0
+        self.wire_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, logical_bytes: int, wire_bytes: int) -> None:
+        with self._lock:
+            self.logical_bytes += logical_bytes
+            self.wire_bytes += wire_bytes
+
+    def to_dict(self) -> dict:
+        return {
+            "logical_bytes": self.logical_bytes,
+            "wire_bytes": self.wire_bytes,
+            "size_reduction": (
+                f"{1 - self.wire_bytes / self.logical_bytes:.1%}"
+                if self.logical_bytes
+                else None
+            ),
+        }
+
+
+class _BatchUploader:
+    def __init__(
+        self,
+        send: Callable[[Batch], None],
+        concurrency: int,
+        logger: Logger,
+        controller: Optional[AimdController],
+        retry_policy: Optional[RetryPolicy],
+        on_failure: Optional[Callable[[Batch, Exception], None]] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.send = send
+        self.concurrency = concurrency
+        self.max_pending = max_pending or 2 * concurrency
+        self.logger = logger
+        self.controller = controller
+        self.retry_policy = retry_policy
+        self.on_failure = on_failure
+        self.summary = UploadSummary()
+        # Batch and number of its attempt, for each of the batches in flight.
+        self.pending: dict[Future, tuple[Batch, int, int]] = {}
+        self.retries: deque[tuple[Batch, int]] = deque()
+
+    def run(self, batches: Iterable[Batch]) -> UploadSummary:
+        batches = iter(batches)
+        failure: Optional[Exception] = None
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="upload"
+        ) as pool:
+            while failure is None:
+                if len(self.pending) >= self._max_pending():
+                    failure = self._collect(return_when=FIRST_COMPLETED)
+                    continue
+
+                if self.retries:
+                    batch, attempt = self.retries.popleft()
+                else:
+                    batch, attempt = next(batches, None), 1
+                    if batch is None:
+                        if not self.pending:
+                            break
+                        failure = self._collect(return_when=FIRST_COMPLETED)
+                        continue
+
+                epoch = self.controller.epoch if self.controller else 0
+                future = pool.submit(self._send, batch, attempt)
+                self.pending[future] = (batch, attempt, epoch)
+
+            failure = failure or self._collect(return_when=ALL_COMPLETED)
+
+        if failure is not None:
+            self.logger.error(
+                f"Upload stopped, {self.summary.batches} batches "
+                f"({self.summary.documents} documents) were sent successfully."
+            )
+            raise failure
+        return self.summary
+
+    def _max_pending(self) -> int:
+        if self.controller is not None:
+            return self.controller.concurrency
+        return self.max_pending
+
+    def _send(self, batch: Batch, attempt: int) -> float:
+        if attempt > 1:
+            # Gives overloaded service some time, on top of reduced load.
+            time.sleep(attempt - 1)
+        start = time.perf_counter()
+        if self.controller is None and self.retry_policy is not None:
+            self.retry_policy.call(
+                function=lambda: self.send(batch),
+                logger=self.logger,
+                description=f"Sending batch {batch.index}",
+            )
+        else:
+            self.send(batch)
+        return time.perf_counter() - start
+
+    def _collect(self, return_when: str) -> Optional[Exception]:
+        done, _ = wait(self.pending, return_when=return_when)
+        failure = None
+        for future in done:
+            batch, attempt, epoch = self.pending.pop(future)
+            exception = future.exception()
+            if exception is None:
+                self.summary.add(batch)
+                if self.controller is not None:
+                    self.controller.on_success(
+                        batch=batch, latency=future.result(), epoch=epoch
+                    )
+                continue
+
+            if self.controller is not None and is_retryable(exception):
+                self.controller.on_overload(
+                    batch=batch, reason=repr(exception), epoch=epoch
+                )
+                if attempt < MAX_OVERLOAD_ATTEMPTS:
+                    self.retries.append((batch, attempt + 1))
+                    continue
+
+            self.logger.error(
+                f"Sending batch {batch.index} (input bytes "
+                f"{batch.start_offset}-{batch.end_offset}) failed: {exception!r}"
+            )
+            if self.on_failure is not None:
+                try:
+                    self.on_failure(batch, exception)
+                    self.summary.add_failed(batch)
+                    continue
+                except Exception as handler_exception:
+                    exception = handler_exception
+            failure = failure or exception
+        return failure
+
+
+def upload_documents(
+    client: VantageClient,
+    collection_id: str,
+    batch_identifier: str,
+    body: bytes,
+    compress: bool = False,
+) -> int:
+    """
+    Upserts JSONL documents in body, which is sent as it is, or gzip
+    compressed, if compress is set. Returns number of bytes sent.
+
+    SDK method validates body to be a string, which would have to be
+    decoded from the input and encoded again for the request, so the
+    function it wraps is called instead, when there is one.
+    """
+    documents_api = client.management_api.documents_api
+    upload = documents_api.upload_documents
+    raw_upload = getattr(upload, "raw_function", None)
+    if raw_upload is not None:
+        upload = functools.partial(raw_upload, documents_api)
+    headers = None
+    if compress:
+        body = gzip_body(body)
+        headers = {"Content-Encoding": "gzip"}
+    upload(
+        body=body,
+        account_id=client.account_id,
+        collection_id=collection_id,
+        customer_batch_identifier=batch_identifier,
+        _headers=headers,
+    )
+    return len(body)
+
+
+class DirectUploader:
+    """
+    Uploads files to a collection using pre-signed upload URLs.
+
+    Same as the SDK file upload, but for content which is already in
+    memory, and using one HTTP session for all of the uploads, sized for
+    the number of threads using it. Uploads (which don't go through the API
+    client) are paced by the rate limiter, if one is given. With compress,
+    content is sent gzip compressed (files, which are Parquet, are not).
+    """
+
+    def __init__(
+        self,
+        client: VantageClient,
+        collection_id: str,
+        concurrency: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        compress: bool = False,
+    ):
+        self.client = client
+        self.collection_id = collection_id
+        self.rate_limiter = rate_limiter
+        self.compress = compress
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def upload(self, batch_identifier: str, content: bytes) -> int:
+        """Uploads content, returning number of bytes sent."""
+        headers = None
+        if self.compress:
+            content = gzip_body(content)
+            headers = {"Content-Encoding": "gzip"}
+        self._put(
+            batch_identifier=batch_identifier,
+            size=len(content),
+            data=content,
+            headers=headers,
+        )
+        return len(content)
+
+    def upload_file(
+        self, batch_identifier: str, path: str, headers: Optional[dict] = None
+    ) -> int:
+        """Uploads file, streaming it from disk instead of reading it."""
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._put(
+                batch_identifier=batch_identifier,
+                size=size,
+                data=file,
+                headers=headers,
+            )
+        return size
+
+    def _put(
+        self,
+        batch_identifier: str,
+        size: int,
+        data: Union[bytes, BinaryIO],
+        headers: Optional[dict] = None,
+    ) -> None:
+        upload_url = (
+            self.client.management_api.collection_api.get_browser_upload_url(
+                collection_id=self.collection_id,
+                file_size=size,
+                customer_batch_identifier=batch_identifier,
+                account_id=self.client.account_id,
+            )
+        )
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(size=size)
+        response = self.session.put(
+            upload_url.upload_url, data=data, headers=headers
+        )
+        if response.status_code != 200:
+            error = VantageFileUploadError(
+                response.reason, response.status_code
+            )
+            # Makes Retry-After available to the retry policy.
+            error.headers = response.headers
+            raise error
+
+    def close(self) -> None:
+        self.session.close()
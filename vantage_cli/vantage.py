@@ -2,47 +2,19 @@
 
 """Console script for vantage_cli."""
 
+import os
 import sys
+from typing import Optional
 import click
-from vantage_cli.commands.account import get_account, update_account
-from vantage_cli.commands.api_keys import (
-    get_vantage_api_key,
-    get_vantage_api_keys,
-    create_external_api_key,
-    get_external_api_keys,
-    get_external_api_key,
-    update_external_api_key,
-    delete_external_api_key,
-)
-from vantage_cli.commands.collections import (
-    create_collection_upe,
-    create_collection_openai,
-    create_collection_hf,
-    delete_collection,
-    get_collection,
-    list_collections,
-    update_collection,
-)
-from vantage_cli.commands.documents import (
-    upload_documents_from_parquet,
-    upsert_documents_from_jsonl,
-    delete_documents,
-    upload_documents_from_jsonl,
-)
-from vantage_cli.commands.search import (
-    embedding_search,
-    more_like_these_search,
-    more_like_this_search,
-    semantic_search,
-)
-from vantage_cli.commands.validate import validate_jsonl, validate_parquet
-from vantage_cli.printer import create_printer
-from vantage_sdk.client import VantageClient
-from vantage_cli.commands.util import CommandExecutor, mask_sensitive_string
 from vantage_cli.config import (
     default_config_file,
     configuration_callback,
 )
+from vantage_cli.lazy_group import LazyCommand, LazyGroup
+from vantage_cli.retry import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RETRY_DEADLINE_SECONDS,
+)
 import logging
 
 _LOGGER_FORMAT = "[%(asctime)s] %(levelname)s [%(name)s.%(module)s.%(funcName)s:%(lineno)d] %(message)s"
@@ -52,42 +24,163 @@ DEFAULT_API_HOST = "https://api.vanta.ge"
 DEFAULT_AUTH_HOST = "https://auth.vanta.ge"
 
 
-def create_client_from_vantage_api_key(
-    vantage_api_key: str, account_id: str, api_host: str
-):
-    return VantageClient.using_vantage_api_key(
-        vantage_api_key=vantage_api_key,
-        api_host=api_host,
-        account_id=account_id,
-    )
+# Subcommands are registered here instead of through cli.add_command, so
+# that their modules (and the SDK) are imported only when they are invoked.
+COMMANDS = {
+    "get-account": LazyCommand(
+        "vantage_cli.commands.account:get_account",
+        "Fetches Vantage account details.",
+    ),
+    "update-account": LazyCommand(
+        "vantage_cli.commands.account:update_account",
+        "Updates details of a Vantage account.",
+    ),
+    "get-vantage-api-key": LazyCommand(
+        "vantage_cli.commands.api_keys:get_vantage_api_key",
+        "Shows a specific Vantage API key details.",
+    ),
+    "get-vantage-api-keys": LazyCommand(
+        "vantage_cli.commands.api_keys:get_vantage_api_keys",
+        "Lists existing Vantage API keys.",
+    ),
+    "create-external-api-key": LazyCommand(
+        "vantage_cli.commands.api_keys:create_external_api_key",
+        "Creates a new external API key.",
+    ),
+    "get-external-api-keys": LazyCommand(
+        "vantage_cli.commands.api_keys:get_external_api_keys",
+        "Lists existing external API keys.",
+    ),
+    "get-external-api-key": LazyCommand(
+        "vantage_cli.commands.api_keys:get_external_api_key",
+        "Shows a specific external API key details.",
+    ),
+    "update-external-api-key": LazyCommand(
+        "vantage_cli.commands.api_keys:update_external_api_key",
+        "Updates external API key data.",
+    ),
+    "delete-external-api-key": LazyCommand(
+        "vantage_cli.commands.api_keys:delete_external_api_key",
+        "Deletes an external API key.",
+    ),
+    "create-collection-upe": LazyCommand(
+        "vantage_cli.commands.collections:create_collection_upe",
+        "Creates a new collection with user provided embeddings.",
+    ),
+    "create-collection-openai": LazyCommand(
+        "vantage_cli.commands.collections:create_collection_openai",
+        "Creates a new OpenAI collection.",
+    ),
+    "create-collection-hf": LazyCommand(
+        "vantage_cli.commands.collections:create_collection_hf",
+        "Creates a new HuggingFace collection.",
+    ),
+    "delete-collection": LazyCommand(
+        "vantage_cli.commands.collections:delete_collection",
+        "Deletes a collection.",
+    ),
+    "get-collection": LazyCommand(
+        "vantage_cli.commands.collections:get_collection",
+        "Fetches collection details.",
+    ),
+    "list-collections": LazyCommand(
+        "vantage_cli.commands.collections:list_collections",
+        "Lists existing colections.",
+    ),
+    "update-collection": LazyCommand(
+        "vantage_cli.commands.collections:update_collection",
+        "Updates collection data.",
+    ),
+    "upload-documents-from-parquet": LazyCommand(
+        "vantage_cli.commands.documents:upload_documents_from_parquet",
+        "Uploads documents from a Parquet file.",
+    ),
+    "upsert-documents-from-jsonl": LazyCommand(
+        "vantage_cli.commands.documents:upsert_documents_from_jsonl",
+        "Upserts documents from a JSONL file.",
+    ),
+    "upsert-documents-from-parquet": LazyCommand(
+        "vantage_cli.commands.documents:upsert_documents_from_parquet",
+        "Upserts documents from a Parquet file.",
+    ),
+    "upload-documents-from-jsonl": LazyCommand(
+        "vantage_cli.commands.documents:upload_documents_from_jsonl",
+        "Uploads documents from a JSONL file.",
+    ),
+    "upload-documents-from-directory": LazyCommand(
+        "vantage_cli.commands.documents:upload_documents_from_directory",
+        "Uploads documents from JSONL and Parquet files in directories.",
+    ),
+    "replay-dead-letters": LazyCommand(
+        "vantage_cli.commands.documents:replay_dead_letters",
+        "Sends batches from a dead-letter directory again.",
+    ),
+    "delete-documents": LazyCommand(
+        "vantage_cli.commands.documents:delete_documents",
+        "Deletes documents by ID.",
+    ),
+    "search-embedding": LazyCommand(
+        "vantage_cli.commands.search:embedding_search",
+        "Search based on the provided embedding vector.",
+    ),
+    "search-more-like-these": LazyCommand(
+        "vantage_cli.commands.search:more_like_these_search",
+        "Search based on the provided MoreLikeThese items.",
+    ),
+    "search-more-like-this": LazyCommand(
+        "vantage_cli.commands.search:more_like_this_search",
+        "Search based on the provided document ID.",
+    ),
+    "search-semantic": LazyCommand(
+        "vantage_cli.commands.search:semantic_search",
+        "Search based on the provided text query.",
+    ),
+    "convert-jsonl-to-parquet": LazyCommand(
+        "vantage_cli.commands.convert:convert_jsonl_to_parquet",
+        "Converts documents from a JSONL file to Parquet.",
+    ),
+    "diff-documents": LazyCommand(
+        "vantage_cli.commands.diff:diff_documents",
+        "Compares two JSONL snapshots of documents.",
+    ),
+    "validate-jsonl": LazyCommand(
+        "vantage_cli.commands.validate:validate_jsonl",
+        "Validates JSONL file.",
+    ),
+    "validate-parquet": LazyCommand(
+        "vantage_cli.commands.validate:validate_parquet",
+        "Validates Parquet file.",
+    ),
+    "serve": LazyCommand(
+        "vantage_cli.commands.serve:serve",
+        "Runs a daemon which executes commands in a warm process.",
+    ),
+    "shell": LazyCommand(
+        "vantage_cli.commands.shell:shell",
+        "Runs commands interactively, in a single session.",
+    ),
+}
 
-
-def create_client_from_jwt(jwt_token: str, account_id: str, api_host: str):
-    return VantageClient.using_jwt_token(
-        vantage_api_jwt_token=jwt_token,
-        api_host=api_host,
-        account_id=account_id,
-    )
+# Commands which are never sent to the daemon.
+LOCAL_COMMANDS = {"serve", "shell"}
 
 
-def create_client_from_credentials(
-    account_id: str,
-    client_id: str,
-    client_secret: str,
-    api_host: str,
-    auth_host: str,
+def create_executor(
+    debug: bool,
+    logger: logging.Logger,
+    max_retries: int = 0,
+    retry_deadline: Optional[float] = None,
 ):
-    return VantageClient.using_client_credentials(
-        vantage_client_id=client_id,
-        vantage_client_secret=client_secret,
-        api_host=api_host,
-        auth_host=auth_host,
-        account_id=account_id,
-    )
-
+    from vantage_cli.commands.util import CommandExecutor
+    from vantage_cli.retry import RetryPolicy
 
-def create_executor(debug: bool, logger: logging.Logger):
-    return CommandExecutor(debug=debug, logger=logger)
+    return CommandExecutor(
+        debug=debug,
+        logger=logger,
+        retry_policy=RetryPolicy(
+            max_retries=max_retries, deadline=retry_deadline
+        ),
+    )
 
 
 def configure_debug_logger(debug: bool) -> logging.Logger:
@@ -101,11 +194,14 @@ def configure_debug_logger(debug: bool) -> logging.Logger:
         format=_LOGGER_FORMAT,
         datefmt=_LOGGER_DATE_FORMAT,
         stream=sys.stderr,
+        force=True,
     )
     return logging.getLogger("vantage")
 
 
-@click.group(invoke_without_command=True)
+@click.group(
+    cls=LazyGroup, lazy_commands=COMMANDS, invoke_without_command=True
+)
 @click.option(
     "-c",
     "--config-file",
@@ -189,6 +285,41 @@ def configure_debug_logger(debug: bool) -> logging.Logger:
     envvar="VANTAGE_AUTH_HOST",
     help="Specify non-default auth host (used for development).",
 )
+@click.option(
+    "--token-cache/--no-token-cache",
+    default=True,
+    help="Cache tokens obtained using client ID and secret between runs.",
+)
+@click.option(
+    "--max-retries",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_RETRIES,
+    envvar="VANTAGE_MAX_RETRIES",
+    show_default=True,
+    help="Number of times requests failing due to throttling, server or connection errors are retried.",
+)
+@click.option(
+    "--retry-deadline",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_RETRY_DEADLINE_SECONDS,
+    envvar="VANTAGE_RETRY_DEADLINE",
+    show_default=True,
+    help="Seconds after the first attempt, past which failed requests aren't retried.",
+)
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="VANTAGE_RATE_LIMIT",
+    help="Maximum number of API requests sent per second.",
+)
+@click.option(
+    "--bandwidth-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="VANTAGE_BANDWIDTH_LIMIT",
+    help="Maximum number of bytes sent to the API per second.",
+)
 @click.option(
     "-v",
     "--version",
@@ -210,6 +341,11 @@ def cli(
     client_id,
     client_secret,
     config_file,
+    token_cache,
+    max_retries,
+    retry_deadline,
+    rate_limit,
+    bandwidth_limit,
     version,
 ):
     ctx.ensure_object(dict)
@@ -231,73 +367,119 @@ def cli(
     logger.debug(f"Using API host: {api_host}")
     logger.debug(f"Using account ID: {account_id}")
 
-    client = None
+    # NOTE: Imported here, so that --help and --version don't pay for
+    # importing the SDK.
+    from vantage_cli.client import ClientFactory
+    from vantage_cli.printer import create_printer
+    from vantage_cli.token_cache import TokenCache
 
-    if vantage_api_key:
-        logger.debug(
-            f"Creating client using API key: {mask_sensitive_string(vantage_api_key)}"
-        )
-        client = create_client_from_vantage_api_key(
-            vantage_api_key=vantage_api_key,
-            account_id=account_id,
-            api_host=api_host,
-        )
-    elif jwt_token:
-        logger.debug("Creating client using JWT Token.")
-        client = create_client_from_jwt(
-            jwt_token=jwt_token,
-            account_id=account_id,
-            api_host=api_host,
-        )
-    elif client_id and client_secret:
-        logger.debug("Creating client using Client ID/secret pair.")
-        logger.debug(f"Using auth host: {auth_host}")
-        client = create_client_from_credentials(
-            account_id=account_id,
-            client_id=client_id,
-            client_secret=client_secret,
-            api_host=api_host,
-            auth_host=auth_host,
-        )
+    rate_limiter = command_rate_limiter(ctx, ctx.invoked_subcommand)
 
-    if client is None:
-        click.echo(
-            "Either Vantage API ket, JWT token or client ID and secret need to be specified."
-        )
-        exit(127)
-
-    ctx.obj["client"] = client
+    ctx.obj["client_factory"] = ClientFactory(
+        logger=logger,
+        account_id=account_id,
+        api_host=api_host,
+        auth_host=auth_host,
+        vantage_api_key=vantage_api_key,
+        jwt_token=jwt_token,
+        client_id=client_id,
+        client_secret=client_secret,
+        token_cache=TokenCache(logger=logger) if token_cache else None,
+        cache=ctx.obj.get("client_cache"),
+        rate_limiter=rate_limiter,
+    )
     ctx.obj["printer"] = create_printer(output_type=output_type)
-    ctx.obj["executor"] = create_executor(debug=debug, logger=logger)
+    ctx.obj["executor"] = create_executor(
+        debug=debug,
+        logger=logger,
+        max_retries=max_retries,
+        retry_deadline=retry_deadline,
+    )
+    ctx.obj["rate_limiter"] = rate_limiter
     ctx.obj["logger"] = logger
 
 
-cli.add_command(get_account)
-cli.add_command(update_account)
-cli.add_command(get_vantage_api_key)
-cli.add_command(get_vantage_api_keys)
-cli.add_command(create_external_api_key)
-cli.add_command(get_external_api_keys)
-cli.add_command(get_external_api_key)
-cli.add_command(update_external_api_key)
-cli.add_command(delete_external_api_key)
-cli.add_command(create_collection_upe)
-cli.add_command(create_collection_openai)
-cli.add_command(create_collection_hf)
-cli.add_command(delete_collection)
-cli.add_command(get_collection)
-cli.add_command(list_collections)
-cli.add_command(update_collection)
-cli.add_command(upload_documents_from_parquet)
-cli.add_command(upsert_documents_from_jsonl)
-cli.add_command(upload_documents_from_jsonl)
-cli.add_command(delete_documents)
-cli.add_command(embedding_search)
-cli.add_command(more_like_these_search)
-cli.add_command(more_like_this_search)
-cli.add_command(semantic_search)
-cli.add_command(validate_jsonl)
-cli.add_command(validate_parquet)
+def command_rate_limiter(ctx: click.Context, command_name: Optional[str]):
+    """
+    Creates rate limiter for command_name, from general options of the
+    group context ctx. Shell calls it for each command it executes.
+    """
+    from vantage_cli.rate_limit import create_rate_limiter
+
+    limits = _command_limits(
+        ctx,
+        command_name,
+        rate_limit=ctx.params["rate_limit"],
+        bandwidth_limit=ctx.params["bandwidth_limit"],
+    )
+    return create_rate_limiter(
+        requests_per_second=limits["rate_limit"],
+        bytes_per_second=limits["bandwidth_limit"],
+    )
+
+
+def _command_limits(
+    ctx: click.Context, command_name: Optional[str], **limits
+) -> dict:
+    """
+    Overrides limits with the ones in the configuration section of
+    command_name, unless they were given on command line (or using
+    environment variables).
+    """
+    section = (ctx.default_map or {}).get(command_name)
+    if not isinstance(section, dict):
+        return limits
+    for name in limits:
+        source = ctx.get_parameter_source(name)
+        if name not in section or source in (
+            click.core.ParameterSource.COMMANDLINE,
+            click.core.ParameterSource.ENVIRONMENT,
+        ):
+            continue
+        try:
+            limits[name] = float(section[name])
+        except ValueError:
+            raise click.BadParameter(
+                f"{section[name]!r} in section {command_name} "
+                "is not a number.",
+                param_hint=name,
+            )
+    return limits
+
+
+def _invoked_command_name(argv: list[str]) -> Optional[str]:
+    options_with_value = {
+        opt
+        for param in cli.params
+        if isinstance(param, click.Option) and not param.is_flag
+        for opt in param.opts
+    }
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument in options_with_value:
+            next(arguments, None)
+        elif not argument.startswith("-"):
+            return argument
+    return None
+
+
+def main():
+    socket_path = os.environ.get("VANTAGE_CLI_SOCKET")
+
+    # NOTE: Daemon itself is started using the same socket variable, and
+    # interactive shell needs the terminal, so both always run directly.
+    if (
+        socket_path
+        and _invoked_command_name(sys.argv[1:]) not in LOCAL_COMMANDS
+    ):
+        from vantage_cli.daemon import run_via_daemon
+
+        exit_code = run_via_daemon(socket_path=socket_path, argv=sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    cli()
+
 
 if __name__ == "__main__":
-    cli()  # pragma: no cover
+    main()  # pragma: no cover